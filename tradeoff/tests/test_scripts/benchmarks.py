@@ -0,0 +1,146 @@
+import time
+import os
+import shutil
+import tempfile
+import numpy as np
+from tradeoff.system.container import Container
+from tradeoff.system.job import Job
+from tradeoff.system.action import Action
+from tradeoff.system.simulated_system import SimulatedSystem
+from tradeoff.system.controller import Controller
+from tradeoff.system.job_table import JobTable
+from tradeoff.jobs import job_manager
+from tradeoff.schedulers.KJD2 import KJD2
+from tradeoff.schedulers.UJD2 import UJD2
+from tradeoff.schedulers.UJD1 import UJD1
+
+"""
+Container drain benchmark
+
+Fills a single container with a long backlog of unit jobs and times how long it takes to run the container until every
+job is completed. Draining should scale linearly with the number of jobs.
+
+Args:
+    num_jobs: the number of jobs in the backlog
+"""
+def container_drain_benchmark(num_jobs:int):
+    jobs:list[Job] = [Job(job_id=str(job_num), execution_time=1, receival_time=0) for job_num in range(num_jobs)]
+    container:Container = Container(curr_time=0, startup_time=1, initial_jobs=jobs)
+
+    start:float = time.perf_counter()
+    container.run(num_jobs + 1)
+    elapsed:float = time.perf_counter() - start
+
+    if not container.is_done() or jobs[-1].get_queue_time() != num_jobs:
+        print(f"Container did not drain correctly with {num_jobs} jobs")
+        return
+    print(f"Drained {num_jobs} jobs in {elapsed:.3f}s ({elapsed / num_jobs * 1e9:.0f}ns per job)")
+
+"""
+Job set load benchmark
+
+Writes a job set in the binary column format and times how long it takes to load it and to create a controller for it,
+loading memory maps the columns and the job set is known to be sorted so neither should depend on the number of jobs.
+
+Args:
+    num_jobs: the number of jobs in the job set
+"""
+def job_set_load_benchmark(num_jobs:int):
+    directory:str = tempfile.mkdtemp()
+    try:
+        file_name:str = os.path.join(directory, "benchmark" + job_manager.BINARY_JOB_SET_EXTENSION)
+        job_manager.jobs_to_file(JobTable(ids=np.arange(num_jobs).astype(np.str_), receival_times=np.arange(num_jobs),
+                                          execution_times=np.ones(num_jobs)), file_name)
+
+        start:float = time.perf_counter()
+        job_table:JobTable = job_manager.job_table_from_file(file_name)
+        elapsed:float = time.perf_counter() - start
+        start = time.perf_counter()
+        controller:Controller = Controller(startup_duration=1, jobs_file=file_name, manual_control=True)
+        controller_elapsed:float = time.perf_counter() - start
+
+        if len(job_table) != num_jobs or job_table.get_receival_time(num_jobs - 1) != num_jobs - 1:
+            print(f"Job set with {num_jobs} jobs did not load correctly")
+            return
+        print(f"Loaded {num_jobs} jobs in {elapsed * 1000:.2f}ms, created a controller in "
+              f"{controller_elapsed * 1000:.2f}ms")
+    finally:
+        shutil.rmtree(directory)
+
+"""
+Burst batching benchmark
+
+Times one scheduling decision of KJD2 and UJD2 on an empty system with a burst of pending jobs, so every job is batched
+onto new containers. The decision should scale linearly with the number of pending jobs.
+
+Args:
+    num_jobs: the number of pending jobs
+"""
+def burst_batching_benchmark(num_jobs:int):
+    jobs:list[Job] = [Job(job_id=str(job_num), execution_time=job_num % 5 + 1, receival_time=0,
+                          execution_time_lower_bound=1, execution_time_upper_bound=job_num % 5 + 2)
+                      for job_num in range(num_jobs)]
+    for scheduler in [KJD2(["0.5"]), UJD2(["0.5"])]:
+        system:SimulatedSystem = SimulatedSystem(startup_duration=10)
+
+        start:float = time.perf_counter()
+        actions:list = scheduler.determine_actions(system, jobs)
+        elapsed:float = time.perf_counter() - start
+
+        num_assigned:int = sum([len(action.get_jobs()) for action in actions])
+        num_activated:int = len([action for action in actions if action.get_action_type() == Action.ACTIVATE_CONTAINER])
+        if num_assigned == 0:
+            print(f"{type(scheduler).__name__} did not batch any of {num_jobs} jobs")
+            return
+        print(f"{type(scheduler).__name__} batched {num_assigned} of {num_jobs} jobs onto {num_activated} containers in "
+              f"{elapsed:.3f}s ({elapsed / num_jobs * 1e9:.0f}ns per job)")
+
+"""
+Long horizon decision benchmark
+
+Times a UJD1 scheduling decision late in a run with a few pending jobs, the decision should not depend on how many
+epochs have elapsed.
+
+Args:
+    decision_time: the time of the decision
+"""
+def long_horizon_decision_benchmark(decision_time:int):
+    system:SimulatedSystem = SimulatedSystem(startup_duration=1, curr_time=decision_time)
+    jobs:list[Job] = [Job(job_id=str(job_num), execution_time=1, receival_time=decision_time - job_num,
+                          execution_time_lower_bound=1, execution_time_upper_bound=2) for job_num in range(10)]
+    scheduler:UJD1 = UJD1(["0.5"])
+
+    num_decisions:int = 1000
+    start:float = time.perf_counter()
+    for decision in range(num_decisions):
+        scheduler.determine_actions(system, jobs)
+    elapsed:float = time.perf_counter() - start
+
+    print(f"UJD1 decided at time {decision_time} in {elapsed / num_decisions * 1e6:.1f}us per decision")
+
+"""
+Performs all benchmarks
+"""
+def benchmarks():
+    print("Container drain benchmark")
+    for num_jobs in [10000, 100000, 1000000]:
+        container_drain_benchmark(num_jobs=num_jobs)
+    print()
+
+    print("Job set load benchmark")
+    for num_jobs in [100000, 1000000, 10000000]:
+        job_set_load_benchmark(num_jobs=num_jobs)
+    print()
+
+    print("Burst batching benchmark")
+    for num_jobs in [1000, 10000, 100000]:
+        burst_batching_benchmark(num_jobs=num_jobs)
+    print()
+
+    print("Long horizon decision benchmark")
+    for decision_time in [1000, 1000000, 1000000000]:
+        long_horizon_decision_benchmark(decision_time=decision_time)
+    print()
+
+if __name__ == "__main__":
+    benchmarks()
\ No newline at end of file
@@ -0,0 +1,149 @@
+import random
+import typing
+from tradeoff.system.arrival_queue import ArrivalQueue
+from tradeoff.system.job import Job
+from tradeoff.system.job_table import JobTable
+
+"""
+Creates jobs with random receival times
+
+Args:
+    rng: the random number generator
+    prefix: the prefix of the job ids
+    num_jobs: the number of jobs
+    max_time: the largest receival time
+
+Returns:
+    The jobs, not sorted by receival time
+"""
+def make_jobs(rng:random.Random, prefix:str, num_jobs:int, max_time:int)->list[Job]:
+    return [Job(job_id=prefix + str(job_num), execution_time=1, receival_time=rng.randrange(max_time + 1))
+            for job_num in range(num_jobs)]
+
+"""
+Returns the order jobs are expected to be released in, by receival time, then by the order their batch, job or stream
+was added and then by their order within it
+
+Args:
+    sources: the jobs of each batch, single job or stream, in the order they were added
+
+Returns:
+    The ids of the jobs in release order
+"""
+def expected_release_order(sources:list[list[Job]])->list[str]:
+    entries:list[typing.Tuple[int, int, int, str]] = []
+    for source_num, jobs in enumerate(sources):
+        sorted_jobs:list[Job] = sorted(jobs, key=lambda job: job.get_receival_time())
+        entries.extend([(job.get_receival_time(), source_num, job_num, job.get_id())
+                        for job_num, job in enumerate(sorted_jobs)])
+    return [entry[3] for entry in sorted(entries)]
+
+"""
+Releases every job of a queue in steps of random lengths
+
+Args:
+    queue: the queue
+    rng: the random number generator
+
+Returns:
+    The ids of the released jobs in release order
+"""
+def release_all(queue:ArrivalQueue, rng:random.Random)->list[str]:
+    released_ids:list[str] = []
+    time:int = 0
+    while not queue.is_empty():
+        assert queue.get_next_receival_time() >= 0
+        time += rng.randrange(5)
+        released_jobs:list[Job] = queue.release(time)
+        assert all([job.get_receival_time() <= time for job in released_jobs])
+        released_ids.extend([job.get_id() for job in released_jobs])
+    assert queue.get_next_receival_time() == -1
+    return released_ids
+
+"""
+Batches that are not sorted, single jobs added out of order and streams are released merged in receival time order,
+ties in the order they were added
+"""
+def test_release_order():
+    rng:random.Random = random.Random(0)
+    queue:ArrivalQueue = ArrivalQueue()
+    sources:list[list[Job]] = []
+    for source_num in range(12):
+        if source_num % 3 == 0:
+            jobs:list[Job] = make_jobs(rng, "t" + str(source_num) + "_", 50, 100)
+            queue.add_table(JobTable.from_jobs(jobs))
+            sources.append(jobs)
+        elif source_num % 3 == 1:
+            job:Job = make_jobs(rng, "j" + str(source_num) + "_", 1, 100)[0]
+            queue.add_job(job)
+            sources.append([job])
+        else:
+            jobs = sorted(make_jobs(rng, "s" + str(source_num) + "_", 40, 100), key=lambda job: job.get_receival_time())
+            chunks:list[typing.Union[Job, JobTable]] = [jobs[0], JobTable.from_jobs([])]
+            chunks.extend([JobTable.from_jobs(jobs[start:start + 7]) for start in range(1, len(jobs), 7)])
+            queue.add_stream(chunks)
+            sources.append(jobs)
+    queue.add_table(JobTable.from_jobs([]))
+    assert release_all(queue, rng) == expected_release_order(sources)
+
+"""
+Released batches are dropped, so a long stream only keeps one item in the queue
+"""
+def test_released_jobs_are_dropped():
+    rng:random.Random = random.Random(1)
+    num_jobs:int = 0
+    max_heap_size:int = 0
+
+    def stream()->typing.Iterator[JobTable]:
+        nonlocal num_jobs
+        for chunk_num in range(1000):
+            chunk:list[Job] = [Job(job_id=str(num_jobs + job_num), execution_time=1, receival_time=chunk_num * 10 + job_num)
+                               for job_num in range(5)]
+            num_jobs += len(chunk)
+            yield JobTable.from_jobs(chunk)
+
+    queue:ArrivalQueue = ArrivalQueue()
+    queue.add_stream(stream())
+    queue.add_table(JobTable.from_jobs(make_jobs(rng, "t", 100, 50)))
+    released_ids:list[str] = []
+    time:int = 0
+    while not queue.is_empty():
+        time += 3
+        released_ids.extend([job.get_id() for job in queue.release(time)])
+        max_heap_size = max(max_heap_size, len(queue.heap))
+    assert max_heap_size <= 2
+    assert len(released_ids) == num_jobs + 100
+
+"""
+A copy releases the same jobs as the queue it was copied from, streams are split so both read every remaining item
+"""
+def test_copy():
+    rng:random.Random = random.Random(2)
+    queue:ArrivalQueue = ArrivalQueue()
+    jobs:list[Job] = sorted(make_jobs(rng, "s", 60, 200), key=lambda job: job.get_receival_time())
+    queue.add_stream(iter([JobTable.from_jobs(jobs[start:start + 10]) for start in range(0, len(jobs), 10)]))
+    queue.add_table(JobTable.from_jobs(make_jobs(rng, "t", 60, 200)))
+    queue.release(50)
+    copy:ArrivalQueue = queue.copy()
+    copy.add_job(Job(job_id="added", execution_time=1, receival_time=120))
+    copy_ids:list[str] = release_all(copy, random.Random(3))
+    queue_ids:list[str] = release_all(queue, random.Random(4))
+    assert [job_id for job_id in copy_ids if job_id != "added"] == queue_ids
+    assert "added" in copy_ids
+
+"""
+A batch of job objects is released as the same objects, merged with the other batches like a job table
+"""
+def test_job_objects_are_released():
+    rng:random.Random = random.Random(5)
+    queue:ArrivalQueue = ArrivalQueue()
+    table_jobs:list[Job] = make_jobs(rng, "t", 40, 60)
+    jobs:list[Job] = make_jobs(rng, "j", 40, 60)
+    queue.add_table(JobTable.from_jobs(table_jobs))
+    queue.add_jobs(jobs)
+    queue.add_jobs([])
+    released_jobs:list[Job] = []
+    for time in range(0, 67, 7):
+        released_jobs.extend(queue.release(time))
+    assert [job.get_id() for job in released_jobs] == expected_release_order([table_jobs, jobs])
+    assert all([any([job is released_job for released_job in released_jobs]) for job in jobs])
\ No newline at end of file
@@ -0,0 +1,121 @@
+import os
+import random
+from tradeoff.system.controller import Controller
+from tradeoff.system.simulated_system import SimulatedSystem
+from tradeoff.system import checkpoint
+from tradeoff.results import result_manager
+
+"""
+Creates a controller that runs a model on js1
+
+Args:
+    model_config_file: name of the file containing the model configuration
+    results_file: file where results will be stored
+
+Returns:
+    The controller
+"""
+def make_controller(model_config_file:str, results_file:str)->Controller:
+    return Controller(startup_duration=2, model_config_file=model_config_file, jobs_file="job_sets/js1.txt",
+                      results_file=results_file)
+
+"""
+Runs a controller for a number of steps
+
+Args:
+    controller: the controller
+    num_steps: the number of steps
+"""
+def run_steps(controller:Controller, num_steps:int):
+    for step in range(num_steps):
+        controller.next_step()
+
+"""
+A run resumed from a checkpoint gives the same results as a run that was not stopped
+"""
+def test_resume_gives_same_results(tmp_path):
+    results_file:str = str(tmp_path / "results.txt")
+    checkpoint_file:str = str(tmp_path / "checkpoint")
+    for model_config_file in ["model_config/FIFO_c10.txt", "model_config/FIFO_c10_incremental.txt",
+                              "model_config/UJD2_e0.4.txt", "model_config/KJD1_e0.2.txt"]:
+        random.seed(0)
+        make_controller(model_config_file, results_file).control_loop()
+        expected:str = open(results_file).read()
+
+        random.seed(0)
+        controller:Controller = make_controller(model_config_file, results_file)
+        run_steps(controller, 150)
+        controller.save_checkpoint(checkpoint_file)
+        run_steps(controller, 150)
+        controller.save_checkpoint(checkpoint_file)
+        del controller
+        checkpoint.load_checkpoint(checkpoint_file).control_loop()
+        assert open(results_file).read() == expected
+
+"""
+The results written to the results file after a checkpoint was saved are not part of the checkpoint, they are replaced
+when a run resumed from the checkpoint saves its next checkpoint
+"""
+def test_resume_ignores_later_results(tmp_path):
+    results_file:str = str(tmp_path / "results.txt")
+    checkpoint_file:str = str(tmp_path / "checkpoint")
+    make_controller("model_config/UJD2_e0.4.txt", results_file).control_loop()
+    expected:str = open(results_file).read()
+
+    controller:Controller = make_controller("model_config/UJD2_e0.4.txt", results_file)
+    run_steps(controller, 100)
+    controller.save_checkpoint(checkpoint_file)
+    spilled_size:int = os.path.getsize(checkpoint_file + checkpoint.RESULTS_EXTENSION)
+    os.rename(checkpoint_file, checkpoint_file + ".first")
+    run_steps(controller, 200)
+    controller.save_checkpoint(checkpoint_file)
+    assert os.path.getsize(checkpoint_file + checkpoint.RESULTS_EXTENSION) > spilled_size
+
+    resumed:Controller = checkpoint.load_checkpoint(checkpoint_file + ".first")
+    assert resumed.system.get_results().spill_file_size == spilled_size
+    run_steps(resumed, 100)
+    resumed.save_checkpoint(checkpoint_file)
+    resumed.control_loop()
+    assert open(results_file).read() == expected
+
+"""
+The results of the completed jobs are kept in the results file, the checkpoint holds none of them
+"""
+def test_checkpoint_holds_no_results(tmp_path):
+    results_file:str = str(tmp_path / "results.txt")
+    checkpoint_file:str = str(tmp_path / "checkpoint")
+    controller:Controller = make_controller("model_config/FIFO_c10.txt", results_file)
+    controller.control_loop()
+    num_results:int = len(controller.system.get_results())
+    controller.save_checkpoint(checkpoint_file)
+    with open(checkpoint_file + checkpoint.RESULTS_EXTENSION) as spill_file:
+        assert len(spill_file.readlines()) == num_results
+
+    resumed:Controller = checkpoint.load_checkpoint(checkpoint_file)
+    assert resumed.system.get_results().size == 0
+    assert len(resumed.system.get_results()) == num_results
+    resumed.control_loop()
+    assert result_manager.load_file_job_results(results_file)[2] == {
+        job_id: queue_time for job_id, _, queue_time in controller.system.get_results().rows()}
+
+"""
+Checkpoints saved after every job completed are the same size however long the run continued, and the finishing time
+heaps of the system do not keep their outdated entries
+"""
+def test_checkpoint_size_does_not_grow(tmp_path, monkeypatch):
+    monkeypatch.setattr(SimulatedSystem, "MIN_COMPACTION_SIZE", 8)
+    checkpoint_file:str = str(tmp_path / "checkpoint")
+    controller:Controller = make_controller("model_config/KJD1_e0.2.txt", str(tmp_path / "results.txt"))
+    max_containers:int = 0
+    while not controller.is_done():
+        controller.next_step()
+        system:SimulatedSystem = controller.system
+        max_containers = max(max_containers, len(system.get_containers()))
+        assert len(system.done_times_heap) <= max(8, 2 * max_containers + 1)
+        assert len(system.min_done_times_heap) <= max(8, 2 * max_containers + 1)
+    sizes:list[int] = []
+    for checkpoint_num in range(3):
+        controller.save_checkpoint(checkpoint_file)
+        sizes.append(os.path.getsize(checkpoint_file))
+        run_steps(controller, 50)
+    assert sizes[0] == sizes[1] == sizes[2]
\ No newline at end of file
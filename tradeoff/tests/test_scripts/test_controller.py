@@ -0,0 +1,252 @@
+import gc
+import typing
+from tradeoff.system.controller import Controller
+from tradeoff.system.container import Container
+from tradeoff.system.simulated_system import SimulatedSystem
+from tradeoff.system.job import Job
+from tradeoff.system.job_queue import JobQueue
+from tradeoff.system.action import Action
+from tradeoff.schedulers.UJD1 import UJD1
+from tradeoff.jobs import job_manager
+from tradeoff.results import result_manager
+
+"""
+Runs a model on a job set to completion
+
+Args:
+    model_config_file: name of the file containing the model configuration
+    jobs_file: the file containing the jobs
+    results_file: file where results will be stored
+    startup_duration: the startup time of the system
+
+Returns:
+    The cost and the mapping of job ids to queue times of the results file
+"""
+def run_model(model_config_file:str, jobs_file:str, results_file:str, startup_duration:int=1)->typing.Tuple[int, typing.Dict[str, int]]:
+    controller:Controller = Controller(startup_duration=startup_duration, model_config_file=model_config_file,
+                                       jobs_file=jobs_file, results_file=results_file)
+    controller.control_loop()
+    cost, _, job_queue_times = result_manager.load_file_job_results(results_file)
+    return cost, job_queue_times
+
+"""
+Jobs left in a container when it is terminated are incomplete until they are assigned again
+"""
+def test_terminated_container_jobs_are_incomplete():
+    system:SimulatedSystem = SimulatedSystem(startup_duration=1)
+    job:Job = Job(job_id="1", execution_time=0, receival_time=0)
+    system.activate_container(initial_jobs=[job])
+    container:Container = next(iter(system.get_containers()))
+    system.terminate_container(container)
+    assert system.get_incomplete_jobs() == [job]
+
+    system.activate_container(initial_jobs=[job])
+    assert system.get_incomplete_jobs() == []
+    system.run(2)
+    assert job.get_queue_time() == 1
+    assert system.get_incomplete_jobs() == []
+
+"""
+A zero length job assigned to a container that is terminated in the same step never completes and is written with a
+queue time of -1 (KJD2, js1, startup 1, job 164), every job of the job set has a row
+"""
+def test_incomplete_jobs_are_written(tmp_path):
+    cost, job_queue_times = run_model(model_config_file="model_config/KJD2_e0.5.txt", jobs_file="job_sets/js1.txt",
+                                      results_file=str(tmp_path / "results.txt"))
+    assert job_queue_times["164"] == -1
+    assert len(job_queue_times) == len(job_manager.job_table_from_file(file_name="job_sets/js1.txt"))
+
+"""
+UJD1 only wakes on its timers with the timers parameter, which makes the same decisions as the default calls at every
+arrival in fewer calls
+"""
+def test_ujd1_timers_are_opt_in(tmp_path, monkeypatch):
+    model_config_file:str = str(tmp_path / "UJD1_timers.txt")
+    with open(model_config_file, "w") as config_file:
+        config_file.write("tradeoff.schedulers.UJD1,UJD1,0.9,timers")
+    assert Controller(startup_duration=1, model_config_file="model_config/UJD1_e0.9.txt").wake_events is None
+    assert Controller(startup_duration=1, model_config_file=model_config_file).wake_events == set()
+
+    num_calls:int = 0
+    determine_actions:typing.Callable = UJD1.determine_actions
+
+    def count_calls(scheduler:UJD1, system:SimulatedSystem, pending_jobs:list[Job])->list[Action]:
+        nonlocal num_calls
+        num_calls += 1
+        return determine_actions(scheduler, system, pending_jobs)
+
+    monkeypatch.setattr(UJD1, "determine_actions", count_calls)
+    for startup_duration in [1, 4]:
+        num_calls = 0
+        results:typing.Tuple[int, typing.Dict[str, int]] = run_model(
+            model_config_file="model_config/UJD1_e0.9.txt", jobs_file="job_sets/js1.txt",
+            results_file=str(tmp_path / "results.txt"), startup_duration=startup_duration)
+        num_default_calls:int = num_calls
+        num_calls = 0
+        timers_results:typing.Tuple[int, typing.Dict[str, int]] = run_model(
+            model_config_file=model_config_file, jobs_file="job_sets/js1.txt",
+            results_file=str(tmp_path / "timers_results.txt"), startup_duration=startup_duration)
+        assert timers_results == results
+        assert num_calls < num_default_calls
+
+"""
+A run with a time quantum of 1 gives the same results as the exact run, for models woken at every step and on timers
+"""
+def test_unit_quantum_is_exact(tmp_path):
+    timers_config_file:str = str(tmp_path / "UJD1_timers.txt")
+    with open(timers_config_file, "w") as config_file:
+        config_file.write("tradeoff.schedulers.UJD1,UJD1,0.5,timers")
+    for model_config_file in ["model_config/FIFO_c10.txt", "model_config/FIFO_c10_incremental.txt",
+                              "model_config/KJD1_e0.5.txt", "model_config/UJD1_e0.5.txt",
+                              "model_config/UJD2_e0.5.txt", timers_config_file]:
+        exact_file:str = str(tmp_path / "exact.txt")
+        quantized_file:str = str(tmp_path / "quantized.txt")
+        Controller(startup_duration=4, model_config_file=model_config_file, jobs_file="job_sets/js1.txt",
+                   results_file=exact_file).control_loop()
+        Controller(startup_duration=4, model_config_file=model_config_file, jobs_file="job_sets/js1.txt",
+                   results_file=quantized_file, time_quantum=1).control_loop()
+        exact_cost, _, exact_queue_times = result_manager.load_file_job_results(exact_file)
+        quantized_cost, time_quantum, quantized_queue_times = result_manager.load_file_job_results(quantized_file)
+        assert time_quantum == 1
+        assert (quantized_cost, quantized_queue_times) == (exact_cost, exact_queue_times)
+
+"""
+The step that drains the system after the last job is released is not quantized, so jobs that are all released
+together at the first quantum boundary cost the same as in the exact run
+"""
+def test_drain_is_exact(tmp_path):
+    jobs_file:str = str(tmp_path / "jobs.txt")
+    job_manager.jobs_to_file([Job(job_id=str(job_num), execution_time=job_num + 1, receival_time=0)
+                              for job_num in range(25)], jobs_file)
+    exact_cost, _ = run_model(model_config_file="model_config/FIFO_c10.txt", jobs_file=jobs_file,
+                              results_file=str(tmp_path / "exact.txt"))
+    controller:Controller = Controller(startup_duration=1, model_config_file="model_config/FIFO_c10.txt",
+                                       jobs_file=jobs_file, results_file=str(tmp_path / "quantized.txt"),
+                                       time_quantum=1000)
+    controller.control_loop()
+    assert 1000 < controller.get_time() < 2000
+    assert result_manager.load_file_job_results(str(tmp_path / "quantized.txt"))[0] == exact_cost
+
+"""
+The error report of quantized runs of js1 stays within the empirical bound (see
+result_manager.quantization_error_report): every job completes, no queue time is off by more than a quantum and the cost
+is within 5% of the exact run
+"""
+def test_quantization_error_is_bounded(tmp_path):
+    exact_file:str = str(tmp_path / "exact.txt")
+    quantized_file:str = str(tmp_path / "quantized.txt")
+    for model_config_file in ["model_config/FIFO_c10.txt", "model_config/KJD1_e0.5.txt", "model_config/KJD2_e0.5.txt",
+                              "model_config/UJD1_e0.5.txt", "model_config/UJD2_e0.5.txt"]:
+        Controller(startup_duration=1, model_config_file=model_config_file, jobs_file="job_sets/js1.txt",
+                   results_file=exact_file).control_loop()
+        for time_quantum in [5, 20]:
+            Controller(startup_duration=1, model_config_file=model_config_file, jobs_file="job_sets/js1.txt",
+                       results_file=quantized_file, time_quantum=time_quantum).control_loop()
+            report:typing.Dict[str, float] = result_manager.quantization_error_report(exact_file, quantized_file)
+            assert report["time_quantum"] == time_quantum
+            assert report["max_release_delay"] == time_quantum - 1
+            assert report["missing_jobs"] == 0
+            assert report["max_queue_time_error"] <= time_quantum
+            assert abs(report["relative_cost_error"]) < 0.05
+
+"""
+A fork runs to the same cost as the controller it was forked from without changing it: the controller writes the same
+results as a run that was not forked, and forks of a snapshot give the same cost
+"""
+def test_fork_does_not_change_controller(tmp_path):
+    for model_config_file in ["model_config/FIFO_c10.txt", "model_config/FIFO_c10_incremental.txt",
+                              "model_config/UJD2_e0.4.txt", "model_config/KJD1_e0.2.txt"]:
+        results_file:str = str(tmp_path / "results.txt")
+        expected_cost, expected_queue_times = run_model(model_config_file=model_config_file,
+                                                        jobs_file="job_sets/js1.txt", results_file=results_file)
+
+        controller:Controller = Controller(startup_duration=1, model_config_file=model_config_file,
+                                           jobs_file="job_sets/js1.txt", results_file=results_file)
+        for step in range(200):
+            controller.next_step()
+        num_results:int = len(controller.system.get_results())
+        snapshot:Controller = controller.snapshot()
+        fork_costs:list[int] = []
+        for fork_num in range(2):
+            fork:Controller = snapshot.fork()
+            while not fork.is_done():
+                fork.next_step()
+            fork_costs.append(fork.system.get_cost())
+        assert len(controller.system.get_results()) == num_results
+
+        controller.control_loop()
+        cost, _, queue_times = result_manager.load_file_job_results(results_file)
+        assert (cost, queue_times) == (expected_cost, expected_queue_times)
+        assert fork_costs == [controller.system.get_cost(), controller.system.get_cost()]
+
+"""
+The queued jobs are a view of the controller's queue, so getting them does not copy the queue, and they stay in release
+order as jobs are assigned
+"""
+def test_queued_jobs_are_a_view():
+    controller:Controller = Controller(startup_duration=1, manual_control=True)
+    jobs:list[Job] = [Job(job_id=str(job_num), execution_time=2, receival_time=0) for job_num in range(5)]
+    controller.add_jobs(jobs)
+    _, queued_jobs = controller.next_step(actions=[])
+    assert [job.get_id() for job in queued_jobs] == ["0", "1", "2", "3", "4"]
+    first_job:Job = next(iter(queued_jobs))
+    controller.next_step(actions=[Action(action_type=Action.ACTIVATE_CONTAINER, jobs=[first_job])])
+    assert [job.get_id() for job in queued_jobs] == ["1", "2", "3", "4"]
+    assert controller.get_queued_jobs() == queued_jobs
+
+"""
+Added jobs are released as the objects that were added, so they are marked complete and keep their other information,
+and they are dropped when the controller is reset
+"""
+def test_added_jobs_are_kept_until_reset():
+    controller:Controller = Controller(startup_duration=1, manual_control=True)
+    jobs:list[Job] = [Job(job_id=str(job_num), execution_time=2, receival_time=3 - job_num) for job_num in range(4)]
+    jobs[0].add_other_info(Job.EXECUTION_TIME_UPPER_BOUND, "5")
+    controller.add_jobs(jobs)
+    while not controller.is_done():
+        controller.next_step(actions=[Action(action_type=Action.ACTIVATE_CONTAINER, jobs=[job])
+                                      for job in controller.get_queued_jobs()])
+    assert all([job.get_queue_time() >= 1 for job in jobs])
+    assert jobs[0].get_other_info(Job.EXECUTION_TIME_UPPER_BOUND) == "5"
+
+    controller.reset()
+    assert controller.is_done() and len(controller.get_queued_jobs()) == 0
+
+"""
+A container stops sharing its job queue once the fork sharing it is dropped, so the system that was forked keeps its
+queue instead of copying it, while a fork that is kept still copies the queue before changing it
+"""
+def test_dropped_fork_releases_job_queues():
+    system:SimulatedSystem = SimulatedSystem(startup_duration=1)
+    system.activate_container(initial_jobs=[Job(job_id=str(job_num), execution_time=1, receival_time=0)
+                                            for job_num in range(1000)])
+    container:Container = next(iter(system.get_containers()))
+    queue:JobQueue = container.get_jobs()
+    fork:SimulatedSystem = system.fork()
+    assert queue.get_num_owners() == 2
+    del fork
+    gc.collect()
+    assert queue.get_num_owners() == 1
+    system.run(5)
+    assert container.get_jobs() is queue and len(queue) == 996
+
+    fork = system.fork()
+    system.run(10)
+    assert container.get_jobs() is not queue
+    fork_container:Container = next(iter(fork.get_containers()))
+    assert fork_container.get_jobs() is queue and len(queue) == 996
+
+
+"""
+FIFO is only incremental with the incremental parameter, and gives the same results either way
+"""
+def test_fifo_incremental_is_opt_in(tmp_path):
+    assert not Controller(startup_duration=1, model_config_file="model_config/FIFO_c10.txt").incremental
+    assert Controller(startup_duration=1, model_config_file="model_config/FIFO_c10_incremental.txt").incremental
+    for startup_duration in [1, 4]:
+        expected:typing.Tuple[int, typing.Dict[str, int]] = run_model(
+            model_config_file="model_config/FIFO_c10.txt", jobs_file="job_sets/js1.txt",
+            results_file=str(tmp_path / "results.txt"), startup_duration=startup_duration)
+        assert run_model(model_config_file="model_config/FIFO_c10_incremental.txt", jobs_file="job_sets/js1.txt",
+                         results_file=str(tmp_path / "incremental_results.txt"),
+                         startup_duration=startup_duration) == expected
\ No newline at end of file
@@ -0,0 +1,206 @@
+import os
+import pickle
+import typing
+import numpy as np
+from tradeoff.system.controller import Controller
+from tradeoff.system.job_table import JobTable
+from tradeoff.jobs import job_manager
+from tradeoff.results import result_manager
+
+"""
+Checks that two job tables hold the same jobs in the same order
+
+Args:
+    table: the table
+    expected: the expected table
+"""
+def check_same_jobs(table:JobTable, expected:JobTable):
+    assert table.ids.tolist() == expected.ids.tolist()
+    assert table.receival_times.tolist() == expected.receival_times.tolist()
+    assert table.execution_times.tolist() == expected.execution_times.tolist()
+    assert table.lower_bounds.tolist() == expected.lower_bounds.tolist()
+    assert table.upper_bounds.tolist() == expected.upper_bounds.tolist()
+
+"""
+Writes js1 sorted by receival time
+
+Args:
+    directory: the directory the file is written to
+
+Returns:
+    The name of the file and the sorted table
+"""
+def write_sorted_js1(directory)->typing.Tuple[str, JobTable]:
+    table:JobTable = job_manager.job_table_from_file("job_sets/js1.txt").sorted_by_receival_time()
+    file_name:str = str(directory / "js1_sorted.txt")
+    job_manager.jobs_to_file(table, file_name)
+    return file_name, table
+
+"""
+A sorted file is streamed in chunks that together hold every job in order, a chunk is read without reading the rest of
+the file
+"""
+def test_chunked_reader_streams_sorted_file(tmp_path):
+    file_name, table = write_sorted_js1(tmp_path)
+    reader:job_manager.ChunkedJobReader = job_manager.ChunkedJobReader(file_name, chunk_size=37)
+    iterator:job_manager.ChunkedJobIterator = iter(reader)
+    assert iterator.offset == 0
+    next(iterator)
+    assert iterator.offset < os.path.getsize(file_name) // 10
+    chunks:list[JobTable] = list(reader)
+    assert all([len(chunk) <= 37 for chunk in chunks])
+    check_same_jobs(JobTable.concatenate(chunks), table)
+    check_same_jobs(JobTable.concatenate(list(reader)), table)
+
+"""
+A file that is not sorted, such as the job sets in job_sets, cannot be streamed, with sort it is loaded into memory and
+read in sorted chunks
+"""
+def test_chunked_reader_sorts_unsorted_file():
+    table:JobTable = job_manager.job_table_from_file("job_sets/js1.txt")
+    assert np.any(table.receival_times[1:] < table.receival_times[:-1])
+    try:
+        list(job_manager.ChunkedJobReader("job_sets/js1.txt", chunk_size=100))
+    except ValueError:
+        pass
+    else:
+        assert False, "Streaming a file that is not sorted did not raise an error"
+    reader:job_manager.ChunkedJobReader = job_manager.ChunkedJobReader("job_sets/js1.txt", chunk_size=100, sort=True)
+    chunks:list[JobTable] = list(reader)
+    check_same_jobs(JobTable.concatenate(chunks), table.sorted_by_receival_time())
+
+"""
+A pickled iterator resumes from the chunk it stopped at, whether the file is streamed or loaded into memory
+"""
+def test_chunked_iterator_resumes_after_pickling(tmp_path):
+    sorted_file_name, _ = write_sorted_js1(tmp_path)
+    for file_name, sort in [(sorted_file_name, False), ("job_sets/js1.txt", True)]:
+        expected:list[JobTable] = list(job_manager.ChunkedJobReader(file_name, chunk_size=50, sort=sort))
+        iterator:job_manager.ChunkedJobIterator = iter(job_manager.ChunkedJobReader(file_name, chunk_size=50,
+                                                                                     sort=sort))
+        for chunk_num in range(3):
+            next(iterator)
+        resumed:job_manager.ChunkedJobIterator = pickle.loads(pickle.dumps(iterator))
+        remaining:list[JobTable] = list(resumed)
+        assert len(remaining) == len(expected) - 3
+        check_same_jobs(JobTable.concatenate(remaining), JobTable.concatenate(expected[3:]))
+
+"""
+A controller reading the jobs from a reader gives the same results as one loading the jobs file
+"""
+def test_controller_with_job_source(tmp_path):
+    expected_file:str = str(tmp_path / "expected.txt")
+    Controller(startup_duration=3, model_config_file="model_config/UJD2_e0.5.txt", jobs_file="job_sets/js1.txt",
+               results_file=expected_file).control_loop()
+    for jobs_file, sort in [("job_sets/js1.txt", True), (write_sorted_js1(tmp_path)[0], False)]:
+        results_file:str = str(tmp_path / "results.txt")
+        Controller(startup_duration=3, model_config_file="model_config/UJD2_e0.5.txt", results_file=results_file,
+                   job_source=job_manager.ChunkedJobReader(jobs_file, chunk_size=64, sort=sort)).control_loop()
+        assert result_manager.load_file_job_results(results_file) == result_manager.load_file_job_results(expected_file)
+
+"""
+A job set written in the binary column format loads sorted, and is known to be sorted without reading its receival times
+"""
+def test_binary_job_set_round_trip(tmp_path):
+    table:JobTable = job_manager.job_table_from_file("job_sets/js1.txt")
+    directory:str = str(tmp_path / ("js1" + job_manager.BINARY_JOB_SET_EXTENSION))
+    job_manager.jobs_to_file(table, directory)
+    loaded:JobTable = job_manager.job_table_from_file(directory)
+    assert loaded.receival_sorted
+    assert loaded.sorted_by_receival_time() is loaded
+    check_same_jobs(loaded, table.sorted_by_receival_time())
+    assert loaded.time_window(100, 200).receival_sorted
+
+    #Job sets written without the metadata file are checked when needed
+    os.remove(os.path.join(directory, job_manager.BINARY_JOB_SET_METADATA))
+    loaded = job_manager.job_table_from_file(directory)
+    assert loaded.receival_sorted is None
+    assert loaded.is_sorted_by_receival_time()
+    assert loaded.receival_sorted
+
+
+"""
+Time windows of a job set are the same whether the set is a binary job set, a sorted text file with or without a time
+index or an unsorted text file, and loading a window writes no files
+"""
+def test_time_windows(tmp_path, monkeypatch):
+    monkeypatch.setattr(job_manager, "TIME_INDEX_INTERVAL", 7)
+    text_file_name, table = write_sorted_js1(tmp_path)
+    directory:str = str(tmp_path / ("js1" + job_manager.BINARY_JOB_SET_EXTENSION))
+    job_manager.jobs_to_file(table, directory)
+    receival_times:list[int] = table.receival_times.tolist()
+    windows:list[typing.Tuple[int, int]] = [(0, -1), (receival_times[5], receival_times[20]),
+                                            (receival_times[len(table) // 2], -1), (receival_times[-1] + 1, -1),
+                                            (receival_times[3] + 1, receival_times[3] + 1)]
+
+    for start_time, end_time in windows:
+        expected:JobTable = table.time_window(start_time, end_time)
+        check_same_jobs(job_manager.job_table_from_file_window(directory, start_time, end_time), expected)
+        check_same_jobs(job_manager.job_table_from_file_window(text_file_name, start_time, end_time), expected)
+        unsorted_window:JobTable = job_manager.job_table_from_file_window("job_sets/js1.txt", start_time, end_time)
+        check_same_jobs(unsorted_window.sorted_by_receival_time(), expected)
+    assert not os.path.exists(text_file_name + job_manager.TIME_INDEX_EXTENSION)
+    assert not os.path.exists("job_sets/js1.txt" + job_manager.TIME_INDEX_EXTENSION)
+
+    index_file_name:str = job_manager.write_time_index(text_file_name)
+    assert index_file_name == text_file_name + job_manager.TIME_INDEX_EXTENSION
+    assert len(job_manager.load_time_index(text_file_name)) == (len(table) + 6) // 7
+    for start_time, end_time in windows:
+        check_same_jobs(job_manager.job_table_from_file_window(text_file_name, start_time, end_time),
+                        table.time_window(start_time, end_time))
+
+"""
+The time index can be written to any path, and a file that is not sorted by receival time cannot be indexed
+"""
+def test_time_index_path(tmp_path):
+    text_file_name, table = write_sorted_js1(tmp_path)
+    index_file_name:str = job_manager.write_time_index(text_file_name, str(tmp_path / "index"))
+    assert index_file_name == str(tmp_path / "index")
+    assert job_manager.load_time_index(text_file_name) is None
+    assert len(job_manager.load_time_index(text_file_name, index_file_name)) > 0
+    check_same_jobs(job_manager.job_table_from_file_window(text_file_name, table.get_receival_time(400), -1,
+                                                           index_file_name=index_file_name),
+                    table.take(slice(int(np.searchsorted(table.receival_times, table.get_receival_time(400))), None)))
+    try:
+        job_manager.write_time_index("job_sets/js1.txt", str(tmp_path / "unsorted_index"))
+    except ValueError:
+        return
+    assert False, "Indexing an unsorted file did not raise an error"
+
+"""
+A controller with a start time only releases the jobs received from then on, and starts again from it when reset
+"""
+def test_controller_time_window(tmp_path):
+    table:JobTable = job_manager.job_table_from_file("job_sets/js1.txt").sorted_by_receival_time()
+    start_time:int = table.get_receival_time(len(table) // 3)
+    end_time:int = table.get_receival_time(2 * len(table) // 3)
+    results_file:str = str(tmp_path / "results.txt")
+    controller:Controller = Controller(startup_duration=1, model_config_file="model_config/FIFO_c10.txt",
+                                       jobs_file="job_sets/js1.txt", results_file=results_file,
+                                       start_time=start_time, end_time=end_time)
+    assert controller.get_time() == start_time
+    controller.control_loop()
+    results:typing.Tuple[int, int, typing.Dict[str, int]] = result_manager.load_file_job_results(results_file)
+    assert sorted(results[2]) == sorted(table.time_window(start_time, end_time).ids.tolist())
+    controller.reset()
+    assert controller.get_time() == start_time
+    controller.control_loop()
+    assert result_manager.load_file_job_results(results_file) == results
+
+
+"""
+A run on a binary job set gives the same results as a run on the text file, the results are kept by the system so the
+memory mapped table does not get a completion column
+"""
+def test_controller_with_binary_job_set(tmp_path):
+    directory:str = str(tmp_path / ("js1" + job_manager.BINARY_JOB_SET_EXTENSION))
+    job_manager.jobs_to_file(job_manager.job_table_from_file("job_sets/js1.txt"), directory)
+    expected_file:str = str(tmp_path / "expected.txt")
+    Controller(startup_duration=2, model_config_file="model_config/KJD1_e0.2.txt", jobs_file="job_sets/js1.txt",
+               results_file=expected_file).control_loop()
+    results_file:str = str(tmp_path / "results.txt")
+    controller:Controller = Controller(startup_duration=2, model_config_file="model_config/KJD1_e0.2.txt",
+                                       jobs_file=directory, results_file=results_file)
+    controller.control_loop()
+    assert result_manager.load_file_job_results(results_file) == result_manager.load_file_job_results(expected_file)
+    assert set(vars(controller.jobs)) == set(job_manager.BINARY_JOB_SET_COLUMNS) | {"receival_sorted"}
\ No newline at end of file
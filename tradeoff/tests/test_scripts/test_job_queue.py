@@ -0,0 +1,154 @@
+import random
+from tradeoff.system.job import Job
+from tradeoff.system.job_queue import JobQueue
+
+"""
+Creates jobs with different execution times
+
+Args:
+    num_jobs: the number of jobs
+
+Returns:
+    The jobs
+"""
+def make_jobs(num_jobs:int)->list[Job]:
+    return [Job(job_id=str(job_num), execution_time=job_num % 7 + 1, receival_time=0) for job_num in range(num_jobs)]
+
+"""
+Checks that a queue holds the given jobs, in order, and that the work before each job is correct
+
+Args:
+    queue: the queue
+    jobs: the jobs expected in the queue
+"""
+def check_queue(queue:JobQueue, jobs:list[Job]):
+    assert list(queue) == jobs
+    assert len(queue) == len(jobs)
+    work:int = 0
+    for position, job in enumerate(jobs):
+        assert job in queue
+        assert queue[position] is job
+        assert queue.work_before(job) == work
+        work += job.get_execution_time()
+    if len(jobs) > 0:
+        assert queue.peek() is jobs[0]
+        assert queue[-1] is jobs[-1]
+    else:
+        assert queue.peek() is None
+
+"""
+Appending and popping keeps the order and the work before each job
+"""
+def test_append_and_popleft():
+    jobs:list[Job] = make_jobs(20)
+    queue:JobQueue = JobQueue(jobs[:10])
+    for job in jobs[10:]:
+        queue.append(job)
+    check_queue(queue, jobs)
+    for job_num in range(5):
+        assert queue.popleft() is jobs[job_num]
+    check_queue(queue, jobs[5:])
+
+"""
+Removing jobs from the head, the middle and the end of the queue
+"""
+def test_remove():
+    jobs:list[Job] = make_jobs(10)
+    queue:JobQueue = JobQueue(jobs)
+    for job in [jobs[4], jobs[0], jobs[9], jobs[1]]:
+        queue.remove(job)
+        jobs.remove(job)
+        check_queue(queue, jobs)
+    assert queue.head == 2
+
+"""
+Removing a job that is not in the queue raises an error
+"""
+def test_remove_missing_job():
+    jobs:list[Job] = make_jobs(3)
+    queue:JobQueue = JobQueue(jobs[:2])
+    try:
+        queue.remove(jobs[2])
+    except ValueError:
+        return
+    assert False, "Removing a missing job did not raise an error"
+
+"""
+Reordering keeps the unchanged prefix in place and reports the jobs removed and added after it
+"""
+def test_reorder():
+    jobs:list[Job] = make_jobs(8)
+    queue:JobQueue = JobQueue(jobs)
+    queue.popleft()
+    new_order:list[Job] = [jobs[1], jobs[2], jobs[5], jobs[3], jobs[4]]
+    removed_jobs, added_jobs = queue.reorder(new_order)
+    assert removed_jobs == jobs[3:]
+    assert added_jobs == new_order[2:]
+    check_queue(queue, new_order)
+
+"""
+Reordering to the same order, to an empty order and to a completely different order
+"""
+def test_reorder_edge_cases():
+    jobs:list[Job] = make_jobs(6)
+    queue:JobQueue = JobQueue(jobs[:4])
+    removed_jobs, added_jobs = queue.reorder(jobs[:4])
+    assert removed_jobs == [] and added_jobs == []
+    check_queue(queue, jobs[:4])
+
+    removed_jobs, added_jobs = queue.reorder([])
+    assert removed_jobs == jobs[:4] and added_jobs == []
+    check_queue(queue, [])
+
+    removed_jobs, added_jobs = queue.reorder(jobs[4:])
+    assert removed_jobs == [] and added_jobs == jobs[4:]
+    check_queue(queue, jobs[4:])
+
+"""
+A queue with many removed jobs is compacted, and stays correct afterwards
+"""
+def test_compaction(monkeypatch):
+    monkeypatch.setattr(JobQueue, "MIN_COMPACTION_SIZE", 4)
+    jobs:list[Job] = make_jobs(20)
+    queue:JobQueue = JobQueue(jobs)
+    for job_num in range(1, 20, 2):
+        queue.remove(jobs[job_num])
+    queue.remove(jobs[2])
+    kept_jobs:list[Job] = [job for job_num, job in enumerate(jobs) if job_num % 2 == 0 and job_num != 2]
+    assert len(queue.slots) == len(kept_jobs)
+    check_queue(queue, kept_jobs)
+    queue.append(jobs[1])
+    check_queue(queue, kept_jobs + [jobs[1]])
+
+"""
+Random appends, pops, removals and reorders give the same queue as a list
+"""
+def test_random_operations(monkeypatch):
+    monkeypatch.setattr(JobQueue, "MIN_COMPACTION_SIZE", 8)
+    rng:random.Random = random.Random(0)
+    jobs:list[Job] = make_jobs(400)
+    queue:JobQueue = JobQueue()
+    expected:list[Job] = []
+    next_job:int = 0
+    for step in range(2000):
+        operation:int = rng.randrange(4)
+        if operation == 0 and next_job < len(jobs):
+            queue.append(jobs[next_job])
+            expected.append(jobs[next_job])
+            next_job += 1
+        elif operation == 1 and len(expected) > 0:
+            assert queue.popleft() is expected.pop(0)
+        elif operation == 2 and len(expected) > 0:
+            job:Job = rng.choice(expected)
+            queue.remove(job)
+            expected.remove(job)
+        elif operation == 3 and len(expected) > 0:
+            num_unchanged:int = rng.randrange(len(expected) + 1)
+            suffix:list[Job] = expected[num_unchanged:]
+            rng.shuffle(suffix)
+            new_order:list[Job] = expected[:num_unchanged] + suffix[:rng.randrange(len(suffix) + 1)]
+            queue.reorder(new_order)
+            expected = new_order
+        if step % 50 == 0:
+            check_queue(queue, expected)
+    check_queue(queue, expected)
\ No newline at end of file
@@ -0,0 +1,78 @@
+import pickle
+from tradeoff.results.result_store import ResultStore
+
+"""
+Adds results to a store
+
+Args:
+    store: the store
+    first: the number of the first result
+    num_results: the number of results added
+"""
+def add_results(store:ResultStore, first:int, num_results:int):
+    for result_num in range(first, first + num_results):
+        store.add("job" + str(result_num), 2 * result_num, result_num % 5)
+
+"""
+Spilled results are read back from the results file before the results held in memory, in the order they were added
+"""
+def test_spill_keeps_rows(tmp_path):
+    file_name:str = str(tmp_path / "results")
+    store:ResultStore = ResultStore()
+    add_results(store, 0, 1500)
+    store.spill(file_name)
+    assert store.size == 0 and len(store) == 1500
+    add_results(store, 1500, 10)
+    store.spill(file_name)
+    add_results(store, 1510, 3)
+    assert len(store) == 1513
+    assert list(store.rows()) == [("job" + str(result_num), 2 * result_num, result_num % 5)
+                                  for result_num in range(1513)]
+
+"""
+A pickled store only holds the rows in memory and the size of the results file, rows written to the file after it was
+pickled are not part of the unpickled store and are overwritten when it spills
+"""
+def test_pickled_store_ignores_later_rows(tmp_path):
+    file_name:str = str(tmp_path / "results")
+    store:ResultStore = ResultStore()
+    empty_size:int = len(pickle.dumps(store))
+    add_results(store, 0, 5000)
+    store.spill(file_name)
+    pickled:bytes = pickle.dumps(store)
+    assert len(pickled) <= empty_size + 100
+
+    add_results(store, 5000, 20)
+    store.spill(file_name)
+    unpickled:ResultStore = pickle.loads(pickled)
+    assert len(unpickled) == 5000
+    add_results(unpickled, 7000, 2)
+    unpickled.spill(file_name)
+    assert [row[0] for row in unpickled.rows()][4998:] == ["job4998", "job4999", "job7000", "job7001"]
+
+"""
+A store only spills to one results file
+"""
+def test_spill_to_other_file(tmp_path):
+    store:ResultStore = ResultStore()
+    add_results(store, 0, 2)
+    store.spill(str(tmp_path / "results"))
+    try:
+        store.spill(str(tmp_path / "other_results"))
+    except ValueError:
+        return
+    assert False, "Spilling to another file did not raise an error"
+
+"""
+The store grows past its initial capacity and widens its ids for longer job ids without changing the results added
+before
+"""
+def test_growth_keeps_rows():
+    store:ResultStore = ResultStore()
+    add_results(store, 0, ResultStore.INITIAL_CAPACITY * 3 + 1)
+    store.add("a_much_longer_job_id_than_before", 1, 2)
+    assert len(store) == ResultStore.INITIAL_CAPACITY * 3 + 2
+    rows:list = list(store.rows())
+    assert rows[:-1] == [("job" + str(result_num), 2 * result_num, result_num % 5)
+                         for result_num in range(ResultStore.INITIAL_CAPACITY * 3 + 1)]
+    assert rows[-1] == ("a_much_longer_job_id_than_before", 1, 2)
\ No newline at end of file
@@ -0,0 +1,158 @@
+import random
+import typing
+from tradeoff.system.simulated_system import SimulatedSystem
+from tradeoff.system.container import Container
+from tradeoff.system.job import Job
+from tradeoff.system.action import Action
+from tradeoff.system.action_batch import ActionBatch
+from tradeoff.util import scheduler_util
+
+"""
+Random additions and removals of pending jobs keep the jobs in order of receival time and then of arrival
+"""
+def test_pending_jobs_random_operations(monkeypatch):
+    monkeypatch.setattr(scheduler_util.PendingJobs, "MIN_COMPACTION_SIZE", 8)
+    rng:random.Random = random.Random(0)
+    pending_jobs:scheduler_util.PendingJobs = scheduler_util.PendingJobs()
+    expected:list[Job] = []
+    for job_num in range(3000):
+        if rng.random() < 0.6:
+            #Jobs mostly arrive in order of receival time
+            receival_time:int = job_num // 3 - (rng.randrange(20) if rng.random() < 0.1 else 0)
+            job:Job = Job(job_id=str(job_num), execution_time=1, receival_time=receival_time)
+            pending_jobs.add([job])
+            expected.append(job)
+        elif len(expected) > 0:
+            removed_jobs:list[Job] = expected[:rng.randrange(3)] + rng.sample(expected, min(len(expected), 2))
+            removed_jobs = list(dict.fromkeys(removed_jobs))
+            pending_jobs.remove(removed_jobs)
+            expected = [job for job in expected if job not in removed_jobs]
+        if job_num % 100 == 0:
+            assert list(pending_jobs) == sorted(expected, key=lambda job: job.get_receival_time())
+            assert len(pending_jobs) == len(expected)
+            assert list(pending_jobs.copy()) == list(pending_jobs)
+    assert pending_jobs.get_jobs() == sorted(expected, key=lambda job: job.get_receival_time())
+
+"""
+Removing every pending job empties the lists, so removing the jobs from the head does not keep them
+"""
+def test_pending_jobs_remove_all():
+    jobs:list[Job] = [Job(job_id=str(job_num), execution_time=1, receival_time=job_num) for job_num in range(10)]
+    pending_jobs:scheduler_util.PendingJobs = scheduler_util.PendingJobs()
+    pending_jobs.add(jobs)
+    pending_jobs.remove(jobs[:4])
+    assert pending_jobs.head == 4 and list(pending_jobs) == jobs[4:]
+    pending_jobs.remove(jobs[4:])
+    assert len(pending_jobs.jobs) == 0 and len(pending_jobs) == 0
+
+"""
+Finds the container that will be done first by looking at every container of a system
+
+Args:
+    system: the system
+
+Returns:
+    The time until the container is done and the container, or None if there are no containers
+"""
+def first_done_container(system:SimulatedSystem)->typing.Optional[typing.Tuple[int, Container]]:
+    containers:list[Container] = list(system.get_containers())
+    if len(containers) == 0:
+        return None
+    container_num:int = min(range(len(containers)), key=lambda num: (containers[num].time_until_done(), num))
+    return containers[container_num].time_until_done(), containers[container_num]
+
+"""
+The container that will be done first is the same as found by looking at every container, as containers start up,
+run, are given work and are terminated
+"""
+def test_container_done_times_random_operations():
+    rng:random.Random = random.Random(1)
+    system:SimulatedSystem = SimulatedSystem(startup_duration=3)
+    done_times:scheduler_util.ContainerDoneTimes = scheduler_util.ContainerDoneTimes()
+    job_num:int = 0
+    for step in range(400):
+        system.run(system.get_time() + rng.randrange(4))
+        if rng.random() < 0.1 or len(system.get_containers()) == 0:
+            system.activate_container(initial_jobs=[Job(job_id=str(job_num), execution_time=rng.randrange(6),
+                                                        receival_time=system.get_time())])
+            job_num += 1
+        if rng.random() < 0.05 and len(system.get_containers()) > 1:
+            system.terminate_container(rng.choice(list(system.get_containers())))
+        done_times.sync(system)
+        for assignment in range(rng.randrange(4)):
+            first:typing.Optional[typing.Tuple[int, int, Container]] = done_times.peek()
+            assert (first[0], first[2]) == first_done_container(system)
+            job:Job = Job(job_id=str(job_num), execution_time=rng.randrange(5), receival_time=system.get_time())
+            job_num += 1
+            done_times.add_work(job.get_execution_time())
+            system.assign_jobs([job], first[2])
+
+"""
+Random load updates keep the first container from a position with a load below a threshold the same as found by looking
+at every container
+"""
+def test_load_tree_random_operations():
+    rng:random.Random = random.Random(2)
+    for num_containers in [1, 2, 5, 8, 13]:
+        loads:list[int] = [rng.randrange(20) for container in range(num_containers)]
+        load_tree:scheduler_util.LoadTree = scheduler_util.LoadTree(list(loads))
+        for step in range(300):
+            container:int = rng.randrange(num_containers)
+            loads[container] = rng.randrange(20)
+            load_tree.update(container, loads[container])
+            start:int = rng.randrange(num_containers + 1)
+            threshold:int = rng.randrange(22)
+            expected:int = next((num for num in range(start, num_containers) if loads[num] < threshold), -1)
+            assert load_tree.first_below(start, threshold) == expected
+            assert [load_tree.get(num) for num in range(num_containers)] == loads
+"""
+Random batches of actions performed together leave a system in the same state as the same actions performed one at a
+time as action objects, including the terminations of stale containers added to either
+"""
+def test_action_batch_matches_action_objects():
+    rng:random.Random = random.Random(3)
+    batch_system:SimulatedSystem = SimulatedSystem(startup_duration=2)
+    action_system:SimulatedSystem = SimulatedSystem(startup_duration=2)
+    job_num:int = 0
+    for step in range(300):
+        time:int = batch_system.get_time() + rng.randrange(4)
+        batch_system.run(time)
+        action_system.run(time)
+        num_containers:int = len(batch_system.get_containers())
+        #Actions as (type, container index, jobs), jobs are shared so both systems complete the same objects
+        specs:list[typing.Tuple[int, int, list[Job]]] = []
+        for action_num in range(rng.randrange(6)):
+            jobs:list[Job] = [Job(job_id=str(job_num + num), execution_time=rng.randrange(4), receival_time=time)
+                              for num in range(rng.randrange(3))]
+            job_num += len(jobs)
+            if rng.random() < 0.4 or num_containers == 0:
+                specs.append((Action.ACTIVATE_CONTAINER, -1, jobs))
+            else:
+                specs.append((Action.ADD_JOBS, rng.randrange(num_containers), jobs))
+        if num_containers > 1 and rng.random() < 0.2:
+            specs.append((Action.TERMINATE_CONTAINER, rng.randrange(num_containers), []))
+        batch_containers:list[Container] = list(batch_system.get_containers())
+        action_containers:list[Container] = list(action_system.get_containers())
+        batch:ActionBatch = ActionBatch()
+        actions:list[Action] = []
+        for action_type, container_num, jobs in specs:
+            has_container:bool = container_num >= 0
+            batch.add(action_type=action_type, container=batch_containers[container_num] if has_container else None,
+                      jobs=jobs)
+            actions.append(Action(action_type, container=action_containers[container_num] if has_container else None,
+                                  jobs=list(jobs)))
+        if not any([action_type == Action.TERMINATE_CONTAINER for action_type, container_num, jobs in specs]):
+            assert (scheduler_util.terminate_stale_containers(batch_system, batch)
+                    == scheduler_util.terminate_stale_containers(action_system, actions))
+        assert len(batch) == len(actions)
+        batch_system.perform_actions(batch)
+        action_system.perform_actions(actions)
+        assert batch_system.get_cost() == action_system.get_cost()
+        assert batch_system.get_assigned_jobs() == action_system.get_assigned_jobs()
+        assert ([(container.get_state(), container.time_until_done(), list(container.get_jobs()))
+                 for container in batch_system.get_containers()]
+                == [(container.get_state(), container.time_until_done(), list(container.get_jobs()))
+                    for container in action_system.get_containers()])
+        assert batch_system.get_next_event_time() == action_system.get_next_event_time()
+        assert batch_system.get_min_time_until_done() == action_system.get_min_time_until_done()
+    assert list(batch_system.get_results().rows()) == list(action_system.get_results().rows())
\ No newline at end of file
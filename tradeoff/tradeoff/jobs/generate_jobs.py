@@ -7,8 +7,11 @@ Generates jobs to a specified file
 """
 parser = argparse.ArgumentParser()
 parser.add_argument("job_config_file", help="Name of config file containing job metadata")
-parser.add_argument("jobs_file", help="Name of file where jobs will be saved")
+parser.add_argument("jobs_file", help="Name of file where jobs will be saved, names ending in .jobs are saved in the "
+                                      "binary column format")
 parser.add_argument("--max_bound", help="Maximum bound size for jobs, if not specified than deterministic jobs are generated")
+parser.add_argument("--time_index", action="store_true", help="Also write the time index of a text jobs file, so time "
+                                                              "windows of it can be loaded without reading the whole file")
 args = parser.parse_args()
 config_file = args.job_config_file
 
@@ -18,4 +21,8 @@ if args.max_bound:
 else:
     jobs: list[Job] = job_manager.generate_jobs_from_file(job_meta_data_file_name=config_file)
 
-job_manager.jobs_to_file(jobs, args.jobs_file)
\ No newline at end of file
+#Jobs are written in order of receival time, so the file can be streamed (see job_manager.ChunkedJobReader)
+jobs.sort(key=lambda job: job.get_receival_time())
+job_manager.jobs_to_file(jobs, args.jobs_file)
+if args.time_index and not args.jobs_file.endswith(job_manager.BINARY_JOB_SET_EXTENSION):
+    job_manager.write_time_index(args.jobs_file)
\ No newline at end of file
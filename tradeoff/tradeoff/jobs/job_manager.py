@@ -1,8 +1,12 @@
 from scipy.stats import poisson, expon, skewnorm
 import numpy as np
 from tradeoff.system.job import Job
+from tradeoff.system.job_table import JobTable
 import typing
 import random
+import itertools
+import json
+import os
 
 """
 Generate a list jobs using meta data from a file, currently does not add deadlines
@@ -97,8 +101,8 @@ def generate_bounded_jobs_from_file(job_meta_data_file_name:str, max_bound_size:
         true_time:int = job.get_execution_time()
         min_bound:int = max(1, true_time+1-bound_location)
         max_bound:int = true_time+bound_size-bound_location
-        job.add_other_info(key=Job.EXECUTION_TIME_LOWER_BOUND, value=str(min_bound))
-        job.add_other_info(key=Job.EXECUTION_TIME_UPPER_BOUND, value=str(max_bound))
+        job.execution_time_lower_bound = min_bound
+        job.execution_time_upper_bound = max_bound
     return jobs
 
 """
@@ -168,8 +172,8 @@ def generate_bounded_jobs(num_jobs:int, id_prefix:str, start_time:int, end_time:
         true_time:int = job.get_execution_time()
         min_bound:int = max(1, true_time+1-bound_location)
         max_bound:int = true_time+bound_size-bound_location
-        job.add_other_info(key=Job.EXECUTION_TIME_LOWER_BOUND, value=str(min_bound))
-        job.add_other_info(key=Job.EXECUTION_TIME_UPPER_BOUND, value=str(max_bound))
+        job.execution_time_lower_bound = min_bound
+        job.execution_time_upper_bound = max_bound
     return jobs
 
 """
@@ -200,18 +204,53 @@ def job_from_string(s:str)->Job:
     other_info_str:list[str] = split_s[3:]
     i:int = 0
     while i < len(other_info_str):
-        job.add_other_info(int(other_info_str[i]), other_info_str[i+1])
+        job.add_other_info(int(other_info_str[i]), other_info_str[i+1].strip())
         i += 2
     return job
 
 """
-Writes a list of jobs to a file
+Returns the string representations of the rows of a job table, in the same format as job_to_string
 
 Args:
-    jobs: list of jobs
+    job_table: the job table
+"""
+def job_table_to_strings(job_table:JobTable)->list[str]:
+    lines:list[str] = []
+    for row in range(len(job_table)):
+        s:str = str(job_table.ids[row]) + "," + str(job_table.receival_times[row]) + "," + str(job_table.execution_times[row])
+        if job_table.lower_bounds[row] != JobTable.NO_BOUND:
+            s += "," + str(Job.EXECUTION_TIME_LOWER_BOUND) + "," + str(job_table.lower_bounds[row])
+        if job_table.upper_bounds[row] != JobTable.NO_BOUND:
+            s += "," + str(Job.EXECUTION_TIME_UPPER_BOUND) + "," + str(job_table.upper_bounds[row])
+        lines.append(s)
+    return lines
+
+#Job sets with names ending in this extension are stored in the binary column format (see job_table_to_directory)
+BINARY_JOB_SET_EXTENSION = ".jobs"
+
+#Columns of a job table stored in the binary column format
+BINARY_JOB_SET_COLUMNS = ("ids", "receival_times", "execution_times", "lower_bounds", "upper_bounds", "deadlines")
+
+#File of a job set in the binary column format that holds what is known about its rows
+BINARY_JOB_SET_METADATA = "metadata.json"
+
+"""
+Writes a list of jobs to a file, file names ending in BINARY_JOB_SET_EXTENSION are written in the binary column format
+
+Args:
+    jobs: list of jobs or a job table
     file_name: file jobs will be saved to
 """
-def jobs_to_file(jobs:list[Job], file_name:str):
+def jobs_to_file(jobs:typing.Union[list[Job], JobTable], file_name:str):
+    if file_name.endswith(BINARY_JOB_SET_EXTENSION):
+        if not isinstance(jobs, JobTable):
+            jobs = JobTable.from_jobs(jobs)
+        job_table_to_directory(jobs, file_name)
+        return
+    if isinstance(jobs, JobTable):
+        with open(file_name, "w") as file:
+            file.write("\n".join(job_table_to_strings(jobs)))
+        return
     file:typing.TextIO = open(file_name, "w")
     for i, job in enumerate(jobs):
         s:str = job_to_string(job)
@@ -232,4 +271,312 @@ def jobs_from_file(file_name:str)->list[Job]:
     for line in file.readlines():
         job:Job = job_from_string(line)
         jobs.append(job)
-    return jobs
\ No newline at end of file
+    return jobs
+
+"""
+Loads jobs from a file into a job table, in the same format as jobs_from_file, without creating job objects, a
+directory in the binary column format is memory mapped (see job_table_from_directory)
+
+Args:
+    file_name: the name of the file
+
+Returns:
+    The job table, with rows in file order
+"""
+def job_table_from_file(file_name:str)->JobTable:
+    if os.path.isdir(file_name):
+        return job_table_from_directory(file_name)
+    with open(file_name, "r") as file:
+        return job_table_from_lines(file)
+
+"""
+Writes a job table in the binary column format, a directory with a .npy file for each column, rows are sorted by
+receival time, which is recorded in the metadata file so loading the job set does not have to check it
+
+Args:
+    job_table: the job table
+    directory: the directory the columns are saved to, created if it does not exist
+"""
+def job_table_to_directory(job_table:JobTable, directory:str):
+    job_table = job_table.sorted_by_receival_time()
+    os.makedirs(directory, exist_ok=True)
+    for column in BINARY_JOB_SET_COLUMNS:
+        np.save(os.path.join(directory, column + ".npy"), getattr(job_table, column))
+    with open(os.path.join(directory, BINARY_JOB_SET_METADATA), "w") as metadata_file:
+        json.dump({"num_jobs": len(job_table), "sorted_by_receival_time": True}, metadata_file)
+
+"""
+Loads a job table from the binary column format, the columns are memory mapped read only so nothing is read until it is
+used and processes loading the same job set share the pages
+
+Args:
+    directory: the directory written by job_table_to_directory
+
+Returns:
+    The job table, sorted by receival time (job sets written without a metadata file are checked when it is needed)
+"""
+def job_table_from_directory(directory:str)->JobTable:
+    columns:typing.Dict[str, np.ndarray] = {column: np.load(os.path.join(directory, column + ".npy"), mmap_mode="r")
+                                            for column in BINARY_JOB_SET_COLUMNS}
+    metadata:typing.Dict[str, typing.Any] = {}
+    metadata_file_name:str = os.path.join(directory, BINARY_JOB_SET_METADATA)
+    if os.path.exists(metadata_file_name):
+        with open(metadata_file_name, "r") as metadata_file:
+            metadata = json.load(metadata_file)
+    return JobTable(**columns, receival_sorted=metadata.get("sorted_by_receival_time"))
+
+#Extension of the time index file of a text job file (see write_time_index)
+TIME_INDEX_EXTENSION = ".idx.npy"
+
+#Number of lines between entries of a time index
+TIME_INDEX_INTERVAL = 1024
+
+"""
+Builds the time index of a text job file that is sorted by receival time, the index holds the receival time and byte
+offset of every TIME_INDEX_INTERVAL-th line
+
+Args:
+    file_name: the name of the file
+
+Returns:
+    The index, an array with a row of (receival time, byte offset) for each entry
+
+Raises:
+    ValueError: if the file is not sorted by receival time
+"""
+def build_time_index(file_name:str)->np.ndarray:
+    entries:list[typing.Tuple[int, int]] = []
+    offset:int = 0
+    line_num:int = 0
+    last_receival_time:typing.Optional[int] = None
+    with open(file_name, "rb") as file:
+        for line in file:
+            split_line:list[bytes] = line.split(b",", 2)
+            if len(split_line) >= 2:
+                receival_time:int = int(split_line[1])
+                if last_receival_time is not None and receival_time < last_receival_time:
+                    raise ValueError("Job file is not sorted by receival time: " + file_name)
+                if line_num % TIME_INDEX_INTERVAL == 0:
+                    entries.append((receival_time, offset))
+                last_receival_time = receival_time
+                line_num += 1
+            offset += len(line)
+    return np.array(entries, dtype=np.int64).reshape(-1, 2)
+
+"""
+Builds the time index of a text job file that is sorted by receival time and writes it to a file, so time windows of the
+job file can be loaded without reading the lines before them (see job_table_from_file_window)
+
+Args:
+    file_name: the name of the job file
+    index_file_name: the name of the index file, empty to write it next to the job file with TIME_INDEX_EXTENSION
+
+Returns:
+    The name of the index file
+
+Raises:
+    ValueError: if the file is not sorted by receival time
+"""
+def write_time_index(file_name:str, index_file_name:str="")->str:
+    if index_file_name == "":
+        index_file_name = file_name + TIME_INDEX_EXTENSION
+    #np.save adds the .npy extension to names without it
+    with open(index_file_name, "wb") as index_file:
+        np.save(index_file, build_time_index(file_name))
+    return index_file_name
+
+"""
+Loads the time index of a text job file written by write_time_index, nothing is written
+
+Args:
+    file_name: the name of the job file
+    index_file_name: the name of the index file, empty for the file next to the job file with TIME_INDEX_EXTENSION
+
+Returns:
+    The index (see build_time_index), or None if there is no index file or it is older than the job file
+"""
+def load_time_index(file_name:str, index_file_name:str="")->typing.Optional[np.ndarray]:
+    if index_file_name == "":
+        index_file_name = file_name + TIME_INDEX_EXTENSION
+    if os.path.exists(index_file_name) and os.path.getmtime(index_file_name) >= os.path.getmtime(file_name):
+        return np.load(index_file_name)
+    return None
+
+"""
+Loads the jobs received in a time window from a job file
+
+Binary job sets are searched and sliced without copying. Text job files with a time index (see write_time_index) are
+only read from the offset found in the index to the end of the window, other text job files are read in full and
+filtered.
+
+Args:
+    file_name: the name of the file or binary job set directory
+    start_time: the start of the window
+    end_time: the end of the window (exclusive), -1 if the window has no end
+    index_file_name: the name of the time index file, empty for the file next to the job file
+
+Returns:
+    The job table of the jobs received in the window
+"""
+def job_table_from_file_window(file_name:str, start_time:int, end_time:int=-1, index_file_name:str="")->JobTable:
+    if os.path.isdir(file_name):
+        return job_table_from_directory(file_name).time_window(start_time, end_time)
+    index:typing.Optional[np.ndarray] = load_time_index(file_name, index_file_name)
+    if index is None:
+        return job_table_from_file(file_name).time_window(start_time, end_time)
+
+    # Every line before an entry received before the window is also received before the window
+    entry:int = max(0, int(np.searchsorted(index[:, 0], start_time, side="left")) - 1)
+    offset:int = int(index[entry, 1]) if len(index) > 0 else 0
+    chunks:list[JobTable] = []
+    with open(file_name, "rb") as file:
+        file.seek(offset)
+        while True:
+            lines:list[str] = [line.decode() for line in itertools.islice(file, ChunkedJobReader.CHUNK_SIZE)]
+            if len(lines) == 0:
+                break
+            chunk:JobTable = job_table_from_lines(lines)
+            chunk.receival_sorted = True
+            chunks.append(chunk.time_window(start_time, end_time))
+            if len(chunk) > 0 and end_time != -1 and chunk.get_receival_time(len(chunk) - 1) >= end_time:
+                break
+    return JobTable.concatenate(chunks) if len(chunks) > 0 else JobTable.from_jobs([])
+
+"""
+Parses lines in the same format as jobs_from_file into a job table, blank lines are skipped
+
+Args:
+    lines: the lines
+
+Returns:
+    The job table, with rows in line order
+"""
+def job_table_from_lines(lines:typing.Iterable[str])->JobTable:
+    ids:list[str] = []
+    receival_times:list[int] = []
+    execution_times:list[int] = []
+    lower_bounds:list[int] = []
+    upper_bounds:list[int] = []
+    for line in lines:
+        split_line:list[str] = line.strip().split(",")
+        if split_line[0] == "":
+            continue
+        ids.append(split_line[0])
+        receival_times.append(int(split_line[1]))
+        execution_times.append(int(split_line[2]))
+        other_info:typing.Dict[int, int] = {}
+        i:int = 3
+        while i + 1 < len(split_line):
+            other_info[int(split_line[i])] = int(split_line[i+1])
+            i += 2
+        lower_bounds.append(other_info.get(Job.EXECUTION_TIME_LOWER_BOUND, JobTable.NO_BOUND))
+        upper_bounds.append(other_info.get(Job.EXECUTION_TIME_UPPER_BOUND, JobTable.NO_BOUND))
+    return JobTable(ids=ids, receival_times=receival_times, execution_times=execution_times,
+                    lower_bounds=lower_bounds, upper_bounds=upper_bounds)
+
+"""
+Reads a job file in chunks sorted by receival time, so a sorted file does not have to be loaded into memory at once
+
+Iterating over the reader yields a job table for each chunk of lines, it can be iterated over more than once. The file
+is streamed as it is, so it must be sorted by receival time, such as a file written by generate_jobs, and reading a
+chunk that is received before the chunk before it raises a ValueError. A file that is not sorted, such as the job sets
+in job_sets, is read with sort set, which loads it into memory and sorts it and takes the chunks from the sorted table,
+giving the same jobs in the same order as job_table_from_file(...).sorted_by_receival_time().
+"""
+class ChunkedJobReader:
+    #Default number of lines parsed at a time
+    CHUNK_SIZE = 4096
+
+    """
+    Constructor
+
+    Args:
+        file_name: the name of the file, in the same format as jobs_from_file
+        chunk_size: the number of lines parsed at a time
+        sort: true to load the file into memory and sort it, for files that are not sorted by receival time
+    """
+    def __init__(self, file_name:str, chunk_size:int=CHUNK_SIZE, sort:bool=False):
+        self.file_name:str = file_name
+        self.chunk_size:int = chunk_size
+        self.sort:bool = sort
+
+    def __iter__(self)->'ChunkedJobIterator':
+        return ChunkedJobIterator(self.file_name, self.chunk_size, in_memory=self.sort)
+
+"""
+Iterator of the chunks of a ChunkedJobReader, it only holds its position in the file (or in the sorted table of a file
+that is loaded into memory) so it can be pickled and resumed from the same position (the file is opened or loaded again
+when it is unpickled)
+"""
+class ChunkedJobIterator:
+    """
+    Constructor
+
+    Args:
+        file_name: the name of the file
+        chunk_size: the number of lines parsed at a time
+        in_memory: true to load the file into memory and sort it instead of streaming it
+    """
+    def __init__(self, file_name:str, chunk_size:int, in_memory:bool=False):
+        self.file_name:str = file_name
+        self.chunk_size:int = chunk_size
+        self.in_memory:bool = in_memory
+        #Sorted table of a file loaded into memory and the next row of it
+        self.table:typing.Optional[JobTable] = None
+        self.row:int = 0
+        self.offset:int = 0
+        self.last_receival_time:typing.Optional[int] = None
+        self.file:typing.Optional[typing.BinaryIO] = None
+        self.exhausted:bool = False
+
+    def __iter__(self)->'ChunkedJobIterator':
+        return self
+
+    def __next__(self)->JobTable:
+        if self.in_memory:
+            return self.next_in_memory()
+        while not self.exhausted:
+            if self.file is None:
+                self.file = open(self.file_name, "rb")
+                self.file.seek(self.offset)
+            lines:list[str] = [line.decode() for line in itertools.islice(self.file, self.chunk_size)]
+            self.offset = self.file.tell()
+            if len(lines) == 0:
+                self.exhausted = True
+                self.file.close()
+                self.file = None
+                break
+            chunk:JobTable = job_table_from_lines(lines)
+            if len(chunk) == 0:
+                continue
+            if (not chunk.is_sorted_by_receival_time()
+                    or (self.last_receival_time is not None and chunk.get_receival_time(0) < self.last_receival_time)):
+                raise ValueError("Job file is not sorted by receival time: " + self.file_name)
+            self.last_receival_time = chunk.get_receival_time(len(chunk) - 1)
+            return chunk
+        raise StopIteration
+
+    """
+    Returns the next chunk of a file loaded into memory, the file is loaded and sorted when the first chunk is read
+
+    Returns:
+        The next chunk
+    """
+    def next_in_memory(self)->JobTable:
+        if self.table is None:
+            self.table = job_table_from_file(self.file_name).sorted_by_receival_time()
+        if self.row >= len(self.table):
+            raise StopIteration
+        chunk:JobTable = self.table.take(slice(self.row, self.row + self.chunk_size))
+        self.row += self.chunk_size
+        return chunk
+
+    def __getstate__(self)->typing.Dict[str, typing.Any]:
+        state:typing.Dict[str, typing.Any] = dict(self.__dict__)
+        state["file"] = None
+        state["table"] = None
+        return state
+
+    def __del__(self):
+        if self.file is not None:
+            self.file.close()
\ No newline at end of file
@@ -1,5 +1,6 @@
 from tradeoff.system.simulated_system import SimulatedSystem
 from tradeoff.system.job import Job
+from tradeoff.results.result_store import ResultStore
 import typing
 import matplotlib.pyplot as plt
 import numpy as np
@@ -9,20 +10,33 @@ Saves the system performance results, including cost and queue time information
 
 Args:
     system: The system with containers
-    jobs: The list of jobs
+    jobs: The list of jobs or the result store of the completed jobs, whose results are written in completion order
     data_file_name: The name of the file to store the information into
+    time_quantum: the time quantum of the run (see Controller), 0 if the run was exact
+    incomplete_jobs: jobs that never completed, written with a queue time of -1 after the jobs of a result store (jobs
+        given as a list already include them)
     
 File:
     Cost <total system cost>
+    Quantum <time quantum> (only if the run was quantized)
     <Job_1 id>,<Job_1 Queue Time>
     <Job_2 id>,<Job_2 Queue Time>
     ...
     <Job_n id>,<Job_n Queue Time>
 """
-def save_system_performance(system:SimulatedSystem, jobs:list[Job], data_file_name:str):
+def save_system_performance(system:SimulatedSystem, jobs:typing.Union[list[Job], ResultStore],
+                            data_file_name:str, time_quantum:int=0, incomplete_jobs:typing.Iterable[Job]=()):
     cost:int = system.get_cost()
     with open(data_file_name, "w") as data_file:
         data_file.write("cost: " + str(cost))
+        if time_quantum > 0:
+            data_file.write("\nquantum: " + str(time_quantum))
+        if isinstance(jobs, ResultStore):
+            for job_id, _, queue_time in jobs.rows():
+                data_file.write("\n" + job_id + "," + str(queue_time))
+            for job in incomplete_jobs:
+                data_file.write("\n" + job.get_id() + ",-1")
+            return
         for job in jobs:
             data_file.write("\n" + job.get_id() + "," + str(job.get_queue_time()))
 
@@ -43,9 +57,102 @@ def load_file_results(file_name:str)->typing.Tuple[int, list[int]]:
     with open(file_name, "r") as data_file:
         data = data_file.readlines()
         cost = int(data[0].split(":")[1].strip())
-        job_queue_times = [int(line.split(",")[1]) for line in data[1:]]
+        job_queue_times = [int(line.split(",")[1]) for line in data[1:] if "," in line]
     return cost, job_queue_times
 
+"""
+Loads the queue time of each job and the time quantum from a file using the same formating as is outputed by
+save_system_performance
+
+Args:
+    file_name: name of file with the results
+
+Returns:
+    The cost
+    The time quantum, 0 if the run was exact
+    Mapping of job ids to their queue times
+"""
+def load_file_job_results(file_name:str)->typing.Tuple[int, int, typing.Dict[str, int]]:
+    cost:int = 0
+    time_quantum:int = 0
+    job_queue_times:typing.Dict[str, int] = {}
+    with open(file_name, "r") as data_file:
+        for line in data_file.read().splitlines():
+            if line.startswith("cost:"):
+                cost = int(line.split(":")[1].strip())
+            elif line.startswith("quantum:"):
+                time_quantum = int(line.split(":")[1].strip())
+            elif "," in line:
+                job_id, queue_time = line.split(",")
+                job_queue_times[job_id] = int(queue_time)
+    return cost, time_quantum, job_queue_times
+
+"""
+Compares the results of a quantized run with the results of the exact run of the same jobs and model, the errors of the
+quantized run are bounded by the largest differences found
+
+The only analytical bound is on the release of jobs: a job is released at most one quantum minus one after it is
+received, and the decisions made when it is released are delayed by as much. The errors in queue time and cost are not
+bounded analytically, as the decisions of a model depend on which jobs are released together and a late decision can
+change the later ones. Bounds on them are empirical: on js1 and rl_test_js1 with a startup time of 1 and quanta of 5 to
+50, the largest queue time error of FIFO, KJD1, KJD2, UJD1 and UJD2 was at most one quantum and the cost was within 4%
+of the exact run.
+
+Args:
+    exact_file_name: name of the file with the results of the exact run
+    quantized_file_name: name of the file with the results of the quantized run
+
+Returns:
+    The report, a mapping of each measure to its value
+        time_quantum - the time quantum of the quantized run
+        max_release_delay - the analytical bound on how late a job is released, the time quantum minus one
+        exact_cost, quantized_cost - the costs of the runs
+        cost_error - quantized cost minus exact cost
+        relative_cost_error - cost error divided by the exact cost
+        num_jobs - the number of jobs completed in both runs
+        missing_jobs - the number of jobs completed in only one of the runs
+        max_queue_time_error - largest absolute difference in the queue time of a job
+        mean_queue_time_error - mean absolute difference in the queue time of a job
+        max_queue_time_bias - largest queue time of the quantized run minus that of the exact run
+        mean_queue_time_bias - mean queue time of the quantized run minus that of the exact run
+"""
+def quantization_error_report(exact_file_name:str, quantized_file_name:str)->typing.Dict[str, float]:
+    exact_cost, _, exact_queue_times = load_file_job_results(exact_file_name)
+    quantized_cost, time_quantum, quantized_queue_times = load_file_job_results(quantized_file_name)
+    job_ids:list[str] = [job_id for job_id in exact_queue_times if job_id in quantized_queue_times]
+    exact:np.ndarray = np.array([exact_queue_times[job_id] for job_id in job_ids], dtype=np.int64)
+    quantized:np.ndarray = np.array([quantized_queue_times[job_id] for job_id in job_ids], dtype=np.int64)
+    errors:np.ndarray = np.abs(quantized - exact)
+    return {
+        "time_quantum": time_quantum,
+        "max_release_delay": max(time_quantum - 1, 0),
+        "exact_cost": exact_cost,
+        "quantized_cost": quantized_cost,
+        "cost_error": quantized_cost - exact_cost,
+        "relative_cost_error": (quantized_cost - exact_cost) / exact_cost if exact_cost != 0 else 0.0,
+        "num_jobs": len(job_ids),
+        "missing_jobs": len(exact_queue_times) + len(quantized_queue_times) - 2 * len(job_ids),
+        "max_queue_time_error": int(errors.max()) if len(job_ids) > 0 else 0,
+        "mean_queue_time_error": float(errors.mean()) if len(job_ids) > 0 else 0.0,
+        "max_queue_time_bias": int(quantized.max() - exact.max()) if len(job_ids) > 0 else 0,
+        "mean_queue_time_bias": float(quantized.mean() - exact.mean()) if len(job_ids) > 0 else 0.0,
+    }
+
+"""
+Saves a report made by quantization_error_report
+
+Args:
+    report: the report
+    file_name: the name of the file to save the report to
+
+File:
+    <measure>: <value>
+    ...
+"""
+def save_quantization_error_report(report:typing.Dict[str, float], file_name:str):
+    with open(file_name, "w") as report_file:
+        report_file.write("\n".join([measure + ": " + str(value) for measure, value in report.items()]))
+
 """
 Plots the graph of maximum queue delay vs cost for multiple schedulers
 
@@ -0,0 +1,139 @@
+import typing
+import numpy as np
+import numpy.typing as npt
+
+"""
+Growable store of the results of completed jobs, kept as NumPy arrays so completed jobs do not have to stay in memory
+
+Each completed job is a row, the arrays double in size when they are full and the id column is widened when a longer id
+is added.
+
+Rows can be spilled to a results file (see spill), which moves them out of memory, the store then only keeps the name
+and size of the file and the number of rows in it. Rows written to the file after its recorded size, such as by a run
+that continued after a checkpoint was saved, are not part of the store and are overwritten by the next spill.
+
+Columns:
+    ids - job ids
+    completion_times - time each job completed
+    queue_times - time each job was queued for
+
+Results file:
+    <Job_1 id>,<Job_1 completion time>,<Job_1 queue time>
+    ...
+"""
+class ResultStore:
+    INITIAL_CAPACITY = 1024
+
+    """
+    Constructor, creates an empty store
+    """
+    def __init__(self):
+        self.ids:npt.NDArray[np.str_] = np.zeros(ResultStore.INITIAL_CAPACITY, dtype=np.str_)
+        self.completion_times:npt.NDArray[np.int64] = np.zeros(ResultStore.INITIAL_CAPACITY, dtype=np.int64)
+        self.queue_times:npt.NDArray[np.int64] = np.zeros(ResultStore.INITIAL_CAPACITY, dtype=np.int64)
+        self.size:int = 0
+        #Results file the spilled rows are in, its size after the last spill and the number of rows in it
+        self.spill_file_name:str = ""
+        self.spill_file_size:int = 0
+        self.num_spilled:int = 0
+
+    """
+    Adds the result of a completed job
+
+    Args:
+        job_id: the id of the job
+        completion_time: the time the job completed
+        queue_time: the time the job was queued for
+    """
+    def add(self, job_id:str, completion_time:int, queue_time:int):
+        if self.size == len(self.ids):
+            extra_rows:int = max(len(self.ids), ResultStore.INITIAL_CAPACITY)
+            self.ids = np.concatenate([self.ids, np.zeros(extra_rows, dtype=self.ids.dtype)])
+            self.completion_times = np.concatenate([self.completion_times, np.zeros(extra_rows, dtype=np.int64)])
+            self.queue_times = np.concatenate([self.queue_times, np.zeros(extra_rows, dtype=np.int64)])
+        if len(job_id) > self.ids.dtype.itemsize // np.dtype("U1").itemsize:
+            self.ids = self.ids.astype(f"U{len(job_id)}")
+        self.ids[self.size] = job_id
+        self.completion_times[self.size] = completion_time
+        self.queue_times[self.size] = queue_time
+        self.size += 1
+
+    """
+    Appends the rows held in memory to the results file and removes them from memory, the first spill creates the file
+
+    Args:
+        file_name: the name of the results file, a store only spills to one file
+
+    Raises:
+        ValueError: if the rows were already spilled to a different file
+    """
+    def spill(self, file_name:str):
+        if self.spill_file_name not in ("", file_name):
+            raise ValueError("Results are already spilled to " + self.spill_file_name)
+        lines:list[str] = [job_id + "," + str(completion_time) + "," + str(queue_time) + "\n"
+                           for job_id, completion_time, queue_time in zip(self.get_ids().tolist(),
+                                                                          self.get_completion_times().tolist(),
+                                                                          self.get_queue_times().tolist())]
+        with open(file_name, "r+b" if self.spill_file_name != "" else "wb") as results_file:
+            results_file.truncate(self.spill_file_size)
+            results_file.seek(self.spill_file_size)
+            results_file.write("".join(lines).encode())
+            self.spill_file_size = results_file.tell()
+        self.spill_file_name = file_name
+        self.num_spilled += self.size
+        self.ids = np.zeros(ResultStore.INITIAL_CAPACITY, dtype=np.str_)
+        self.completion_times = np.zeros(ResultStore.INITIAL_CAPACITY, dtype=np.int64)
+        self.queue_times = np.zeros(ResultStore.INITIAL_CAPACITY, dtype=np.int64)
+        self.size = 0
+
+    """
+    Iterates over every row, the spilled rows are read from the results file followed by the rows held in memory
+
+    Returns:
+        Iterator of the id, completion time and queue time of each completed job, in completion order
+    """
+    def rows(self)->typing.Iterator[typing.Tuple[str, int, int]]:
+        if self.spill_file_name != "":
+            with open(self.spill_file_name, "rb") as results_file:
+                for line in results_file.read(self.spill_file_size).decode().splitlines():
+                    job_id, completion_time, queue_time = line.rsplit(",", 2)
+                    yield job_id, int(completion_time), int(queue_time)
+        yield from zip(self.get_ids().tolist(), self.get_completion_times().tolist(), self.get_queue_times().tolist())
+
+    """
+    Returns the ids of the completed jobs held in memory, spilled rows are not included (see rows)
+
+    Returns:
+        Array of job ids in completion order
+    """
+    def get_ids(self)->npt.NDArray[np.str_]:
+        return self.ids[:self.size]
+
+    """
+    Returns the completion times of the completed jobs held in memory, spilled rows are not included (see rows)
+
+    Returns:
+        Array of completion times in completion order
+    """
+    def get_completion_times(self)->npt.NDArray[np.int64]:
+        return self.completion_times[:self.size]
+
+    """
+    Returns the queue times of the completed jobs held in memory, spilled rows are not included (see rows)
+
+    Returns:
+        Array of queue times in completion order
+    """
+    def get_queue_times(self)->npt.NDArray[np.int64]:
+        return self.queue_times[:self.size]
+
+    def __getstate__(self)->typing.Dict[str, typing.Any]:
+        #Only the rows in use are pickled
+        state:typing.Dict[str, typing.Any] = dict(self.__dict__)
+        state["ids"] = self.get_ids().copy()
+        state["completion_times"] = self.get_completion_times().copy()
+        state["queue_times"] = self.get_queue_times().copy()
+        return state
+
+    def __len__(self)->int:
+        return self.num_spilled + self.size
\ No newline at end of file
@@ -1,11 +1,23 @@
 import argparse
 from tradeoff.system.controller import Controller
+from tradeoff.system import checkpoint
+from tradeoff.results import result_manager
 
 parser = argparse.ArgumentParser()
 parser.add_argument("model_name", help="Name of model (<config folder>\\<model_name>.txt")
 parser.add_argument("job_set", help="Name of job set (<job set folder>\\<job_set>.txt")
 parser.add_argument("startup_time", help="Startup time of the system")
+parser.add_argument("--start_time", type=int, default=0, help="Time to start the simulation at, earlier jobs are not loaded")
+parser.add_argument("--end_time", type=int, default=-1, help="Jobs received from this time on are not loaded")
+parser.add_argument("--checkpoint", default="", help="File a checkpoint is saved to periodically")
+parser.add_argument("--checkpoint_interval", type=int, default=10000, help="Number of steps between checkpoints")
+parser.add_argument("--resume", action="store_true", help="Resume the run from the checkpoint file")
+parser.add_argument("--time_quantum", type=int, default=0, help="Only step the simulation at multiples of this time")
+parser.add_argument("--error_report", action="store_true",
+                    help="Also run the exact simulation and report the error of the quantized run")
 args = parser.parse_args()
+if args.resume and args.checkpoint == "":
+    parser.error("--resume requires the --checkpoint file to resume from")
 
 startup_time = int(args.startup_time)
 model_name = args.model_name
@@ -19,5 +31,21 @@ model_config_file = model_config_folder + model_name + ".txt"
 jobs_file = job_set_folder + job_set + ".txt"
 results_file = results_folder + model_name + "_" + job_set + ".txt"
 
-controller = Controller(startup_duration=startup_time, model_config_file=model_config_file, jobs_file=jobs_file, results_file=results_file)
-controller.control_loop()
\ No newline at end of file
+if args.resume:
+    controller = checkpoint.load_checkpoint(args.checkpoint)
+else:
+    controller = Controller(startup_duration=startup_time, model_config_file=model_config_file, jobs_file=jobs_file, results_file=results_file,
+                            start_time=args.start_time, end_time=args.end_time,
+                            time_quantum=args.time_quantum)
+controller.control_loop(checkpoint_file=args.checkpoint, checkpoint_interval=args.checkpoint_interval)
+
+if args.error_report and args.time_quantum > 0:
+    exact_results_file = results_folder + model_name + "_" + job_set + "_exact.txt"
+    exact_controller = Controller(startup_duration=startup_time, model_config_file=model_config_file, jobs_file=jobs_file,
+                                  results_file=exact_results_file,
+                                  start_time=args.start_time, end_time=args.end_time)
+    exact_controller.control_loop()
+    report = result_manager.quantization_error_report(exact_results_file, results_file)
+    result_manager.save_quantization_error_report(report, results_folder + model_name + "_" + job_set + "_error.txt")
+    for measure, value in report.items():
+        print(measure + ": " + str(value))
\ No newline at end of file
@@ -2,22 +2,32 @@ import tradeoff.system.simulated_system as sim_sys
 from tradeoff.system.job import Job
 from tradeoff.system.action import Action
 from tradeoff.system.container import Container
+import tradeoff.util.scheduler_util as scheduler_util
+import heapq
 import typing
 
 """
 FIFO algorithm
 
 Activates new containers up to the specified maximum and does not shutdown containers
+
+With the incremental parameter FIFO is incremental (see Model.is_incremental), it keeps the unassigned jobs in order of
+receival time and the time each container will be done between calls, so it is only told what changed instead of being
+given every queued job and looking up every container again. The actions are the same either way.
 """
 class FIFO:
     """
     Constructor
 
     Args:
-        params a list of parameters (length 1) 1. number of containers
+        params a list of parameters (length 1 or 2) 1. number of containers 2. "incremental" to only be told what
+            changed since the last call (optional)
     """
     def __init__(self, params:list):
         self.num_containers:int = int(params[0])
+        self.incremental:bool = len(params) > 1 and params[1] == "incremental"
+        self.pending_jobs:scheduler_util.PendingJobs = scheduler_util.PendingJobs()
+        self.container_done_times:scheduler_util.ContainerDoneTimes = scheduler_util.ContainerDoneTimes()
 
     """
     Decides system actions based on the deterministic execution time of jobs
@@ -31,53 +41,99 @@ class FIFO:
     """
 
     def determine_actions(self, system: sim_sys.SimulatedSystem, pending_jobs: list[Job]) -> list[Action]:
-        actions:list[Action] = []
+        container_done_times:scheduler_util.ContainerDoneTimes = scheduler_util.ContainerDoneTimes()
+        container_done_times.sync(system)
+        return self.assign_jobs(system, pending_jobs, container_done_times)
+
+    """
+    Checks if the scheduler is incremental
+
+    Return:
+        True if the scheduler was created with the incremental parameter
+    """
+    def is_incremental(self) -> bool:
+        return self.incremental
 
-        sorted_jobs:list[Job] = sorted(pending_jobs, key=lambda x: x.get_receival_time())
+    """
+    Decides system actions given the changes since the last call, the jobs that are not assigned are kept for the next
+    call
+
+    Args:
+        system: The system being scheduled upon
+        arrived_jobs: the jobs that arrived since the last call
+        completed_jobs: the jobs that completed since the last call
+        idle_containers: the containers that went idle since the last call
+
+    Return:
+        A list of actions to be performed on the system
+    """
+    def update(self, system: sim_sys.SimulatedSystem, arrived_jobs: list[Job], completed_jobs: list[Job],
+               idle_containers: list[Container]) -> list[Action]:
+        self.pending_jobs.add(arrived_jobs)
+        self.container_done_times.sync(system)
+        actions:list[Action] = self.assign_jobs(system, self.pending_jobs, self.container_done_times)
+        self.pending_jobs.remove([job for action in actions for job in action.get_jobs()])
+        return actions
+
+    """
+    Clears the unassigned jobs kept between calls
+    """
+    def reset(self):
+        self.pending_jobs = scheduler_util.PendingJobs()
+        self.container_done_times = scheduler_util.ContainerDoneTimes()
+
+    """
+    Returns a copy of the scheduler with its own unassigned jobs, the containers are looked up again on the first call
+    as the copy can be used with a fork of the system
+
+    Return:
+        The copy
+    """
+    def copy(self) -> 'FIFO':
+        scheduler:FIFO = FIFO([str(self.num_containers)] + (["incremental"] if self.incremental else []))
+        scheduler.pending_jobs = self.pending_jobs.copy()
+        return scheduler
+
+    """
+    Assigns jobs to the container that will be done first, planning new containers up to the maximum
+
+    Args:
+        system: The system being scheduled upon
+        sorted_jobs: the jobs to assign, in order of receival time
+        container_done_times: the time each container of the system will be done, updated with the assigned jobs
+
+    Return:
+        A list of actions to be performed on the system
+    """
+    def assign_jobs(self, system: sim_sys.SimulatedSystem, sorted_jobs: typing.Iterable[Job],
+                    container_done_times: scheduler_util.ContainerDoneTimes) -> list[Action]:
+        actions:list[Action] = []
 
-        existing_containers:list[Container] = list(system.get_containers())
         existing_container_job_assignment:typing.Dict[Container, list[Job]] = {}
-        existing_container_assigned_time:typing.Dict[Container, int] = {}
-        for container in existing_containers:
-            existing_container_job_assignment[container] = []
-            existing_container_assigned_time[container] = 0
 
         new_container_job_assignment:typing.Dict[int, list[Job]] = {}
-        new_container_assigned_time: typing.Dict[int, int] = {}
-        for container in range(max(self.num_containers - len(existing_containers), 0)):
+        for container in range(max(self.num_containers - len(system.get_containers()), 0)):
             new_container_job_assignment[container] = []
-            new_container_assigned_time[container] = 0
+
+        #Min-heap of the projected time until each new container is done, ties go to the earliest container
+        new_container_heap:list[typing.Tuple[int, int]] = [(0, container) for container in new_container_job_assignment]
 
         for job in sorted_jobs:
-            best_existing_container:Container = Container(-1, -1)
-            best_existing_time:int = -1
-
-            for container in existing_containers:
-                if (best_existing_time == -1 or
-                        container.time_until_done() + existing_container_assigned_time.get(container) < best_existing_time):
-                    best_existing_time = container.time_until_done() + existing_container_assigned_time.get(container)
-                    best_existing_container = container
-
-            best_new_container:int = -1
-            best_new_time:int = -1
-
-            for container in new_container_job_assignment.keys():
-                if best_new_time == -1 or new_container_assigned_time.get(container) < best_new_time:
-                    best_new_time = new_container_assigned_time.get(container)
-                    best_new_container = container
-
-            if ((best_existing_time != -1 and best_existing_time <= best_new_time)
-                    or best_new_time == -1):
-                existing_container_job_assignment.get(best_existing_container).append(job)
-                existing_container_assigned_time[best_existing_container] += job.get_execution_time()
-            else:
+            best_existing:typing.Optional[typing.Tuple[int, int, Container]] = container_done_times.peek()
+            if best_existing is not None and (len(new_container_heap) == 0
+                                              or best_existing[0] <= new_container_heap[0][0]):
+                existing_container_job_assignment.setdefault(best_existing[2], []).append(job)
+                container_done_times.add_work(job.get_execution_time())
+            elif len(new_container_heap) > 0:
+                best_new_time, best_new_container = new_container_heap[0]
                 new_container_job_assignment.get(best_new_container).append(job)
-                new_container_assigned_time[best_new_container] += job.get_execution_time()
+                heapq.heapreplace(new_container_heap, (best_new_time + job.get_execution_time(), best_new_container))
+            else:
+                break
 
-        for container in existing_container_job_assignment.keys():
-            jobs:list[Job] = existing_container_job_assignment.get(container)
-            if len(jobs) >= 1:
-                actions.append(Action(action_type=Action.ADD_JOBS, container=container, jobs=jobs))
+        for container in sorted(existing_container_job_assignment, key=container_done_times.get_order):
+            actions.append(Action(action_type=Action.ADD_JOBS, container=container,
+                                  jobs=existing_container_job_assignment.get(container)))
 
         for container in new_container_job_assignment.keys():
             jobs:list[Job] = new_container_job_assignment.get(container)
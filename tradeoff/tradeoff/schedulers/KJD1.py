@@ -1,6 +1,7 @@
 from tradeoff.system.simulated_system import SimulatedSystem
 from tradeoff.system.job import Job
 from tradeoff.system.action import Action
+from tradeoff.system.action_batch import ActionBatch
 import tradeoff.util.scheduler_util as scheduler_util
 
 """
@@ -27,34 +28,34 @@ class KJD1:
         pending_jobs: a list of pending jobs
         
     Return:
-        A list of actions to be performed on the system
+        A batch of actions to be performed on the system
     """
 
-    def determine_actions(self, system: SimulatedSystem, pending_jobs: list[Job])->list[Action]:
-        actions:list[Action] = []
+    def determine_actions(self, system: SimulatedSystem, pending_jobs: list[Job])->ActionBatch:
+        actions:ActionBatch = ActionBatch()
 
         delta:int = system.get_startup_time()
         e_star:int = int(2 * delta/ self.epsilon)
         time:int = system.get_time()
         short_jobs:list[Job] = []
-        sorted_jobs:list[Job] = sorted(pending_jobs, key=lambda x: x.get_receival_time())
         accumulated_volume:int = 0
 
-        for job in sorted_jobs:
+        #The pending jobs are in order of receival time (see Model.determine_actions)
+        for job in pending_jobs:
             if job.get_execution_time() >= e_star:
-                actions.append(Action(action_type=Action.ACTIVATE_CONTAINER, jobs=[job]))
+                actions.add(action_type=Action.ACTIVATE_CONTAINER, jobs=(job,))
             else:
                 short_jobs.append(job)
                 accumulated_volume += job.get_execution_time()
                 if accumulated_volume >= e_star:
-                    actions.append(Action(action_type=Action.ACTIVATE_CONTAINER, jobs=short_jobs))
+                    actions.add(action_type=Action.ACTIVATE_CONTAINER, jobs=short_jobs)
                     short_jobs = []
                     accumulated_volume = 0
 
         next_deadline: int = -1
 
         if len(short_jobs) >= 1 and time >= short_jobs[0].get_receival_time() + e_star - delta:
-            actions.append(Action(action_type=Action.ACTIVATE_CONTAINER, jobs=short_jobs))
+            actions.add(action_type=Action.ACTIVATE_CONTAINER, jobs=short_jobs)
         elif len(short_jobs) >= 1:
             next_deadline = short_jobs[0].get_receival_time() + e_star - delta
 
@@ -63,6 +64,6 @@ class KJD1:
             time_until_next_action = min(time_until_next_action, next_deadline)
 
         if time_until_next_action != -1:
-            actions.append(Action(action_type=Action.WAIT, time=time+time_until_next_action))
+            actions.add(action_type=Action.WAIT, time=time+time_until_next_action)
 
         return actions
\ No newline at end of file
@@ -1,3 +1,4 @@
+import typing
 from tradeoff.system.simulated_system import SimulatedSystem
 from tradeoff.system.job import Job
 from tradeoff.system.action import Action
@@ -34,8 +35,9 @@ class KJD2:
         delta:int = system.get_startup_time()
         max_delay:int = int(delta*(1+1/self.epsilon))
         time:int = system.get_time()
-        containers:set[Container] = system.get_containers()
-        sorted_jobs:list[Job] = sorted(pending_jobs, key=lambda x: x.get_receival_time())
+        containers:typing.KeysView[Container] = system.get_containers()
+        #The pending jobs are in order of receival time (see Model.determine_actions)
+        sorted_jobs:list[Job] = list(pending_jobs)
         job_ind:int = 0
 
         #Assign jobs to underfull containers
@@ -52,8 +54,10 @@ class KJD2:
                 actions.append(Action(action_type=Action.ADD_JOBS, container=container, jobs=assigned_jobs))
 
         # Assign jobs to new containers
+        #Execution time of the jobs from each index to the end
+        remaining_time:list[int] = scheduler_util.suffix_sums([job.get_execution_time() for job in sorted_jobs])
         while (job_ind < len(sorted_jobs)
-               and time + sum([job.get_execution_time() for job in sorted_jobs[job_ind:]])
+               and time + remaining_time[job_ind]
                >= sorted_jobs[job_ind].get_receival_time() + max_delay - delta):
             curr_job_time:int = 0
             assigned_jobs:list[Job] = []
@@ -1,6 +1,6 @@
 from tradeoff.system.simulated_system import SimulatedSystem
 from tradeoff.system.job import Job
-from tradeoff.system.action import Action
+from tradeoff.system.action_batch import ActionBatch
 from stable_baselines3 import PPO
 from tradeoff.util.env_RL_wrapper import SystemWrapper
 import numpy as np
@@ -19,9 +19,25 @@ class RL:
 
     def __init__(self, params: list):
         model_name = params[0]
+        self.model_name = model_name
         self.max_containers = int(params[1])
         self.model = PPO.load(model_name)
 
+    """
+    Returns the state to pickle, the stable baselines model is loaded again when unpickled
+
+    Return:
+        The state
+    """
+    def __getstate__(self) -> dict:
+        state = dict(self.__dict__)
+        del state["model"]
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self.model = PPO.load(self.model_name)
+
     """
     Wrapper for model output to be used by the simulated system
 
@@ -30,13 +46,15 @@ class RL:
         pending_jobs: a list of pending jobs
 
     Return:
-        A list of actions to be performed on the system
+        A batch of actions to be performed on the system
     """
 
-    def determine_actions(self, system: SimulatedSystem, pending_jobs: list[Job]) -> list[Action]:
-        obs:np.ndarray = SystemWrapper.generate_observation(jobs=pending_jobs, system=system)
+    def determine_actions(self, system: SimulatedSystem, pending_jobs: list[Job]) -> ActionBatch:
+        #The observation and actions index the jobs, the controller passes a view of its queue
+        jobs:list[Job] = list(pending_jobs)
+        obs:np.ndarray = SystemWrapper.generate_observation(jobs=jobs, system=system)
         action, _ = self.model.predict(observation=obs, deterministic=True)
         target_num_containers = SystemWrapper.rescale_action(action, self.max_containers)
-        actions:list[Action] = SystemWrapper.determine_actions(jobs=pending_jobs, system=system,
-                                                               target_num_containers=target_num_containers)
+        actions:ActionBatch = SystemWrapper.determine_actions(jobs=jobs, system=system,
+                                                              target_num_containers=target_num_containers)
         return actions
\ No newline at end of file
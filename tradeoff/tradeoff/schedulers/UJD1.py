@@ -1,5 +1,6 @@
 import typing
 import math
+import heapq
 from tradeoff.system.simulated_system import SimulatedSystem
 from tradeoff.system.job import Job
 from tradeoff.system.action import Action
@@ -8,16 +9,56 @@ import tradeoff.util.scheduler_util as scheduler_util
 
 """
 Unknown job duration algorithm 1
+
+By default UJD1 is called at every job arrival and at its waits, an epoch's assignment cycle only starts at a call that
+falls on it. The wait does not include the next cycle of an epoch whose cycle starts at the call nor the first cycle of
+the containers started for an epoch, so those cycles are skipped unless another call falls on them.
+
+With the timers parameter (off by default) UJD1 makes the same decisions but is not woken by job arrivals, it is only
+woken by named timers (see Model.get_wake_events). A call at an arrival only changes the decisions when it makes a cycle
+or an epoch boundary that the wait does not include reachable, so UJD1 sets a timer for the wait and a timer for each
+such cycle or boundary before the wait that only wakes it if a job arrived since it was last called (see
+Action.TIMER_IF_ARRIVED). The decisions are the same as the default ones for runs that are not quantized (with a time
+quantum the default calls at arrivals are moved to quantum boundaries, see Controller).
 """
 class UJD1:
     """
     Constructor
 
     Args:
-        params a list of parameters (length 1) 1. epsilon
+        params a list of parameters (length 1 or 2) 1. epsilon 2. "timers" to only wake on timers (optional)
     """
     def __init__(self, params: list):
         self.epsilon:float = float(params[0])
+        self.use_timers:bool = len(params) > 1 and params[1] == "timers"
+        #Number of timers set for the cycles and epoch boundaries that are only reached after an arrival
+        self.num_arrival_timers:int = 0
+
+    """
+    Clears the number of timers set with the timers parameter
+    """
+    def reset(self):
+        self.num_arrival_timers = 0
+
+    """
+    Returns a copy of the scheduler whose timers can change without affecting this scheduler
+
+    Return:
+        The copy
+    """
+    def copy(self)->'UJD1':
+        scheduler:UJD1 = UJD1([str(self.epsilon)] + (["timers"] if self.use_timers else []))
+        scheduler.num_arrival_timers = self.num_arrival_timers
+        return scheduler
+
+    """
+    Returns the events that wake the scheduler besides its timers
+
+    Return:
+        No events if the scheduler only wakes on timers, None if it is called at every arrival and wait
+    """
+    def get_wake_events(self)->typing.Optional[set[int]]:
+        return set() if self.use_timers else None
 
     """
     Decides system actions based on the deterministic execution time of tasks
@@ -35,64 +76,69 @@ class UJD1:
         time:int = system.get_time()
         curr_epoch:int = time // E
 
-        epoch_jobs:typing.Dict[int, list[Job]] = {}
-        for epoch in range(curr_epoch + 1):
-            epoch_jobs[epoch] = []
+        #Cycle starts and epoch boundaries the wait does not include, which are only reached after an arrival
+        unreached_times:list[int] = []
 
+        #Only epochs with pending jobs get a bucket, so the cost does not grow with the number of elapsed epochs
+        epoch_jobs:typing.Dict[int, list[Job]] = {}
         for job in pending_jobs:
             job_epoch:int = job.get_receival_time() // E
-            epoch_jobs[job_epoch].append(job)
+            epoch_jobs.setdefault(job_epoch, []).append(job)
 
         #Tracks the time until the next decision needs to be made
         time_until_next_action:int = -1
 
-        #Create mapping of epochs in containers
-        epoch_containers:typing.Dict[int, set[Container]] = {}
-        for container in system.get_containers():
-            container_epoch:int = int(container.get_other_information(Container.JOB_EPOCH))
-            if container_epoch not in epoch_containers.keys():
-                epoch_containers[container_epoch] = set()
-            epoch_containers.get(container_epoch).add(container)
+        #Mapping of epochs to their containers
+        epoch_containers:typing.Dict[int, typing.KeysView[Container]] = system.get_containers_by_epoch()
 
         #Assign jobs to containers
         for epoch in epoch_containers.keys():
             offset:int = epoch*E
             cycle_offset:int = (time-offset)%(E + delta)
             if cycle_offset == 0:
-                #Tracks job assignment for new containers
+                existing_containers:list[Container] = list(epoch_containers.get(epoch))
+
+                #Tracks job assignment for new containers, the heap holds the assigned time of each new container
                 new_container_job_assignment: typing.Dict[int, list[Job]] = {}
-                new_container_assigned_time: typing.Dict[int, int] = {}
-                for container in range(len(epoch_containers.get(epoch))):
+                for container in range(len(existing_containers)):
                     new_container_job_assignment[container] = []
-                    new_container_assigned_time[container] = 0
+                new_container_heap:list[typing.Tuple[int, int]] = [(0, container)
+                                                                   for container in new_container_job_assignment]
 
-                #Tracks job assignment for existing containers
+                #Tracks job assignment for existing containers, the tree holds the time until each container is done
+                #with its assigned jobs
                 existing_container_job_assignment: typing.Dict[Container, list[Job]] = {}
-                existing_container_assigned_time: typing.Dict[Container, int] = {}
-                for container in epoch_containers.get(epoch):
+                for container in existing_containers:
                     existing_container_job_assignment[container] = []
-                    existing_container_assigned_time[container] = 0
+                existing_container_time_until_done:list[int] = [container.time_until_done()
+                                                                for container in existing_containers]
+                existing_container_loads:scheduler_util.LoadTree = scheduler_util.LoadTree(
+                    list(existing_container_time_until_done))
 
                 #Find the best container for each job
-                for job in epoch_jobs.get(epoch):
+                for job in epoch_jobs.get(epoch, []):
                     best_new_container = -1
-                    best_existing_container = None
+                    best_existing_container = -1
                     best_time = delta + E + 1
-                    for container in new_container_job_assignment.keys():
-                        if new_container_assigned_time.get(container) < best_time:
-                            best_time = new_container_assigned_time.get(container)
-                            best_new_container = container
-                    for container in epoch_containers.get(epoch):
-                        if container.time_until_done() + existing_container_assigned_time.get(container) < best_time:
-                            best_time = container.time_until_done()
-                            best_existing_container = container
-                            best_new_container = -1
+                    if len(new_container_heap) > 0 and new_container_heap[0][0] < best_time:
+                        best_time, best_new_container = new_container_heap[0]
+                    #Existing containers are considered in order, a container is better if its load is less than the
+                    #time until the previous best container is done
+                    container_num:int = existing_container_loads.first_below(0, best_time)
+                    while container_num != -1:
+                        best_time = existing_container_time_until_done[container_num]
+                        best_existing_container = container_num
+                        best_new_container = -1
+                        container_num = existing_container_loads.first_below(container_num + 1, best_time)
                     if best_new_container != -1:
                         new_container_job_assignment.get(best_new_container).append(job)
-                        new_container_assigned_time[best_new_container] += job.get_execution_time()
-                    elif best_existing_container is not None:
-                        existing_container_job_assignment.get(best_existing_container).append(job)
-                        existing_container_assigned_time[best_existing_container] += job.get_execution_time()
+                        heapq.heapreplace(new_container_heap, (new_container_heap[0][0] + job.get_execution_time(),
+                                                               best_new_container))
+                    elif best_existing_container != -1:
+                        existing_container_job_assignment.get(existing_containers[best_existing_container]).append(job)
+                        existing_container_loads.update(best_existing_container,
+                                                        existing_container_loads.get(best_existing_container)
+                                                        + job.get_execution_time())
                     else:
                         break
 
@@ -107,6 +153,7 @@ class UJD1:
                     actions.append(Action(action_type=Action.ACTIVATE_CONTAINER,
                                           jobs=new_container_job_assignment.get(container),
                                           other_information={Container.JOB_EPOCH:str(epoch)}))
+                unreached_times.append(time + E + delta)
             else:
                 if time_until_next_action != -1:
                     time_until_next_action = min([time_until_next_action, E + delta - cycle_offset])
@@ -120,44 +167,60 @@ class UJD1:
                 time_until_next_action = min([time_until_next_action, E - time % E])
             else:
                 time_until_next_action = E - time % E
-        elif curr_epoch >= 1:
-            sorted_epoch_jobs: list[Job] = sorted(epoch_jobs.get(curr_epoch - 1),
-                                                  key=lambda x: x.get_receival_time())
-            nk:int = len(sorted_epoch_jobs)
-            e_minus:int = 0
-            for job in sorted_epoch_jobs:
-                e_minus += int(job.get_other_info(Job.EXECUTION_TIME_LOWER_BOUND))
-            mk:int = math.ceil(nk * e_minus / E)
-
-            # Determine job assignment for new containers (based on what would occur in real system), can be made more
-            # efficient using a priority queue to determine assigned container
-            container_job_assignment: typing.Dict[int, list[Job]] = {}
-            container_assigned_time: typing.Dict[int, int] = {}
-            for container in range(mk):
-                container_job_assignment[container] = []
-                container_assigned_time[container] = 0
-
-            for job in sorted_epoch_jobs:
-                best_container:int = -1
-                best_time:int = delta + E + 1
-                for container in range(mk):
-                    if container_assigned_time.get(container) < best_time:
-                        best_time = container_assigned_time.get(container)
-                        best_container = container
-                if best_time <= delta + E:
+        else:
+            #The jobs of the epoch that just completed are assigned to new containers, as are the jobs of earlier epochs
+            #without containers, which are only left when jobs are released after their epoch completed (such as in a
+            #quantized run, see Controller)
+            for epoch in sorted(epoch_jobs.keys()):
+                if epoch >= curr_epoch or (epoch != curr_epoch - 1 and epoch in epoch_containers):
+                    continue
+                #The pending jobs are in order of receival time (see Model.determine_actions)
+                sorted_epoch_jobs: list[Job] = epoch_jobs.get(epoch)
+                nk:int = len(sorted_epoch_jobs)
+                e_minus:int = 0
+                for job in sorted_epoch_jobs:
+                    e_minus += job.get_execution_time_lower_bound()
+                mk:int = math.ceil(nk * e_minus / E)
+
+                # Determine job assignment for new containers (based on what would occur in real system), the heap
+                # holds the assigned time of each new container so the least loaded one is found in O(log mk).
+                # Containers are used in order, so no more containers than jobs can be assigned to
+                container_job_assignment: typing.Dict[int, list[Job]] = {}
+                for container in range(min(mk, nk)):
+                    container_job_assignment[container] = []
+                container_heap:list[typing.Tuple[int, int]] = [(0, container)
+                                                               for container in container_job_assignment]
+
+                for job in sorted_epoch_jobs:
+                    if len(container_heap) == 0 or container_heap[0][0] > delta + E:
+                        break
+                    best_time, best_container = container_heap[0]
                     container_job_assignment.get(best_container).append(job)
-                    container_assigned_time[best_container] += job.get_execution_time()
-                else:
-                    break
-
-            # Create new containers
-            for new_container in range(mk):
-                if len(container_job_assignment.get(new_container)) >= 1:
-                    actions.append(Action(action_type=Action.ACTIVATE_CONTAINER,
-                                        jobs=container_job_assignment.get(new_container),
-                                        other_information={Container.JOB_EPOCH:str(curr_epoch-1)}))
+                    heapq.heapreplace(container_heap, (best_time + job.get_execution_time(), best_container))
+
+                # Create new containers
+                for new_container in container_job_assignment.keys():
+                    if len(container_job_assignment.get(new_container)) >= 1:
+                        actions.append(Action(action_type=Action.ACTIVATE_CONTAINER,
+                                            jobs=container_job_assignment.get(new_container),
+                                            other_information={Container.JOB_EPOCH:str(epoch)}))
+
+                #The containers of the epoch start their assignment cycles
+                if len(container_job_assignment) > 0 and len(container_job_assignment.get(0)) >= 1:
+                    cycle_offset:int = (time - epoch*E)%(E + delta)
+                    unreached_times.append(time + E + delta - cycle_offset)
+
+        #Jobs received at the start of an epoch are assigned at its end, which is not included above at the start
+        if time % E == 0 and curr_epoch in epoch_jobs:
+            if time_until_next_action != -1:
+                time_until_next_action = min([time_until_next_action, E])
+            else:
+                time_until_next_action = E
+        elif time % E == 0:
+            unreached_times.append(time + E)
 
         time_until_next_terminate:int = scheduler_util.terminate_stale_containers(system=system, actions=actions)
+
         if time_until_next_action == -1:
             time_until_next_action = time_until_next_terminate
         elif time_until_next_terminate != -1:
@@ -166,4 +229,21 @@ class UJD1:
         if time_until_next_action != -1:
             actions.append(Action(action_type=Action.WAIT, time=time+time_until_next_action))
 
+        if self.use_timers:
+            #Without a wait the next call is at the next arrival, which the controller wakes the scheduler at when it
+            #has no timers
+            if time_until_next_action == -1:
+                actions.append(Action(action_type=Action.SET_TIMER, time=-1,
+                                      other_information={Action.TIMER_NAME: "wait"}))
+                unreached_times = []
+            else:
+                unreached_times = sorted(set([unreached_time for unreached_time in unreached_times
+                                              if unreached_time < time + time_until_next_action]))
+            for timer_num in range(max(len(unreached_times), self.num_arrival_timers)):
+                actions.append(Action(action_type=Action.SET_TIMER,
+                                      time=unreached_times[timer_num] if timer_num < len(unreached_times) else -1,
+                                      other_information={Action.TIMER_NAME: "arrival " + str(timer_num),
+                                                         Action.TIMER_IF_ARRIVED: "1"}))
+            self.num_arrival_timers = len(unreached_times)
+
         return actions
\ No newline at end of file
@@ -1,3 +1,4 @@
+import typing
 from tradeoff.system.simulated_system import SimulatedSystem
 from tradeoff.system.job import Job
 from tradeoff.system.action import Action
@@ -35,8 +36,9 @@ class UJD2:
         delta: int = system.get_startup_time()
         max_delay: int = int(delta * (1 + 1 / self.epsilon))
         time: int = system.get_time()
-        containers: set[Container] = system.get_containers()
-        sorted_jobs: list[Job] = sorted(pending_jobs, key=lambda x: x.get_receival_time())
+        containers: typing.KeysView[Container] = system.get_containers()
+        #The pending jobs are in order of receival time (see Model.determine_actions)
+        sorted_jobs: list[Job] = list(pending_jobs)
         job_ind: int = 0
 
         # Assign jobs to underfull containers
@@ -45,7 +47,7 @@ class UJD2:
             curr_container_time: int = container.time_until_done_other(Job.EXECUTION_TIME_UPPER_BOUND)
             while (job_ind < len(sorted_jobs)
                    and curr_container_time + time - sorted_jobs[job_ind].get_receival_time() <= max_delay):
-                curr_container_time += int(sorted_jobs[job_ind].get_other_info(Job.EXECUTION_TIME_UPPER_BOUND))
+                curr_container_time += sorted_jobs[job_ind].get_execution_time_upper_bound()
                 assigned_jobs.append(sorted_jobs[job_ind])
                 job_ind += 1
 
@@ -53,14 +55,16 @@ class UJD2:
                 actions.append(Action(action_type=Action.ADD_JOBS, container=container, jobs=assigned_jobs))
 
         # Assign Jobs to new containers
+        # Execution time upper bound of the jobs from each index to the end
+        remaining_time: list[int] = scheduler_util.suffix_sums([job.get_execution_time_upper_bound() for job in sorted_jobs])
         while (job_ind < len(sorted_jobs)
-               and time + delta + sum([int(job.get_other_info(Job.EXECUTION_TIME_UPPER_BOUND)) for job in sorted_jobs[job_ind:]])
+               and time + delta + remaining_time[job_ind]
                >= sorted_jobs[job_ind].get_receival_time() + max_delay):
             curr_job_time = 0
             assigned_jobs = []
             while job_ind < len(sorted_jobs) and delta + curr_job_time <= max_delay:
                 assigned_jobs.append(sorted_jobs[job_ind])
-                curr_job_time += int(sorted_jobs[job_ind].get_other_info(Job.EXECUTION_TIME_UPPER_BOUND))
+                curr_job_time += sorted_jobs[job_ind].get_execution_time_upper_bound()
                 job_ind += 1
             if len(assigned_jobs) > 0:
                 actions.append(Action(action_type=Action.ACTIVATE_CONTAINER, jobs=assigned_jobs))
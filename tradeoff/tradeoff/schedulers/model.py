@@ -1,7 +1,9 @@
 import importlib
 from tradeoff.system.simulated_system import SimulatedSystem
 from tradeoff.system.job import Job
+from tradeoff.system.container import Container
 from tradeoff.system.action import Action
+from tradeoff.system.action_batch import ActionBatch
 import typing
 import types
 
@@ -10,7 +12,19 @@ Wrapper for the models
 
 Model methods
     __init__(self, params)
-    determine_actions(system:SimulatedSystem, unassigned_jobs:list[Job])->list[Action]
+    determine_actions(system:SimulatedSystem, unassigned_jobs:list[Job])->list[Action] or ActionBatch
+
+Wake event declaration (optional, see get_wake_events)
+    get_wake_events()->set[int]
+
+Incremental model methods (optional, a model is incremental if is_incremental returns True)
+    is_incremental()->bool
+    update(system:SimulatedSystem, arrived_jobs:list[Job], completed_jobs:list[Job], idle_containers:list[Container])
+        ->list[Action] or ActionBatch
+
+Methods of models that keep state between calls (optional)
+    reset()
+    copy()->model
 """
 class Model:
     """
@@ -29,15 +43,75 @@ class Model:
         model_class:typing.Any = getattr(model_module, class_name)
         self.model = model_class(params)
 
+    """
+    Checks if the model is incremental, an incremental model is only told what changed since it was last called and
+    keeps track of the unassigned jobs itself
+
+    Returns:
+        True if the model is incremental, False otherwise
+    """
+    def is_incremental(self)->bool:
+        return hasattr(self.model, "is_incremental") and self.model.is_incremental()
+
+    """
+    Returns the events that wake the model, a model that declares its wake events is only called when one of them
+    happens or one of the timers it sets fires (see Action.SET_TIMER), instead of at every job arrival and wait
+
+    Returns:
+        The wake events (Action.WAKE_ON_*), or None if the model does not declare them
+    """
+    def get_wake_events(self)->typing.Optional[set[int]]:
+        if not hasattr(self.model, "get_wake_events"):
+            return None
+        return self.model.get_wake_events()
+
+    """
+    Given the changes since the model was last called, returns the actions to perform, the model must be incremental
+
+    Args:
+        system: the system
+        arrived_jobs: the jobs that arrived, in order of arrival
+        completed_jobs: the jobs that completed, in order of completion
+        idle_containers: the containers that went idle and still are
+
+    Return
+        The actions to be performed, as action objects or a batch
+    """
+    def update(self, system:SimulatedSystem, arrived_jobs:list[Job], completed_jobs:list[Job],
+               idle_containers:list[Container])->typing.Union[list[Action], ActionBatch]:
+        return self.model.update(system, arrived_jobs, completed_jobs, idle_containers)
+
+    """
+    Clears the state the model keeps between calls
+    """
+    def reset(self):
+        if hasattr(self.model, "reset"):
+            self.model.reset()
+
+    """
+    Returns a copy of the model whose state can change without affecting this model, models that keep no state
+    between calls are shared
+
+    Returns:
+        The copy
+    """
+    def copy(self)->'Model':
+        model:Model = Model.__new__(Model)
+        model.model = self.model.copy() if hasattr(self.model, "copy") else self.model
+        return model
+
     """
     Given a system and jobs, returns the actions to perform
 
     Args:
         system: the system
-        unassigned_jobs: the jobs that have not been assigned to a container
+        unassigned_jobs: the jobs that have not been assigned to a container, in release order (a read-only view of
+            the controller's queue), which is the order of receival time as jobs are released at their receival times
+            (a job added after its receival time is released after the jobs already queued), so models do not sort
+            them again
 
     Return
-        The list of actions to be performed
+        The actions to be performed, as action objects or a batch
     """
-    def determine_actions(self, system:SimulatedSystem, unassigned_jobs:list[Job])->list[Action]:
+    def determine_actions(self, system:SimulatedSystem, unassigned_jobs:list[Job])->typing.Union[list[Action], ActionBatch]:
         return self.model.determine_actions(system, unassigned_jobs)
\ No newline at end of file
@@ -13,14 +13,35 @@ add_jobs - container, jobs - adds jobs to the provided container
 remove_jobs - container, jobs - removes the provided jobs from the provided container
 reorder_jobs - container, jobs - changes the order of jobs in the provided container
 wait - time - scheduler requests to reevaluate after time
+set_timer - time, timer name (other information TIMER_NAME) - sets a named timer to wake the scheduler at time, replacing
+    the timer's previous time, a time of -1 cancels the timer (only used by schedulers that declare their wake events,
+    see Model.get_wake_events), a timer with other information TIMER_IF_ARRIVED only wakes the scheduler if a job was
+    released since the scheduler was last called and is dropped otherwise
+
+Wake events - events that wake a scheduler that declares its wake events, besides its timers
+arrival - a job is released
+completion - a job completes
+idle - a container goes idle
 """
 class Action:
+    __slots__ = ("action_type", "container", "time", "jobs", "other_information")
+
     ACTIVATE_CONTAINER = 1
     TERMINATE_CONTAINER = 2
     ADD_JOBS = 3
     REMOVE_JOBS = 4
     REORDER_JOBS = 5
     WAIT = 20
+    SET_TIMER = 21
+
+    #Other information keys
+    TIMER_NAME = 1
+    TIMER_IF_ARRIVED = 2
+
+    #Wake events
+    WAKE_ON_ARRIVAL = 1
+    WAKE_ON_COMPLETION = 2
+    WAKE_ON_IDLE = 3
 
     """
     Action constructor
@@ -0,0 +1,214 @@
+import array
+import itertools
+import typing
+
+from tradeoff.system.job import Job
+from tradeoff.system.container import Container
+from tradeoff.system.action import Action
+
+"""
+Batch of actions stored as columns, an alternative to a list of Action objects for schedulers that emit many actions
+
+Each action is a row with a type, a container, a time and a range of jobs in one shared job list. Other information is
+only stored for the actions that have it. Action types and parameters are the same as for Action.
+
+Columns:
+    action_types - type of each action
+    containers - container acted upon (None if the action has no container)
+    times - time of each action
+    job_offsets - the jobs of action i are jobs[job_offsets[i]:job_offsets[i+1]]
+    jobs - the jobs of all actions in order
+"""
+class ActionBatch:
+    """
+    Constructor, creates an empty batch
+    """
+    def __init__(self):
+        self.action_types:array.array = array.array("b")
+        self.containers:list[typing.Optional[Container]] = []
+        self.times:array.array = array.array("q")
+        self.job_offsets:array.array = array.array("q", [0])
+        self.jobs:list[Job] = []
+        self.other_information:typing.Dict[int, typing.Dict[int, str]] = {}
+
+    """
+    Creates a batch from action objects
+
+    Args:
+        actions: the actions
+
+    Returns:
+        The batch with the actions in the same order
+    """
+    @staticmethod
+    def from_actions(actions:list[Action])->'ActionBatch':
+        batch:ActionBatch = ActionBatch()
+        for action in actions:
+            batch.append(action)
+        return batch
+
+    """
+    Adds an action
+
+    Args:
+        action_type: type of action
+        container: container being acted upon
+        jobs: jobs being acted upon
+        time: time associated with the action
+        other_information: additional information of the action
+    """
+    def add(self, action_type:int, container:Container=None, jobs:typing.Iterable[Job]=(), time:int=0,
+            other_information:typing.Dict[int, str]=None):
+        if other_information:
+            self.other_information[len(self.action_types)] = other_information
+        self.action_types.append(action_type)
+        self.containers.append(container)
+        self.times.append(time)
+        self.jobs.extend(jobs)
+        self.job_offsets.append(len(self.jobs))
+
+    """
+    Adds an action object
+
+    Args:
+        action: the action
+    """
+    def append(self, action:Action):
+        self.add(action_type=action.get_action_type(), container=action.get_container(), jobs=action.get_jobs(),
+                 time=action.get_time(), other_information=action.get_all_other_information())
+
+    """
+    Adds container activations with no jobs
+
+    Args:
+        num_containers: the number of containers activated
+    """
+    def add_activations(self, num_containers:int):
+        self.action_types.extend(itertools.repeat(Action.ACTIVATE_CONTAINER, num_containers))
+        self.containers.extend(itertools.repeat(None, num_containers))
+        self.times.extend(itertools.repeat(0, num_containers))
+        self.job_offsets.extend(itertools.repeat(len(self.jobs), num_containers))
+
+    """
+    Adds container terminations
+
+    Args:
+        containers: the containers terminated
+    """
+    def add_terminations(self, containers:typing.Sequence[Container]):
+        self.action_types.extend(itertools.repeat(Action.TERMINATE_CONTAINER, len(containers)))
+        self.containers.extend(containers)
+        self.times.extend(itertools.repeat(0, len(containers)))
+        self.job_offsets.extend(itertools.repeat(len(self.jobs), len(containers)))
+
+    """
+    Returns the type of an action
+
+    Args:
+        action_num: the index of the action
+
+    Returns:
+        The action type
+    """
+    def get_action_type(self, action_num:int)->int:
+        return self.action_types[action_num]
+
+    """
+    Returns the container of an action
+
+    Args:
+        action_num: the index of the action
+
+    Returns:
+        The container
+    """
+    def get_container(self, action_num:int)->Container:
+        return self.containers[action_num]
+
+    """
+    Returns the jobs of an action
+
+    Args:
+        action_num: the index of the action
+
+    Returns:
+        The list of jobs
+    """
+    def get_jobs(self, action_num:int)->list[Job]:
+        return self.jobs[self.job_offsets[action_num]:self.job_offsets[action_num + 1]]
+
+    """
+    Returns the total execution time of the jobs of an action
+
+    Args:
+        action_num: the index of the action
+
+    Returns:
+        The total execution time
+    """
+    def get_execution_time(self, action_num:int)->int:
+        return sum([self.jobs[job_num].get_execution_time()
+                    for job_num in range(self.job_offsets[action_num], self.job_offsets[action_num + 1])])
+
+    """
+    Returns the time of an action
+
+    Args:
+        action_num: the index of the action
+
+    Returns:
+        The time
+    """
+    def get_time(self, action_num:int)->int:
+        return self.times[action_num]
+
+    """
+    Returns all other information of an action
+
+    Args:
+        action_num: the index of the action
+
+    Returns:
+        The other information table
+    """
+    def get_all_other_information(self, action_num:int)->typing.Dict[int, str]:
+        return self.other_information.get(action_num, {})
+
+    """
+    Returns the time of the last wait action
+
+    Returns:
+        The wait time, or -1 if there is no wait action
+    """
+    def get_wait_time(self)->int:
+        for action_num in range(len(self.action_types) - 1, -1, -1):
+            if self.action_types[action_num] == Action.WAIT:
+                return self.times[action_num]
+        return -1
+
+    """
+    Returns the jobs that are assigned to containers by the batch
+
+    Returns:
+        The jobs of the activate container and add jobs actions
+    """
+    def get_assigned_jobs(self)->typing.Iterator[Job]:
+        for action_num in range(len(self.action_types)):
+            if (self.action_types[action_num] == Action.ACTIVATE_CONTAINER
+                    or self.action_types[action_num] == Action.ADD_JOBS):
+                yield from self.get_jobs(action_num)
+
+    """
+    Returns the actions as action objects
+
+    Returns:
+        The list of actions
+    """
+    def to_actions(self)->list[Action]:
+        return [Action(action_type=self.action_types[action_num], container=self.containers[action_num],
+                       jobs=self.get_jobs(action_num), time=self.times[action_num],
+                       other_information=dict(self.get_all_other_information(action_num)))
+                for action_num in range(len(self.action_types))]
+
+    def __len__(self)->int:
+        return len(self.action_types)
\ No newline at end of file
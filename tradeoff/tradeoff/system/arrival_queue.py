@@ -0,0 +1,181 @@
+import heapq
+import itertools
+import typing
+
+from tradeoff.system.job import Job
+from tradeoff.system.job_table import JobTable
+
+"""
+Queue of jobs that have not been released yet, jobs are released in order of receival time and jobs with the same
+receival time are released in the order they were added
+
+Jobs are added either as batches (job tables or lists of jobs), one at a time or as a stream. A heap holds the next
+unreleased row of every batch and every job added on its own, so a batch only takes one heap entry and jobs are merged
+lazily as they are released. Batches are dropped once all of their rows are released, so the queue only holds jobs that
+are still to come. Jobs of a job table are created as they are released, jobs added as objects are released as the same
+objects.
+
+A stream is an iterator of jobs or job tables in order of receival time, only one item of a stream is held at a time
+and the next item is read once it is released, so a stream can be longer than fits in memory.
+
+Operation costs (k batches, streams and single jobs in the queue):
+    add a batch - O(log k), plus O(n log n) to sort a batch of n jobs that is not sorted by receival time
+    add a single job - O(log k)
+    release a job - O(log k)
+"""
+class ArrivalQueue:
+    """
+    Constructor
+    """
+    def __init__(self):
+        #Entries are (receival time, insertion order, row, batch or job, stream the batch or job was read from)
+        self.heap:list[typing.Tuple[int, int, int, typing.Union[JobTable, list[Job], Job],
+                                    typing.Optional[typing.Iterator[typing.Union[Job, JobTable]]]]] = []
+        self.insertion_count:int = 0
+
+    """
+    Returns a copy of the queue, batches are shared as they are not changed by the queue and streams are split so both
+    queues read every remaining item
+
+    Returns:
+        The copy
+    """
+    def copy(self)->'ArrivalQueue':
+        queue:ArrivalQueue = ArrivalQueue()
+        for entry_num, entry in enumerate(self.heap):
+            receival_time, insertion_num, row, source, stream = entry
+            if stream is not None:
+                stream, copied_stream = itertools.tee(stream)
+                self.heap[entry_num] = (receival_time, insertion_num, row, source, stream)
+                entry = (receival_time, insertion_num, row, source, copied_stream)
+            queue.heap.append(entry)
+        queue.insertion_count = self.insertion_count
+        return queue
+
+    """
+    Adds a batch of jobs
+
+    Args:
+        table: the jobs, sorted by receival time before they are added if they are not already
+    """
+    def add_table(self, table:JobTable):
+        if len(table) == 0:
+            return
+        self.push(table, self.insertion_count, None)
+        self.insertion_count += 1
+
+    """
+    Adds a batch of job objects, the jobs are released as the same objects
+
+    Args:
+        jobs: the jobs, sorted by receival time before they are added if they are not already
+    """
+    def add_jobs(self, jobs:list[Job]):
+        if len(jobs) == 0:
+            return
+        self.push(list(jobs), self.insertion_count, None)
+        self.insertion_count += 1
+
+    """
+    Adds a single job
+
+    Args:
+        job: the job
+    """
+    def add_job(self, job:Job):
+        self.push(job, self.insertion_count, None)
+        self.insertion_count += 1
+
+    """
+    Adds a stream of jobs, the first item is read straight away and the rest are read as jobs are released
+
+    Args:
+        stream: jobs or job tables in order of receival time
+    """
+    def add_stream(self, stream:typing.Iterable[typing.Union[Job, JobTable]]):
+        self.push_next(iter(stream), self.insertion_count)
+        self.insertion_count += 1
+
+    """
+    Adds a batch or job to the heap
+
+    Args:
+        source: the batch or job
+        insertion_num: the insertion order of the batch, job or stream
+        stream: the stream the batch or job was read from, None if it was added directly
+    """
+    def push(self, source:typing.Union[JobTable, list[Job], Job], insertion_num:int,
+             stream:typing.Optional[typing.Iterator[typing.Union[Job, JobTable]]]):
+        if isinstance(source, Job):
+            heapq.heappush(self.heap, (source.get_receival_time(), insertion_num, 0, source, stream))
+            return
+        if isinstance(source, list):
+            source.sort(key=lambda job: job.get_receival_time())
+            heapq.heappush(self.heap, (source[0].get_receival_time(), insertion_num, 0, source, stream))
+            return
+        source = source.sorted_by_receival_time()
+        heapq.heappush(self.heap, (source.get_receival_time(0), insertion_num, 0, source, stream))
+
+    """
+    Reads the next non empty item of a stream into the heap, the stream is dropped once it is exhausted
+
+    Args:
+        stream: the stream
+        insertion_num: the insertion order of the stream
+    """
+    def push_next(self, stream:typing.Iterator[typing.Union[Job, JobTable]], insertion_num:int):
+        for source in stream:
+            if isinstance(source, Job) or len(source) > 0:
+                self.push(source, insertion_num, stream)
+                return
+
+    """
+    Returns the receival time of the next job
+
+    Returns:
+        The receival time of the next job to be released, or -1 if there are no jobs
+    """
+    def get_next_receival_time(self)->int:
+        if len(self.heap) == 0:
+            return -1
+        return self.heap[0][0]
+
+    """
+    Releases the jobs received at or before a time
+
+    Args:
+        time: the time
+
+    Returns:
+        The released jobs, in release order
+    """
+    def release(self, time:int)->list[Job]:
+        released_jobs:list[Job] = []
+        while len(self.heap) > 0 and self.heap[0][0] <= time:
+            receival_time, insertion_num, row, source, stream = self.heap[0]
+            if isinstance(source, Job):
+                released_jobs.append(source)
+                heapq.heappop(self.heap)
+            else:
+                if isinstance(source, list):
+                    released_jobs.append(source[row])
+                else:
+                    released_jobs.append(source.job(row))
+                if row + 1 < len(source):
+                    next_receival_time:int = (source[row + 1].get_receival_time() if isinstance(source, list)
+                                              else source.get_receival_time(row + 1))
+                    heapq.heapreplace(self.heap, (next_receival_time, insertion_num, row + 1, source, stream))
+                    continue
+                heapq.heappop(self.heap)
+            if stream is not None:
+                self.push_next(stream, insertion_num)
+        return released_jobs
+
+    """
+    Checks if every job has been released
+
+    Returns:
+        True if there are no jobs left to release, False otherwise
+    """
+    def is_empty(self)->bool:
+        return len(self.heap) == 0
\ No newline at end of file
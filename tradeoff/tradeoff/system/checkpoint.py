@@ -0,0 +1,134 @@
+import os
+import pickle
+import random
+import typing
+import numpy as np
+
+from tradeoff.jobs import job_manager
+from tradeoff.system.job_table import JobTable
+
+if typing.TYPE_CHECKING:
+    from tradeoff.system.controller import Controller
+
+"""
+Checkpoints of a controller, so a long control loop can be resumed after it is stopped
+
+A checkpoint holds the controller, the system and its containers, the unreleased jobs, the scheduler and the random
+number generator states, pickled in binary. Neither the job set the controller was loaded with nor the results of the
+completed jobs are stored in it:
+    - only a reference to the job set is stored, the jobs file is loaded again when the checkpoint is loaded, the
+      completion times of the job set are not restored (jobs that were released keep their own completion times)
+    - the results of the completed jobs are appended to a results file next to the checkpoint (see
+      ResultStore.spill), the checkpoint only holds the size of the file and the number of results in it
+So the size of a checkpoint does not grow with the number of completed jobs, and saving one only writes the results
+completed since the last checkpoint.
+
+Files:
+    <checkpoint file>: <header (pickled dictionary)><controller (pickled, the job set is referenced as a persistent id)>
+    <checkpoint file>.results: the results of the completed jobs (see ResultStore)
+"""
+
+#Version of the checkpoint format
+CHECKPOINT_VERSION = 2
+
+#Extension of the results file of a checkpoint
+RESULTS_EXTENSION = ".results"
+
+#Persistent id of the job set of the controller
+JOB_SET_ID = "jobs"
+
+"""
+Pickler that references the job set of a controller instead of storing it
+"""
+class CheckpointPickler(pickle.Pickler):
+    """
+    Constructor
+
+    Args:
+        file: the file the checkpoint is written to
+        jobs: the job set that is referenced, None to store every table
+    """
+    def __init__(self, file:typing.BinaryIO, jobs:typing.Optional[JobTable]):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.jobs:typing.Optional[JobTable] = jobs
+
+    def persistent_id(self, obj:typing.Any)->typing.Optional[str]:
+        if self.jobs is not None and obj is self.jobs:
+            return JOB_SET_ID
+        return None
+
+"""
+Unpickler that restores the job set referenced by a CheckpointPickler
+"""
+class CheckpointUnpickler(pickle.Unpickler):
+    """
+    Constructor
+
+    Args:
+        file: the file the checkpoint is read from
+        jobs: the job set that is referenced
+    """
+    def __init__(self, file:typing.BinaryIO, jobs:typing.Optional[JobTable]):
+        super().__init__(file)
+        self.jobs:typing.Optional[JobTable] = jobs
+
+    def persistent_load(self, pid:typing.Any)->JobTable:
+        if pid != JOB_SET_ID or self.jobs is None:
+            raise pickle.UnpicklingError("Unknown persistent id: " + str(pid))
+        return self.jobs
+
+"""
+Saves a checkpoint of a controller, the file is replaced at once so an interrupted save keeps the previous checkpoint
+
+The results of the completed jobs are moved out of memory into the results file of the checkpoint, results written to
+the file after the size recorded in the previous checkpoint are overwritten
+
+Args:
+    controller: the controller
+    file_name: the name of the checkpoint file
+"""
+def save_checkpoint(controller:'Controller', file_name:str):
+    jobs:typing.Optional[JobTable] = controller.jobs if controller.jobs_file != "" else None
+    header:typing.Dict[str, typing.Any] = {
+        "version": CHECKPOINT_VERSION,
+        "jobs_file": controller.jobs_file,
+        "start_time": controller.start_time,
+        "end_time": controller.end_time,
+        "random_state": random.getstate(),
+        "numpy_random_state": np.random.get_state(),
+    }
+    controller.system.get_results().spill(file_name + RESULTS_EXTENSION)
+    temp_file_name:str = file_name + ".tmp"
+    with open(temp_file_name, "wb") as file:
+        pickle.dump(header, file, protocol=pickle.HIGHEST_PROTOCOL)
+        CheckpointPickler(file, jobs).dump(controller)
+    os.replace(temp_file_name, file_name)
+
+"""
+Loads a checkpoint of a controller, the random number generator states are restored as well, the results file of the
+checkpoint must not be moved
+
+Args:
+    file_name: the name of the checkpoint file
+
+Returns:
+    The controller, in the state it was saved in
+"""
+def load_checkpoint(file_name:str)->'Controller':
+    with open(file_name, "rb") as file:
+        header:typing.Dict[str, typing.Any] = pickle.load(file)
+        if header["version"] != CHECKPOINT_VERSION:
+            raise ValueError("Unsupported checkpoint version: " + str(header["version"]))
+        jobs:typing.Optional[JobTable] = None
+        if header["jobs_file"] != "":
+            if header["start_time"] != 0 or header["end_time"] != -1:
+                jobs = job_manager.job_table_from_file_window(file_name=header["jobs_file"],
+                                                              start_time=header["start_time"],
+                                                              end_time=header["end_time"])
+            else:
+                jobs = job_manager.job_table_from_file(file_name=header["jobs_file"])
+            jobs = jobs.sorted_by_receival_time()
+        controller:'Controller' = CheckpointUnpickler(file, jobs).load()
+    random.setstate(header["random_state"])
+    np.random.set_state(header["numpy_random_state"])
+    return controller
\ No newline at end of file
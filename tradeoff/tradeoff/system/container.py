@@ -1,12 +1,31 @@
 from tradeoff.system.job import Job
+from tradeoff.system.job_queue import JobQueue
 import typing
 
 """
 Container class, that models a machine/container in the system, that can run jobs sequentially
+
+The job queue is a JobQueue, which removes completed jobs from the head in constant time and indexes the work queued
+ahead of each job
+
+A forked container shares its job queue with the container it was forked from, whichever changes the queue first while
+it is shared copies it (copy on write). A container that is dropped, such as the container of a discarded fork, no
+longer shares the queue, so the other container keeps the queue without copying it.
 """
 class Container:
+    __slots__ = ("jobs", "curr_time", "start_time", "job_progress", "other_information", "clock",
+                 "total_execution_time", "metric_totals", "on_complete", "__weakref__")
+
     JOB_EPOCH = 1
 
+    #Container states
+    STARTING = 1
+    BUSY = 2
+    IDLE = 3
+
+    #Other job information metrics with running totals kept over the job queue
+    TRACKED_METRICS = (Job.EXECUTION_TIME_LOWER_BOUND, Job.EXECUTION_TIME_UPPER_BOUND)
+
     """
     Instantiate a container
 
@@ -14,12 +33,12 @@ class Container:
         curr_time: the time at the creation of the container
         startup_time: time required for the container to startup
         other_information: additional information that might be needed
+        clock: returns the current time of the owning system, the container catches up to it lazily when accessed
+        on_complete: called with each completed job and its completion time, jobs are marked complete if not provided
     """
-    def __init__(self, curr_time:int, startup_time:int, initial_jobs:list[Job] = None, other_information:typing.Dict[int, str]=None):
-        if initial_jobs is None:
-            self.jobs:list[Job] = []
-        else:
-            self.jobs:list[Job] = initial_jobs
+    def __init__(self, curr_time:int, startup_time:int, initial_jobs:list[Job] = None, other_information:typing.Dict[int, str]=None,
+                 clock:typing.Callable[[], int]=None, on_complete:typing.Callable[[Job, int], None]=None):
+        self.jobs:JobQueue = JobQueue(initial_jobs)
         self.curr_time:int = curr_time
         self.start_time:int = curr_time
         self.job_progress:int = -startup_time
@@ -27,6 +46,72 @@ class Container:
             self.other_information:typing.Dict[int, str] = {}
         else:
             self.other_information:typing.Dict[int, str] = other_information
+        self.clock:typing.Callable[[], int] = clock
+        self.on_complete:typing.Optional[typing.Callable[[Job, int], None]] = on_complete
+
+        #Running totals of the work in the queue, kept up to date as jobs are added, removed and completed
+        self.total_execution_time:int = 0
+        self.metric_totals:typing.Dict[int, int] = {metric: 0 for metric in Container.TRACKED_METRICS}
+        for job in self.jobs:
+            self.update_totals(job, 1)
+
+    """
+    Adds or subtracts a job from the running totals of the queued work
+
+    Args:
+        job: the job being added or removed
+        sign: 1 if the job is entering the queue, -1 if it is leaving
+    """
+    def update_totals(self, job:Job, sign:int):
+        self.total_execution_time += sign * job.get_execution_time()
+        if job.execution_time_lower_bound is not None:
+            self.metric_totals[Job.EXECUTION_TIME_LOWER_BOUND] += sign * job.execution_time_lower_bound
+        if job.execution_time_upper_bound is not None:
+            self.metric_totals[Job.EXECUTION_TIME_UPPER_BOUND] += sign * job.execution_time_upper_bound
+
+    """
+    Runs the container up to the time of the owning system, containers without events are not advanced by the system
+    so this is done when the container is accessed
+    """
+    def sync(self):
+        if self.clock is not None:
+            time:int = self.clock()
+            if time > self.curr_time:
+                self.run(time)
+
+    """
+    Returns a copy of the container that shares its job queue, the queue is copied by whichever container changes it
+    first
+
+    Args:
+        clock: the clock of the system owning the copy
+        on_complete: called with each job completed by the copy and its completion time
+
+    Returns:
+        The copy
+    """
+    def fork(self, clock:typing.Callable[[], int], on_complete:typing.Callable[[Job, int], None])->'Container':
+        self.sync()
+        container:Container = Container.__new__(Container)
+        container.jobs = self.jobs
+        container.curr_time = self.curr_time
+        container.start_time = self.start_time
+        container.job_progress = self.job_progress
+        container.other_information = dict(self.other_information)
+        container.clock = clock
+        container.total_execution_time = self.total_execution_time
+        container.metric_totals = dict(self.metric_totals)
+        container.on_complete = on_complete
+        self.jobs.add_owner(self, container)
+        return container
+
+    """
+    Copies the job queue if it is shared with a forked container, called before the queue is changed
+    """
+    def own_jobs(self):
+        if self.jobs.get_num_owners() > 1:
+            self.jobs.remove_owner(self)
+            self.jobs = self.jobs.copy()
 
     """
     Add a job to the container's job queue
@@ -35,7 +120,10 @@ class Container:
         job: the job being added
     """
     def add_job(self, job:Job):
+        self.sync()
+        self.own_jobs()
         self.jobs.append(job)
+        self.update_totals(job, 1)
 
     """
     Removes a job, if the job is the current job, progress is reset
@@ -44,9 +132,12 @@ class Container:
         job: the job being removed
     """
     def remove_job(self, job:Job):
+        self.sync()
+        self.own_jobs()
         if len(self.jobs) >= 1 and self.jobs[0] == job:
             self.job_progress = 0
         self.jobs.remove(job)
+        self.update_totals(job, -1)
 
     """
     Reorders the jobs, resets progress if the current job changes
@@ -55,10 +146,16 @@ class Container:
         new_job_order: a list of jobs in the new order
     """
     def new_job_order(self, new_job_order:list[Job]):
+        self.sync()
         if ((len(self.jobs) >= 1 and len(new_job_order) >= 1 and self.jobs[0] != new_job_order[0]) or
                 len(new_job_order) == 0):
             self.job_progress = 0
-        self.jobs = list(new_job_order)
+        self.own_jobs()
+        removed_jobs, added_jobs = self.jobs.reorder(new_job_order)
+        for job in removed_jobs:
+            self.update_totals(job, -1)
+        for job in added_jobs:
+            self.update_totals(job, 1)
 
     """
     Returns the jobs assigned to the container
@@ -66,7 +163,8 @@ class Container:
     Returns:
         The job set
     """
-    def get_jobs(self)->list[Job]:
+    def get_jobs(self)->JobQueue:
+        self.sync()
         return self.jobs
 
     """
@@ -74,22 +172,33 @@ class Container:
 
     Args
         time: the time to run the container until
+
+    Returns:
+        The jobs completed during the run
     """
-    def run(self, time:int):
+    def run(self, time:int)->list[Job]:
+        finished_jobs:list[Job] = []
         if self.job_progress < 0:
             delta:int = min(-self.job_progress, time-self.curr_time)
             self.curr_time += delta
             self.job_progress += delta
 
         while len(self.jobs) > 0 and self.curr_time + self.jobs[0].get_execution_time() - self.job_progress <= time:
-            finished_job:Job = self.jobs.pop(0)
+            self.own_jobs()
+            finished_job:Job = self.jobs.popleft()
+            self.update_totals(finished_job, -1)
             self.curr_time += finished_job.get_execution_time() - self.job_progress
-            finished_job.complete(self.curr_time)
+            if self.on_complete is None:
+                finished_job.complete(self.curr_time)
+            else:
+                self.on_complete(finished_job, self.curr_time)
+            finished_jobs.append(finished_job)
             self.job_progress = 0
 
         if len(self.jobs) >= 1:
             self.job_progress += time - self.curr_time
         self.curr_time = time
+        return finished_jobs
 
     """
     Returns the time until all jobs in the queue are completed
@@ -98,11 +207,8 @@ class Container:
         The time until completion
     """
     def time_until_done(self)->int:
-        time_until_done:int = 0
-        for job in self.jobs:
-            time_until_done += job.get_execution_time()
-        time_until_done -= self.job_progress
-        return time_until_done
+        self.sync()
+        return self.total_execution_time - self.job_progress
 
     """
     Gets the estimated time when a job will be run
@@ -111,15 +217,17 @@ class Container:
         job: the job
         
     Returns:
-        The time when the job will be run, under current conditions
+        The time when the job will be run, under current conditions, jobs not in the queue are treated as being
+        added to the end
     """
     def time_when_job_run(self, job:Job)->int:
+        self.sync()
         run_time:int = self.curr_time
         run_time -= self.job_progress
-        for j in self.jobs:
-            if j == job:
-                break
-            run_time += job.get_execution_time()
+        if job in self.jobs:
+            run_time += self.jobs.work_before(job)
+        else:
+            run_time += self.total_execution_time
         return run_time
 
     """
@@ -133,12 +241,30 @@ class Container:
         The time until completion under the different metric
     """
     def time_until_done_other(self, other_metric:int):
+        self.sync()
+        if other_metric in self.metric_totals:
+            return self.metric_totals[other_metric] - self.job_progress
         time_until_done:int = 0
         for job in self.jobs:
             time_until_done += int(job.get_other_info(other_metric))
         time_until_done -= self.job_progress
         return time_until_done
 
+    """
+    Returns the time of the next change in the container's state, either the current job completing or the startup
+    finishing
+
+    Returns:
+        The time of the next event, or -1 if the container is idle
+    """
+    def get_next_event_time(self)->int:
+        self.sync()
+        if self.job_progress < 0:
+            return self.curr_time - self.job_progress
+        if len(self.jobs) >= 1:
+            return self.curr_time + self.jobs[0].get_execution_time() - self.job_progress
+        return -1
+
     """
     Completes all jobs assigned to container
     """
@@ -161,8 +287,32 @@ class Container:
         The time the container has been alive
     """
     def get_time_alive(self)->int:
+        self.sync()
         return self.curr_time - self.start_time
 
+    """
+    Returns the state of the container
+
+    Returns:
+        STARTING if the container is starting up, BUSY if it has started and has jobs, IDLE otherwise
+    """
+    def get_state(self)->int:
+        self.sync()
+        if self.job_progress < 0:
+            return Container.STARTING
+        if len(self.jobs) >= 1:
+            return Container.BUSY
+        return Container.IDLE
+
+    """
+    Returns the time the container was started
+
+    Returns:
+        The start time
+    """
+    def get_start_time(self)->int:
+        return self.start_time
+
     """
     Adds additional information
     
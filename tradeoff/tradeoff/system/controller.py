@@ -1,14 +1,26 @@
 from tradeoff.system.simulated_system import SimulatedSystem
 from tradeoff.system.job import Job
+from tradeoff.system.job_table import JobTable
+from tradeoff.system.arrival_queue import ArrivalQueue
 from tradeoff.schedulers.model import Model
 from tradeoff.jobs import job_manager
 from tradeoff.system.action import Action
+from tradeoff.system.action_batch import ActionBatch
 from tradeoff.results import result_manager
-import typing
+from tradeoff.system import checkpoint
 import heapq
+import typing
 
 """
 Controls a state-based simulated system of jobs and machines
+
+An incremental model (see Model.is_incremental) is given the jobs that arrived, the jobs that completed and the
+containers that went idle since it was last called instead of every queued job. Actions passed to next_step are not
+reported to an incremental model.
+
+A model that declares its wake events (see Model.get_wake_events) is only called when one of them happens or one of its
+named timers fires (see Action.SET_TIMER), the timers are kept in a heap. Otherwise the model is called at every job
+arrival and at the time of the last wait action.
 """
 class Controller:
     """
@@ -20,6 +32,14 @@ class Controller:
         jobs_file: the file containing the jobs (empty if manual)
         results_file: file where results will be stored (empty if manual)
         manual_control: true if the system is manually controlled, false if system is automatically controlled
+        job_source: jobs or job tables in order of receival time that are read as they are released, such as a
+            job_manager.ChunkedJobReader, the source is iterated over again when the controller is reset
+        start_time: the time the simulation starts at, only jobs of the jobs file received from this time are loaded
+        end_time: only jobs of the jobs file received before this time are loaded, -1 to load every job after the start
+        time_quantum: if above 0, jobs are only released at multiples of the quantum after the start time, so jobs
+            received within a quantum are released together and the model is called once for them at the quantum
+            boundary, trading timing accuracy for fewer steps (see result_manager.quantization_error_report). Waits and
+            timers of the model and the step that drains the system after the last job is released are not quantized.
 
     model_config_file:
         <model_module_name>,<model_class_name>,<model params (comma separated)>
@@ -29,7 +49,9 @@ class Controller:
             or
         <id>,<receival_time>,<execution_time>,<deadline>,<lower_bound>,<upper_bound>
     """
-    def __init__(self, startup_duration:int, model_config_file:str="",  jobs_file:str="", results_file:str="", manual_control:bool=False):
+    def __init__(self, startup_duration:int, model_config_file:str="",  jobs_file:str="", results_file:str="", manual_control:bool=False,
+                 job_source:typing.Iterable[typing.Union[Job, JobTable]]=None,
+                 start_time:int=0, end_time:int=-1, time_quantum:int=0):
         if not manual_control:
             with open(model_config_file) as config_file:
                 config_file_lines: list[str] = [line.strip() for line in config_file.readlines()]
@@ -41,27 +63,109 @@ class Controller:
             self.model: Model = model
             self.results_file_name: str = results_file
 
-        if jobs_file != "":
-            self.jobs: list[Job] = sorted(job_manager.jobs_from_file(file_name=jobs_file))
+        # Jobs are kept in a table sorted by receival time, job objects are only created as jobs are released
+        if jobs_file != "" and (start_time != 0 or end_time != -1):
+            self.jobs: JobTable = job_manager.job_table_from_file_window(file_name=jobs_file, start_time=start_time,
+                                                                         end_time=end_time).sorted_by_receival_time()
+        elif jobs_file != "":
+            self.jobs: JobTable = job_manager.job_table_from_file(file_name=jobs_file).sorted_by_receival_time()
         else:
-            self.jobs: list[Job] = []
-        heapq.heapify(self.jobs)
-        self.job_ind: int = 0
-        self.queued_jobs: list[Job] = []
+            self.jobs: JobTable = JobTable.from_jobs([])
+        # Jobs that have not been released, added jobs are only held until they are released
+        self.arrivals: ArrivalQueue = ArrivalQueue()
+        self.arrivals.add_table(self.jobs)
+        self.job_source: typing.Optional[typing.Iterable[typing.Union[Job, JobTable]]] = job_source
+        if job_source is not None:
+            self.arrivals.add_stream(job_source)
+        # Insertion ordered, so jobs stay in release order and can be removed in constant time once assigned
+        self.queued_jobs: typing.Dict[Job, None] = {}
+
+        self.system:SimulatedSystem = SimulatedSystem(startup_duration=startup_duration, curr_time=start_time)
 
-        self.system:SimulatedSystem = SimulatedSystem(startup_duration=startup_duration, curr_time=0)
+        self.jobs_file:str = jobs_file
+        self.start_time:int = start_time
+        self.end_time:int = end_time
+        self.time:int = start_time
+        self.time_quantum:int = time_quantum
 
-        self.time:int = 0
+        # Jobs released since an incremental model was last called
+        self.incremental:bool = hasattr(self, "model") and self.model.is_incremental()
+        self.arrived_jobs:list[Job] = []
+        if self.incremental:
+            self.system.track_changes()
+
+        # Events that wake the model, None if the model is called at every arrival and wait
+        self.wake_events:typing.Optional[set[int]] = self.model.get_wake_events() if hasattr(self, "model") else None
+        # Named timers of the model and a min heap of their times, heap entries of changed timers are skipped
+        self.timers:typing.Dict[str, int] = {}
+        self.timer_heap:list[typing.Tuple[int, str]] = []
+        # Names of the timers that only wake the model if a job was released since it was last called
+        self.arrival_timers:set[str] = set()
+        # Number of completed jobs and of containers that went idle when the model was last woken
+        self.completion_count:int = 0
+        self.idle_count:int = 0
 
     """
-    Adds jobs to the system
+    Adds a batch of jobs to the system, the jobs are released at their receival times as the same objects, so they are
+    marked complete and keep their other information, and are not kept after they are released. Added jobs are dropped
+    when the controller is reset.
     
     Args:
         jobs: the jobs to add
     """
     def add_jobs(self, jobs:list[Job]):
-        for job in jobs:
-            heapq.heappush(self.jobs, job)
+        self.arrivals.add_jobs(jobs)
+
+    """
+    Adds a single job to the system, the job is released at its receival time and is not kept after it is released, it
+    is dropped when the controller is reset
+
+    Args:
+        job: the job to add
+    """
+    def add_job(self, job:Job):
+        self.arrivals.add_job(job)
+
+    """
+    Returns a copy of the controller that can be stepped without affecting this controller (see SimulatedSystem.fork)
+
+    Returns:
+        The forked controller
+    """
+    def fork(self)->'Controller':
+        controller:Controller = Controller.__new__(Controller)
+        if hasattr(self, "model"):
+            controller.model = self.model.copy()
+            controller.results_file_name = self.results_file_name
+        controller.jobs = self.jobs
+        controller.job_source = self.job_source
+        controller.arrivals = self.arrivals.copy()
+        controller.queued_jobs = dict(self.queued_jobs)
+        controller.system = self.system.fork()
+        controller.jobs_file = self.jobs_file
+        controller.start_time = self.start_time
+        controller.end_time = self.end_time
+        controller.time_quantum = self.time_quantum
+        controller.time = self.time
+        controller.incremental = self.incremental
+        controller.arrived_jobs = list(self.arrived_jobs)
+        controller.wake_events = self.wake_events
+        controller.timers = dict(self.timers)
+        controller.timer_heap = list(self.timer_heap)
+        controller.arrival_timers = set(self.arrival_timers)
+        controller.completion_count = len(controller.system.get_results())
+        controller.idle_count = controller.system.get_idle_count()
+        return controller
+
+    """
+    Returns a snapshot of the current state of the controller, a snapshot is a fork that is kept unchanged so it can be
+    forked for each evaluation
+
+    Returns:
+        The snapshot
+    """
+    def snapshot(self)->'Controller':
+        return self.fork()
 
     """
     Returns the system
@@ -73,13 +177,13 @@ class Controller:
         return self.system
 
     """
-    Returns the queued jobs
+    Returns the queued jobs, as a read-only view that changes as jobs are released and assigned
 
     Returns:
-        The queued jobs
+        The queued jobs, in release order
     """
-    def get_queued_jobs(self)->list[Job]:
-        return self.queued_jobs
+    def get_queued_jobs(self)->typing.KeysView[Job]:
+        return self.queued_jobs.keys()
 
     """
     Returns the time
@@ -94,64 +198,229 @@ class Controller:
     Moves the controller to the next step, continues until the earlier of the wait time and the next job release time
     
     Args:
-        actions: list of actions to perform if not using the set model
+        actions: actions to perform if not using the set model, as action objects or a batch
     
     Returns:
-        The simulated system and queued jobs
+        The simulated system and queued jobs (see get_queued_jobs)
     """
-    def next_step(self, actions:list[Action] = None)->typing.Tuple[SimulatedSystem, list[Job]]:
+    def next_step(self, actions:typing.Union[list[Action], ActionBatch] = None)->typing.Tuple[SimulatedSystem, typing.KeysView[Job]]:
         if not hasattr(self, "model") and actions is None:
             raise ValueError("No model nor action")
         if self.is_done():
-            return self.system, self.queued_jobs
+            return self.system, self.get_queued_jobs()
 
         # Get and handle actions
-        if actions is None:
-            actions = self.model.determine_actions(system=self.system, unassigned_jobs=self.queued_jobs)
-        wait_time = -1
-        for action in actions:
-            if action.get_action_type() == Action.WAIT:
-                wait_time = action.get_time()
+        if actions is None and self.incremental:
+            completed_jobs, idle_containers = self.system.take_changes()
+            actions = self.model.update(system=self.system, arrived_jobs=self.arrived_jobs,
+                                        completed_jobs=completed_jobs, idle_containers=idle_containers)
+            self.arrived_jobs = []
+        elif actions is None:
+            actions = self.model.determine_actions(system=self.system, unassigned_jobs=self.get_queued_jobs())
+        if isinstance(actions, ActionBatch):
+            wait_time = actions.get_wait_time()
+        else:
+            wait_time = -1
+            for action in actions:
+                if action.get_action_type() == Action.WAIT:
+                    wait_time = action.get_time()
         self.system.perform_actions(actions=actions)
 
-        # Remove assigned jobs from queued
-        jobs_to_remove: list[Job] = []
-        assigned_jobs: set[Job] = self.system.get_assigned_jobs()
-        for job in self.queued_jobs:
-            if job in assigned_jobs:
-                jobs_to_remove.append(job)
-        for job in jobs_to_remove:
-            self.queued_jobs.remove(job)
+        # Remove the jobs assigned by these actions from queued
+        if isinstance(actions, ActionBatch):
+            for job in actions.get_assigned_jobs():
+                self.queued_jobs.pop(job, None)
+        else:
+            for action in actions:
+                if action.get_action_type() == Action.ACTIVATE_CONTAINER or action.get_action_type() == Action.ADD_JOBS:
+                    for job in action.get_jobs():
+                        self.queued_jobs.pop(job, None)
 
-        if wait_time == -1 and self.job_ind == len(self.jobs):
+        if self.wake_events is not None:
+            self.set_timers(actions)
+            self.run_until_wake()
+            return self.system, self.get_queued_jobs()
+
+        # Only steps to release jobs are quantized, waits are kept so schedulers that depend on exact decision times
+        # still reach them, and the step that drains the system once every job is released is exact
+        if wait_time == -1 and self.arrivals.is_empty():
             next_time = self.time + self.system.get_time_until_done()
         elif wait_time == -1:
-            next_time = self.jobs[self.job_ind].get_receival_time()
-        elif self.job_ind == len(self.jobs):
+            next_time = self.quantize(self.arrivals.get_next_receival_time())
+        elif self.arrivals.is_empty():
             next_time = wait_time
         else:
-            next_time = min(self.jobs[self.job_ind].get_receival_time(), wait_time)
+            next_time = min(self.quantize(self.arrivals.get_next_receival_time()), wait_time)
 
-        next_time = max(next_time, self.time + 1)
+        next_time = max(next_time, self.quantize(self.time + 1) if wait_time == -1 and not self.arrivals.is_empty()
+                                   else self.time + 1)
 
         self.system.run(next_time)
 
-        while self.job_ind < len(self.jobs) and self.jobs[self.job_ind].get_receival_time() <= self.system.get_time():
-            self.queued_jobs.append(self.jobs[self.job_ind])
-            self.job_ind += 1
+        self.release_jobs()
 
         self.time = next_time
 
-        return self.system, self.queued_jobs
+        return self.system, self.get_queued_jobs()
+
+    """
+    Rounds a time up to the next quantum boundary, times are not changed if there is no time quantum
+
+    Args:
+        time: the time
+
+    Returns:
+        The first multiple of the time quantum after the start time that is at or after the time
+    """
+    def quantize(self, time:int)->int:
+        if self.time_quantum <= 0:
+            return time
+        return self.start_time - (self.start_time - time)//self.time_quantum*self.time_quantum
+
+    """
+    Releases the jobs received by the current system time into the queue
+
+    Returns:
+        The released jobs
+    """
+    def release_jobs(self)->list[Job]:
+        released_jobs:list[Job] = self.arrivals.release(self.system.get_time())
+        for job in released_jobs:
+            self.queued_jobs[job] = None
+        if self.incremental:
+            self.arrived_jobs.extend(released_jobs)
+        return released_jobs
+
+    """
+    Sets the timers of the set timer actions, a wait action sets the timer named "wait"
+
+    Args:
+        actions: the actions, as action objects or a batch
+    """
+    def set_timers(self, actions:typing.Union[list[Action], ActionBatch]):
+        if isinstance(actions, ActionBatch):
+            timers:typing.Iterator[typing.Tuple[int, int, typing.Dict[int, str]]] = (
+                (actions.get_action_type(action_num), actions.get_time(action_num),
+                 actions.get_all_other_information(action_num)) for action_num in range(len(actions)))
+        else:
+            timers = ((action.get_action_type(), action.get_time(), action.get_all_other_information())
+                      for action in actions)
+        for action_type, time, other_information in timers:
+            if action_type == Action.SET_TIMER:
+                self.set_timer(other_information[Action.TIMER_NAME], time,
+                               if_arrived=Action.TIMER_IF_ARRIVED in other_information)
+            elif action_type == Action.WAIT:
+                self.set_timer("wait", time)
+
+    """
+    Sets a timer of the model
+
+    Args:
+        name: the name of the timer
+        time: the time the timer fires, -1 to cancel the timer
+        if_arrived: if the timer only wakes the model if a job was released since the model was last called
+    """
+    def set_timer(self, name:str, time:int, if_arrived:bool=False):
+        if if_arrived:
+            self.arrival_timers.add(name)
+        else:
+            self.arrival_timers.discard(name)
+        if time == -1:
+            self.timers.pop(name, None)
+        elif self.timers.get(name) != time:
+            self.timers[name] = time
+            heapq.heappush(self.timer_heap, (time, name))
 
     """
-    Resets the system
+    Returns the time of the next timer
+
+    Returns:
+        The time the next timer fires, or -1 if there are no timers
+    """
+    def get_next_timer_time(self)->int:
+        while len(self.timer_heap) > 0 and self.timers.get(self.timer_heap[0][1]) != self.timer_heap[0][0]:
+            heapq.heappop(self.timer_heap)
+        if len(self.timer_heap) == 0:
+            return -1
+        return self.timer_heap[0][0]
+
+    """
+    Returns the time the model has to be woken by, the earliest of its next timer and the next time one of its wake
+    events can happen
+
+    Returns:
+        The wake time, or -1 if nothing can wake the model
+    """
+    def get_next_wake_time(self)->int:
+        wake_times:list[int] = [self.get_next_timer_time()]
+        if Action.WAKE_ON_ARRIVAL in self.wake_events and not self.arrivals.is_empty():
+            wake_times.append(self.quantize(self.arrivals.get_next_receival_time()))
+        if ((Action.WAKE_ON_COMPLETION in self.wake_events or Action.WAKE_ON_IDLE in self.wake_events)
+                and self.system.get_next_event_time() != -1):
+            wake_times.append(self.quantize(self.system.get_next_event_time()))
+        wake_times = [wake_time for wake_time in wake_times if wake_time != -1]
+        return min(wake_times) if len(wake_times) > 0 else -1
+
+    """
+    Runs the system until the model has to be woken, jobs that are released before then are queued without calling the
+    model. Timers that only wake the model if a job was released since it was last called are dropped if none was.
+    If nothing can wake the model it is woken at the next arrival, or when the system is done if no jobs are left to
+    arrive.
+    """
+    def run_until_wake(self):
+        arrived:bool = False
+        while True:
+            wake_time:int = self.get_next_wake_time()
+            woken:bool = wake_time == -1
+            if wake_time == -1 and self.arrivals.is_empty():
+                wake_time = self.time + self.system.get_time_until_done()
+            elif wake_time == -1:
+                wake_time = self.quantize(self.arrivals.get_next_receival_time())
+            wake_time = max(wake_time, self.time + 1)
+
+            self.system.run(wake_time)
+            released_jobs:list[Job] = self.release_jobs()
+            self.time = wake_time
+            arrived = arrived or len(released_jobs) > 0
+
+            while self.get_next_timer_time() != -1 and self.get_next_timer_time() <= self.time:
+                _, name = heapq.heappop(self.timer_heap)
+                del self.timers[name]
+                if arrived or name not in self.arrival_timers:
+                    woken = True
+                self.arrival_timers.discard(name)
+            if Action.WAKE_ON_ARRIVAL in self.wake_events and len(released_jobs) > 0:
+                woken = True
+            if (Action.WAKE_ON_COMPLETION in self.wake_events
+                    and len(self.system.get_results()) != self.completion_count):
+                woken = True
+            if Action.WAKE_ON_IDLE in self.wake_events and self.system.get_idle_count() != self.idle_count:
+                woken = True
+            self.completion_count = len(self.system.get_results())
+            self.idle_count = self.system.get_idle_count()
+            if woken or self.is_done():
+                return
+
+    """
+    Resets the system, the jobs of the jobs file and job source the controller was created with are released again and
+    jobs added with add_jobs or add_job are dropped, as released jobs are not kept
     """
     def reset(self):
-        self.system.reset()
-        self.queued_jobs = []
-        self.job_ind = 0
-        self.time:int = 0
+        self.system.reset(self.start_time)
+        self.queued_jobs = {}
+        self.arrived_jobs = []
+        if hasattr(self, "model"):
+            self.model.reset()
+        self.timers = {}
+        self.timer_heap = []
+        self.arrival_timers = set()
+        self.completion_count = 0
+        self.idle_count = 0
+        self.arrivals = ArrivalQueue()
+        self.arrivals.add_table(self.jobs)
+        if self.job_source is not None:
+            self.arrivals.add_stream(self.job_source)
+        self.time:int = self.start_time
 
     """
     Checks if the simulation is done
@@ -160,18 +429,37 @@ class Controller:
         True if the system is done and False otherwise
     """
     def is_done(self):
-        return self.job_ind >= len(self.jobs) and len(self.queued_jobs) == 0 and self.system.get_time_until_done() == 0
+        return self.arrivals.is_empty() and len(self.queued_jobs) == 0 and self.system.get_time_until_done() == 0
+
+    """
+    Saves a checkpoint of the controller (see checkpoint.save_checkpoint), it can be resumed with checkpoint.load_checkpoint
+
+    Args:
+        file_name: the name of the checkpoint file
+    """
+    def save_checkpoint(self, file_name:str):
+        checkpoint.save_checkpoint(self, file_name)
 
     """
     Runs the system until completion
+
+    Args:
+        checkpoint_file: file a checkpoint is saved to periodically (empty if no checkpoints are saved)
+        checkpoint_interval: number of steps between checkpoints
         
     Returns:
         The name of the file with the results
     """
-    def control_loop(self)->str:
+    def control_loop(self, checkpoint_file:str="", checkpoint_interval:int=10000)->str:
         if not hasattr(self, "model"):
             raise ValueError("No model")
+        steps:int = 0
         while not self.is_done():
             self.next_step()
-        result_manager.save_system_performance(self.system, self.jobs, self.results_file_name)
+            steps += 1
+            if checkpoint_file != "" and steps % checkpoint_interval == 0:
+                self.save_checkpoint(checkpoint_file)
+        result_manager.save_system_performance(self.system, self.system.get_results(), self.results_file_name,
+                                               time_quantum=self.time_quantum,
+                                               incomplete_jobs=self.system.get_incomplete_jobs())
         return self.results_file_name
\ No newline at end of file
@@ -2,8 +2,14 @@ import typing
 
 """
 Job data type, stores all relevant information of a job
+
+The execution time bounds are stored as integer attributes, other information is kept in a dictionary that is only
+created when the first other information is added
 """
 class Job:
+    __slots__ = ("job_id", "execution_time", "receival_time", "deadline", "completion_time",
+                 "execution_time_lower_bound", "execution_time_upper_bound", "other_info")
+
     #Other information keys
     EXECUTION_TIME_LOWER_BOUND = 1
     EXECUTION_TIME_UPPER_BOUND = 2
@@ -16,24 +22,36 @@ class Job:
         execution_time: execution time of the job
         receival_time: the time the job is received
         deadline: time the jobs is due
+        execution_time_lower_bound: lower bound of the execution time, None if unknown
+        execution_time_upper_bound: upper bound of the execution time, None if unknown
     """
-    def __init__(self, job_id:str, execution_time:int, receival_time:int, deadline:int=-1):
+    def __init__(self, job_id:str, execution_time:int, receival_time:int, deadline:int=-1,
+                 execution_time_lower_bound:int=None, execution_time_upper_bound:int=None):
         self.job_id:str = job_id
         self.execution_time:int = execution_time
         self.receival_time:int = receival_time
         self.deadline:int = deadline
         self.completion_time:int = -1
-        self.other_info:typing.Dict[int, str] = {}
+        self.execution_time_lower_bound:typing.Optional[int] = execution_time_lower_bound
+        self.execution_time_upper_bound:typing.Optional[int] = execution_time_upper_bound
+        self.other_info:typing.Optional[typing.Dict[int, str]] = None
 
     """
-    Adds additional info to the job
+    Adds additional info to the job, execution time bounds are stored as integers
 
     Args:
         key: the key the additional info can be accessed by
         value: the value stored
     """
     def add_other_info(self, key:int, value:str):
-        self.other_info[key] = value
+        if key == Job.EXECUTION_TIME_LOWER_BOUND:
+            self.execution_time_lower_bound = int(value)
+        elif key == Job.EXECUTION_TIME_UPPER_BOUND:
+            self.execution_time_upper_bound = int(value)
+        else:
+            if self.other_info is None:
+                self.other_info = {}
+            self.other_info[key] = value
 
     """
     Gets additional info from the job
@@ -45,6 +63,12 @@ class Job:
         The attached info
     """
     def get_other_info(self, key:int)->str:
+        if key == Job.EXECUTION_TIME_LOWER_BOUND:
+            return None if self.execution_time_lower_bound is None else str(self.execution_time_lower_bound)
+        if key == Job.EXECUTION_TIME_UPPER_BOUND:
+            return None if self.execution_time_upper_bound is None else str(self.execution_time_upper_bound)
+        if self.other_info is None:
+            return None
         return self.other_info.get(key)
 
     """
@@ -54,7 +78,32 @@ class Job:
         The set of keys of all other information in the job
     """
     def get_all_other_info(self)->set[int]:
-        return set(self.other_info.keys())
+        keys:set[int] = set()
+        if self.execution_time_lower_bound is not None:
+            keys.add(Job.EXECUTION_TIME_LOWER_BOUND)
+        if self.execution_time_upper_bound is not None:
+            keys.add(Job.EXECUTION_TIME_UPPER_BOUND)
+        if self.other_info is not None:
+            keys.update(self.other_info.keys())
+        return keys
+
+    """
+    Returns the lower bound of the execution time
+
+    Returns:
+        The lower bound, or None if the job has no bound
+    """
+    def get_execution_time_lower_bound(self)->typing.Optional[int]:
+        return self.execution_time_lower_bound
+
+    """
+    Returns the upper bound of the execution time
+
+    Returns:
+        The upper bound, or None if the job has no bound
+    """
+    def get_execution_time_upper_bound(self)->typing.Optional[int]:
+        return self.execution_time_upper_bound
 
     """
     Returns the job id
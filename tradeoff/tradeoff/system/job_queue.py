@@ -0,0 +1,294 @@
+import typing
+import weakref
+
+from tradeoff.system.job import Job
+
+"""
+Job queue of a container, supports positional queries on the queue
+
+Jobs are stored in an append only list of slots with a pointer to the head of the queue, removed jobs leave an empty
+slot behind. A Fenwick tree over the execution times of the slots gives the amount of work queued before any job as a
+prefix sum. The slots are compacted once more than half of them are empty.
+
+A queue can be shared by the containers of forked systems, owners holds weak references to them so a container that is
+dropped stops owning the queue, and an owner copies the queue before changing it while it is shared (see
+Container.own_jobs).
+
+Operation costs (n jobs in the queue):
+    append, remove, work before a job - O(log n)
+    pop from the head, first job - O(1) amortized
+    reorder - O(p + k log n) where p is the number of jobs before the first position where the order changes and k is
+        the number of jobs removed and added after it
+    job at any other position - O(n)
+"""
+class JobQueue:
+    #Minimum number of empty slots before the queue is compacted
+    MIN_COMPACTION_SIZE = 1024
+
+    """
+    Constructor
+
+    Args:
+        jobs: the initial jobs in the queue, in order
+    """
+    def __init__(self, jobs:typing.Iterable[Job]=None):
+        self.slots:list[typing.Optional[Job]] = []
+        self.tree:list[int] = [0]
+        self.positions:typing.Dict[Job, int] = {}
+        self.head:int = 0
+        #Containers sharing the queue, None while the queue has a single owner
+        self.owners:typing.Optional[weakref.WeakSet] = None
+        if jobs is not None:
+            self.rebuild(list(jobs))
+
+    """
+    Returns a copy of the queue with a single owner
+
+    Returns:
+        The copy
+    """
+    def copy(self)->'JobQueue':
+        queue:JobQueue = JobQueue()
+        queue.slots = self.slots.copy()
+        queue.tree = self.tree.copy()
+        queue.positions = self.positions.copy()
+        queue.head = self.head
+        return queue
+
+    """
+    Adds an owner to the queue, the queue is shared with the containers that already own it
+
+    Args:
+        owner: the container that owned the queue first
+        new_owner: the container that now also owns the queue
+    """
+    def add_owner(self, owner:typing.Any, new_owner:typing.Any):
+        if self.owners is None:
+            self.owners = weakref.WeakSet([owner])
+        self.owners.add(new_owner)
+
+    """
+    Removes an owner from the queue
+
+    Args:
+        owner: the container that no longer owns the queue
+    """
+    def remove_owner(self, owner:typing.Any):
+        if self.owners is not None:
+            self.owners.discard(owner)
+
+    """
+    Returns the number of containers owning the queue, owners that were dropped are not counted
+
+    Returns:
+        The number of owners
+    """
+    def get_num_owners(self)->int:
+        return 1 if self.owners is None else len(self.owners)
+
+    """
+    Replaces the contents of the queue, building the Fenwick tree in linear time
+
+    Args:
+        jobs: the jobs in the queue, in order
+    """
+    def rebuild(self, jobs:list[Job]):
+        self.slots = list(jobs)
+        self.head = 0
+        self.positions = {job: slot for slot, job in enumerate(self.slots)}
+        self.tree = [0] * (len(self.slots) + 1)
+        for slot, job in enumerate(self.slots):
+            index:int = slot + 1
+            self.tree[index] += job.get_execution_time()
+            parent:int = index + (index & -index)
+            if parent <= len(self.slots):
+                self.tree[parent] += self.tree[index]
+
+    """
+    Adds a value to the Fenwick tree entry of a slot
+
+    Args:
+        slot: the slot being updated
+        value: the value being added
+    """
+    def tree_add(self, slot:int, value:int):
+        index:int = slot + 1
+        while index < len(self.tree):
+            self.tree[index] += value
+            index += index & -index
+
+    """
+    Returns the total execution time of the slots before a slot
+
+    Args:
+        slot: the slot
+
+    Returns:
+        The sum of the execution times of the jobs in the slots before the given slot
+    """
+    def prefix_sum(self, slot:int)->int:
+        total:int = 0
+        index:int = slot
+        while index > 0:
+            total += self.tree[index]
+            index -= index & -index
+        return total
+
+    """
+    Adds a job to the end of the queue
+
+    Args:
+        job: the job being added
+    """
+    def append(self, job:Job):
+        slot:int = len(self.slots)
+        index:int = slot + 1
+        self.slots.append(job)
+        self.positions[job] = slot
+        # A new Fenwick node covers the slots (index - lowbit(index), index]
+        self.tree.append(job.get_execution_time() + self.prefix_sum(slot) - self.prefix_sum(index - (index & -index)))
+
+    """
+    Returns the job at the head of the queue
+
+    Returns:
+        The first job, or None if the queue is empty
+    """
+    def peek(self)->typing.Optional[Job]:
+        if self.head >= len(self.slots):
+            return None
+        return self.slots[self.head]
+
+    """
+    Removes and returns the job at the head of the queue
+
+    Returns:
+        The first job
+    """
+    def popleft(self)->Job:
+        job:Job = self.slots[self.head]
+        self.slots[self.head] = None
+        del self.positions[job]
+        self.advance_head()
+        return job
+
+    """
+    Removes a job from the queue
+
+    Args:
+        job: the job being removed
+    """
+    def remove(self, job:Job):
+        if job not in self.positions:
+            raise ValueError("Job is not in the queue")
+        slot:int = self.positions.pop(job)
+        self.slots[slot] = None
+        self.tree_add(slot, -job.get_execution_time())
+        if slot == self.head:
+            self.advance_head()
+        else:
+            self.compact_if_sparse()
+
+    """
+    Moves the head past empty slots and compacts the queue if it is mostly empty slots
+    """
+    def advance_head(self):
+        while self.head < len(self.slots) and self.slots[self.head] is None:
+            self.head += 1
+        self.compact_if_sparse()
+
+    """
+    Rebuilds the slots without the empty ones when they outnumber the jobs in the queue
+    """
+    def compact_if_sparse(self):
+        num_empty:int = len(self.slots) - len(self.positions)
+        if num_empty >= JobQueue.MIN_COMPACTION_SIZE and num_empty > len(self.positions):
+            self.rebuild(list(self))
+
+    """
+    Changes the order of the queue, the jobs before the first difference between the orders are left in place and the
+    rest of the queue is replaced
+
+    Args:
+        new_order: the jobs in their new order
+
+    Returns:
+        The jobs removed from the queue and the jobs added to the queue
+    """
+    def reorder(self, new_order:list[Job])->typing.Tuple[list[Job], list[Job]]:
+        num_unchanged:int = 0
+        first_changed_slot:int = self.head
+        while first_changed_slot < len(self.slots):
+            job:typing.Optional[Job] = self.slots[first_changed_slot]
+            if job is not None:
+                if num_unchanged >= len(new_order) or new_order[num_unchanged] is not job:
+                    break
+                num_unchanged += 1
+            first_changed_slot += 1
+
+        #Every slot from the first changed one on is emptied, so they are cut off instead of being removed one by one,
+        #a Fenwick node only covers the slots up to its own so the nodes before the cut stay valid
+        removed_jobs:list[Job] = [job for job in self.slots[first_changed_slot:] if job is not None]
+        for job in removed_jobs:
+            del self.positions[job]
+        del self.slots[first_changed_slot:]
+        del self.tree[first_changed_slot + 1:]
+
+        added_jobs:list[Job] = new_order[num_unchanged:]
+        for job in added_jobs:
+            self.append(job)
+        self.advance_head()
+        return removed_jobs, added_jobs
+
+    """
+    Returns the execution time of the jobs ahead of a job in the queue
+
+    Args:
+        job: the job
+
+    Returns:
+        The total execution time of the jobs before the job
+    """
+    def work_before(self, job:Job)->int:
+        return self.prefix_sum(self.positions[job]) - self.prefix_sum(self.head)
+
+    """
+    Iterates over the jobs in the queue starting at a position
+
+    Args:
+        position: the number of jobs skipped from the head
+    """
+    def iterate_from(self, position:int)->typing.Iterator[Job]:
+        skipped:int = 0
+        for slot in range(self.head, len(self.slots)):
+            job:typing.Optional[Job] = self.slots[slot]
+            if job is None:
+                continue
+            if skipped >= position:
+                yield job
+            else:
+                skipped += 1
+
+    def __getstate__(self)->typing.Dict[str, typing.Any]:
+        #A pickled queue has a single owner, the containers sharing it are not pickled with it
+        state:typing.Dict[str, typing.Any] = dict(self.__dict__)
+        state["owners"] = None
+        return state
+
+    def __contains__(self, job:Job)->bool:
+        return job in self.positions
+
+    def __iter__(self)->typing.Iterator[Job]:
+        return self.iterate_from(0)
+
+    def __len__(self)->int:
+        return len(self.positions)
+
+    def __getitem__(self, position:int)->Job:
+        if position == 0 and len(self.positions) > 0:
+            return self.slots[self.head]
+        if position < 0:
+            position += len(self.positions)
+        for job in self.iterate_from(position):
+            return job
+        raise IndexError("Job queue index out of range")
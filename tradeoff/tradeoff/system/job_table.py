@@ -0,0 +1,211 @@
+import typing
+import numpy as np
+import numpy.typing as npt
+
+from tradeoff.system.job import Job
+
+"""
+Columnar store of a set of jobs, each job is a row and each job attribute is a NumPy array
+
+Job objects are only created for rows when they are needed (see job), so a large job set only takes a few machine words
+per job until it is released. The table only holds the jobs, the results of completed jobs are kept by the system (see
+SimulatedSystem.get_results), so running a memory mapped table does not write to it.
+
+Columns:
+    ids - job ids
+    receival_times - time each job is received
+    execution_times - true execution time of each job
+    lower_bounds - execution time lower bound (NO_BOUND if the job has no bound)
+    upper_bounds - execution time upper bound (NO_BOUND if the job has no bound)
+    deadlines - deadline of each job (NO_VALUE if the job has no deadline)
+
+Whether the rows are sorted by receival time is recorded when it is known, such as for a table loaded from the binary
+column format or returned by sorted_by_receival_time, so a memory mapped table is not read in full to check it.
+"""
+class JobTable:
+    NO_VALUE = -1
+    #Sampled bounds can be negative, so a missing bound uses the smallest integer instead of NO_VALUE
+    NO_BOUND = np.iinfo(np.int64).min
+
+    """
+    Constructor, columns that are not provided are filled with NO_BOUND or NO_VALUE
+
+    Args:
+        ids: job ids
+        receival_times: receival times
+        execution_times: true execution times
+        lower_bounds: execution time lower bounds
+        upper_bounds: execution time upper bounds
+        deadlines: job deadlines
+        receival_sorted: True if the rows are known to be sorted by receival time, None if it is not known
+    """
+    def __init__(self, ids:npt.ArrayLike, receival_times:npt.ArrayLike, execution_times:npt.ArrayLike,
+                 lower_bounds:npt.ArrayLike=None, upper_bounds:npt.ArrayLike=None, deadlines:npt.ArrayLike=None,
+                 receival_sorted:typing.Optional[bool]=None):
+        self.ids:npt.NDArray[np.str_] = np.asarray(ids, dtype=np.str_)
+        self.receival_times:npt.NDArray[np.int64] = np.asarray(receival_times, dtype=np.int64)
+        self.execution_times:npt.NDArray[np.int64] = np.asarray(execution_times, dtype=np.int64)
+        self.lower_bounds:npt.NDArray[np.int64] = self.optional_column(lower_bounds, JobTable.NO_BOUND)
+        self.upper_bounds:npt.NDArray[np.int64] = self.optional_column(upper_bounds, JobTable.NO_BOUND)
+        self.deadlines:npt.NDArray[np.int64] = self.optional_column(deadlines, JobTable.NO_VALUE)
+        self.receival_sorted:typing.Optional[bool] = receival_sorted
+
+    """
+    Converts an optional column to an array, filling it with a default value if it is missing
+
+    Args:
+        column: the column values or None
+        default: the value used for every row of a missing column
+
+    Returns:
+        The column array
+    """
+    def optional_column(self, column:typing.Optional[npt.ArrayLike], default:int)->npt.NDArray[np.int64]:
+        if column is None:
+            return np.full(len(self.ids), default, dtype=np.int64)
+        return np.asarray(column, dtype=np.int64)
+
+    """
+    Creates a table from job objects
+
+    Args:
+        jobs: the jobs
+
+    Returns:
+        A table with a row for each job, in the same order
+    """
+    @staticmethod
+    def from_jobs(jobs:list[Job])->'JobTable':
+        def bound(value:typing.Optional[int])->int:
+            return JobTable.NO_BOUND if value is None else value
+
+        return JobTable(ids=[job.get_id() for job in jobs],
+                        receival_times=[job.get_receival_time() for job in jobs],
+                        execution_times=[job.get_execution_time() for job in jobs],
+                        lower_bounds=[bound(job.get_execution_time_lower_bound()) for job in jobs],
+                        upper_bounds=[bound(job.get_execution_time_upper_bound()) for job in jobs],
+                        deadlines=[job.get_deadline() for job in jobs])
+
+    """
+    Concatenates tables
+
+    Args:
+        tables: the tables in order
+
+    Returns:
+        A table with the rows of all of the tables
+    """
+    @staticmethod
+    def concatenate(tables:list['JobTable'])->'JobTable':
+        return JobTable(ids=np.concatenate([table.ids for table in tables]),
+                        receival_times=np.concatenate([table.receival_times for table in tables]),
+                        execution_times=np.concatenate([table.execution_times for table in tables]),
+                        lower_bounds=np.concatenate([table.lower_bounds for table in tables]),
+                        upper_bounds=np.concatenate([table.upper_bounds for table in tables]),
+                        deadlines=np.concatenate([table.deadlines for table in tables]))
+
+    """
+    Returns a table made of the given rows
+
+    Args:
+        rows: the row indices, or a slice
+
+    Returns:
+        The new table
+    """
+    def take(self, rows:typing.Union[npt.ArrayLike, slice])->'JobTable':
+        #A slice of a sorted table in row order is sorted as well
+        receival_sorted:typing.Optional[bool] = None
+        if isinstance(rows, slice) and rows.step in (None, 1) and self.receival_sorted:
+            receival_sorted = True
+        return JobTable(ids=self.ids[rows], receival_times=self.receival_times[rows],
+                        execution_times=self.execution_times[rows], lower_bounds=self.lower_bounds[rows],
+                        upper_bounds=self.upper_bounds[rows], deadlines=self.deadlines[rows],
+                        receival_sorted=receival_sorted)
+
+    """
+    Checks if the rows are sorted by receival time, the receival times are only compared if it is not already known
+
+    Returns:
+        True if no job is received before the job in the row before it, False otherwise
+    """
+    def is_sorted_by_receival_time(self)->bool:
+        if self.receival_sorted is None:
+            self.receival_sorted = not np.any(self.receival_times[1:] < self.receival_times[:-1])
+        return self.receival_sorted
+
+    """
+    Returns the table sorted by receival time, jobs with the same receival time keep their order
+
+    Returns:
+        The sorted table, the table itself if it is already sorted
+    """
+    def sorted_by_receival_time(self)->'JobTable':
+        if self.is_sorted_by_receival_time():
+            return self
+        table:JobTable = self.take(np.argsort(self.receival_times, kind="stable"))
+        table.receival_sorted = True
+        return table
+
+    """
+    Returns the jobs received in a time window, a sorted table is searched and sliced without copying the columns
+
+    Args:
+        start_time: the start of the window
+        end_time: the end of the window (exclusive), -1 if the window has no end
+
+    Returns:
+        The table of the jobs received in the window, in table order
+    """
+    def time_window(self, start_time:int, end_time:int=-1)->'JobTable':
+        if not self.is_sorted_by_receival_time():
+            in_window:npt.NDArray[np.bool_] = self.receival_times >= start_time
+            if end_time != -1:
+                in_window &= self.receival_times < end_time
+            return self.take(np.flatnonzero(in_window))
+        start_row:int = int(np.searchsorted(self.receival_times, start_time, side="left"))
+        end_row:int = len(self)
+        if end_time != -1:
+            end_row = max(start_row, int(np.searchsorted(self.receival_times, end_time, side="left")))
+        return self.take(slice(start_row, end_row))
+
+    """
+    Returns a job object for a row
+
+    Args:
+        row: the row of the job
+
+    Returns:
+        The job
+    """
+    def job(self, row:int)->Job:
+        lower_bound:int = int(self.lower_bounds[row])
+        upper_bound:int = int(self.upper_bounds[row])
+        return Job(job_id=str(self.ids[row]), execution_time=int(self.execution_times[row]),
+                   receival_time=int(self.receival_times[row]), deadline=int(self.deadlines[row]),
+                   execution_time_lower_bound=None if lower_bound == JobTable.NO_BOUND else lower_bound,
+                   execution_time_upper_bound=None if upper_bound == JobTable.NO_BOUND else upper_bound)
+
+    """
+    Returns job objects for every row
+
+    Returns:
+        The list of jobs
+    """
+    def jobs(self)->list[Job]:
+        return [self.job(row) for row in range(len(self))]
+
+    """
+    Returns the receival time of a row
+
+    Args:
+        row: the row
+
+    Returns:
+        The receival time
+    """
+    def get_receival_time(self, row:int)->int:
+        return int(self.receival_times[row])
+
+    def __len__(self)->int:
+        return len(self.ids)
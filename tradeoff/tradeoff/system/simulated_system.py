@@ -1,16 +1,46 @@
 import typing
+import heapq
 
 from tradeoff.system.container import Container
 from tradeoff.system.job import Job
 from tradeoff.system.action import Action
+from tradeoff.system.action_batch import ActionBatch
+from tradeoff.results.result_store import ResultStore
 
 """
 System with the following properties:
     cost = total units of time that containers are alive for
     execution time of jobs is uncorrelated across containers
     serial computation
+
+Time is advanced in a discrete event manner, a heap holds the time of the next event (job completion or end of startup)
+of each container and only the containers whose events fire are run, the rest catch up when they are next accessed, so
+advancing time does no work for the containers without events and its cost does not grow with the number of containers
+
+The cost, the time until all work is done and whether the system is done are kept up to date as containers are
+activated, changed and terminated, so they do not have to look at every container
+
+Containers are indexed by state (see Container.get_state) and by the epoch they were tagged with
+(Container.JOB_EPOCH), the index is updated when a container's events fire or its queue is changed. Containers are
+kept in activation order and are returned as read only views.
+
+A system can be forked (see fork) to evaluate what-if scenarios from its current state. Forked containers share job
+queues with the original until either side changes them, and jobs are never copied. Jobs completed in a fork are not
+marked complete, their completion times are recorded on the forked system instead (see get_completion_time).
+
+The id, completion time and queue time of each job completed by the system are added to a ResultStore as the job
+completes (see get_results), so completed jobs are not kept in memory for the results.
+
+Jobs taken off a container without completing, because the container was terminated or the jobs were removed, are kept
+until they are assigned again, so the jobs that never complete can be reported (see get_incomplete_jobs).
+
+The jobs that complete and the containers that go idle can also be tracked (see track_changes), so an incremental
+scheduler can be told what changed since it was last called instead of looking at the whole system.
 """
 class SimulatedSystem:
+    #Smallest number of entries of the finishing time heaps that are rebuilt without their outdated entries
+    MIN_COMPACTION_SIZE = 1024
+
     """
     Constructor, initializes a simulated system with no containers
 
@@ -19,19 +49,47 @@ class SimulatedSystem:
         curr_time: time the system starts at
     """
     def __init__(self, startup_duration:int, curr_time:int = 0):
-        self.containers:set[Container] = set()
+        self.containers:typing.Dict[Container, None] = {}
         self.time:int = curr_time
         self.startup_time:int = startup_duration
         self.accrued_cost:int = 0
         self.assigned_jobs:set[Job] = set()
+        #Jobs taken off a container without completing that have not been assigned again, insertion ordered
+        self.stranded_jobs:typing.Dict[Job, None] = {}
+        self.events:list[typing.Tuple[int, int, Container]] = []
+        self.event_times:typing.Dict[Container, int] = {}
+        self.event_count:int = 0
+        #Completion times of the jobs completed in a fork, None if jobs are marked complete directly
+        self.completion_times:typing.Optional[typing.Dict[Job, int]] = None
+        self.results:ResultStore = ResultStore()
+        #Sum of the start times of the alive containers, the cost of a container is the time since it started
+        self.alive_start_time_total:int = 0
+        #Max heap (negated) of the time each container will finish its queued work, which only changes when the
+        #queue is changed by the system
+        self.done_times_heap:list[typing.Tuple[int, int, Container]] = []
+        #Min heap of the same times, used to find the next container that will run out of work
+        self.min_done_times_heap:list[typing.Tuple[int, int, Container]] = []
+        self.done_times:typing.Dict[Container, int] = {}
+        self.container_states:typing.Dict[Container, int] = {}
+        self.containers_by_state:typing.Dict[int, typing.Dict[Container, None]] = {
+            Container.STARTING: {}, Container.BUSY: {}, Container.IDLE: {}}
+        self.containers_by_epoch:typing.Dict[int, typing.Dict[Container, None]] = {}
+        #Jobs completed and containers that went idle since the changes were last taken, None if changes are not tracked
+        self.new_completed_jobs:typing.Optional[list[Job]] = None
+        self.new_idle_containers:typing.Optional[typing.Dict[Container, None]] = None
+        #Number of times a container went idle
+        self.idle_count:int = 0
 
     """
     Performs the provided actions on the system
     
     Args:
-        actions: the actions to be performed
+        actions: the actions to be performed, as action objects or a batch
     """
-    def perform_actions(self, actions:list[Action]):
+    def perform_actions(self, actions:typing.Union[list[Action], ActionBatch]):
+        if isinstance(actions, ActionBatch):
+            self.perform_action_batch(actions)
+            return
         for action in actions:
             action_type:int = action.get_action_type()
             if action_type == Action.ACTIVATE_CONTAINER:
@@ -46,13 +104,94 @@ class SimulatedSystem:
                 self.reorder_jobs(action.get_jobs(), action.get_container())
 
     """
-    Returns the set of containers in the system
+    Performs a batch of actions on the system without creating action objects, consecutive actions of the same type are
+    performed together
+
+    Args:
+        batch: the actions to be performed
+    """
+    def perform_action_batch(self, batch:ActionBatch):
+        num_actions:int = len(batch)
+        start_num:int = 0
+        while start_num < num_actions:
+            action_type:int = batch.action_types[start_num]
+            end_num:int = start_num + 1
+            while end_num < num_actions and batch.action_types[end_num] == action_type:
+                end_num += 1
+            if action_type == Action.ACTIVATE_CONTAINER:
+                self.activate_containers(initial_jobs=batch.jobs, job_offsets=batch.job_offsets[start_num:end_num + 1],
+                                         other_information={action_num - start_num: dict(other_information)
+                                                            for action_num, other_information
+                                                            in batch.other_information.items()
+                                                            if start_num <= action_num < end_num})
+            elif action_type == Action.TERMINATE_CONTAINER:
+                self.terminate_containers(batch.containers[start_num:end_num])
+            elif action_type == Action.ADD_JOBS:
+                self.assign_job_ranges(jobs=batch.jobs, job_offsets=batch.job_offsets[start_num:end_num + 1],
+                                       containers=batch.containers[start_num:end_num])
+            else:
+                for action_num in range(start_num, end_num):
+                    if action_type == Action.REMOVE_JOBS:
+                        self.remove_jobs(batch.get_jobs(action_num), batch.get_container(action_num))
+                    elif action_type == Action.REORDER_JOBS:
+                        self.reorder_jobs(batch.get_jobs(action_num), batch.get_container(action_num))
+            start_num = end_num
+
+    """
+    Returns the containers in the system
     
     Returns:
-        The container set
+        A read only view of the containers, in activation order
+    """
+    def get_containers(self)->typing.KeysView[Container]:
+        return self.containers.keys()
+
+    """
+    Returns the containers that are still starting up
+
+    Returns:
+        A read only view of the starting containers
+    """
+    def get_starting_containers(self)->typing.KeysView[Container]:
+        return self.containers_by_state[Container.STARTING].keys()
+
+    """
+    Returns the containers that have started and are running jobs
+
+    Returns:
+        A read only view of the busy containers
+    """
+    def get_busy_containers(self)->typing.KeysView[Container]:
+        return self.containers_by_state[Container.BUSY].keys()
+
+    """
+    Returns the containers that have started and have no jobs
+
+    Returns:
+        A read only view of the idle containers
+    """
+    def get_idle_containers(self)->typing.KeysView[Container]:
+        return self.containers_by_state[Container.IDLE].keys()
+
+    """
+    Returns the number of times a container went idle, so callers can tell if a container went idle since they last
+    checked
+
+    Returns:
+        The number of times a container went idle
     """
-    def get_containers(self)->set[Container]:
-        return set(self.containers)
+    def get_idle_count(self)->int:
+        return self.idle_count
+
+    """
+    Returns the containers grouped by the epoch they are tagged with (Container.JOB_EPOCH), containers without an
+    epoch are not included
+
+    Returns:
+        Mapping of each epoch to a read only view of its containers, in order of the first activation of the epoch
+    """
+    def get_containers_by_epoch(self)->typing.Dict[int, typing.KeysView[Container]]:
+        return {epoch: containers.keys() for epoch, containers in self.containers_by_epoch.items()}
 
     """
     Returns the system time
@@ -67,10 +206,169 @@ class SimulatedSystem:
     Adds a new container to the system
     """
     def activate_container(self, initial_jobs:list[Job], other_information:typing.Dict[int, str]=None):
-        self.assigned_jobs.update(initial_jobs)
+        self.activate_containers(initial_jobs=initial_jobs, job_offsets=(0, len(initial_jobs)),
+                                 other_information=None if other_information is None else {0: other_information})
+
+    """
+    Adds new containers to the system
+
+    Args:
+        initial_jobs: the initial jobs of all the containers, in order
+        job_offsets: the initial jobs of container i are initial_jobs[job_offsets[i]:job_offsets[i+1]]
+        other_information: additional information of the containers that have it, by container index
+    """
+    def activate_containers(self, initial_jobs:typing.Sequence[Job], job_offsets:typing.Sequence[int],
+                            other_information:typing.Dict[int, typing.Dict[int, str]]=None):
         if other_information is None:
-            other_information:typing.Dict[int, str] = {}
-        self.containers.add(Container(curr_time=self.time, startup_time=self.startup_time, initial_jobs=initial_jobs, other_information=other_information))
+            other_information = {}
+        clock:typing.Callable[[], int] = self.get_time
+        on_complete:typing.Callable[[Job, int], None] = self.complete_job
+        for container_num in range(len(job_offsets) - 1):
+            container_jobs:typing.Optional[list[Job]] = None
+            if job_offsets[container_num] != job_offsets[container_num + 1]:
+                container_jobs = initial_jobs[job_offsets[container_num]:job_offsets[container_num + 1]]
+                self.assigned_jobs.update(container_jobs)
+                if len(self.stranded_jobs) > 0:
+                    for job in container_jobs:
+                        self.stranded_jobs.pop(job, None)
+            container:Container = Container(curr_time=self.time, startup_time=self.startup_time,
+                                            initial_jobs=container_jobs,
+                                            other_information=other_information.get(container_num), clock=clock,
+                                            on_complete=on_complete)
+            self.add_container(container)
+
+    """
+    Adds a container to the system's indexes
+
+    Args:
+        container: the container
+    """
+    def add_container(self, container:Container):
+        self.containers[container] = None
+        self.alive_start_time_total += container.get_start_time()
+        epoch:typing.Optional[str] = container.get_other_information(Container.JOB_EPOCH)
+        if epoch is not None:
+            self.containers_by_epoch.setdefault(int(epoch), {})[container] = None
+        self.update_container(container)
+
+    """
+    Returns a copy of the system that can be changed and run without affecting this system, the cost is proportional to
+    the number of containers and job queues are only copied when they are changed
+
+    Returns:
+        The forked system
+    """
+    def fork(self)->'SimulatedSystem':
+        system:SimulatedSystem = SimulatedSystem(startup_duration=self.startup_time, curr_time=self.time)
+        system.accrued_cost = self.accrued_cost
+        system.assigned_jobs = set(self.assigned_jobs)
+        system.stranded_jobs = dict(self.stranded_jobs)
+        system.completion_times = dict(self.completion_times) if self.is_fork() else {}
+        if self.is_tracking_changes():
+            #Every idle container of the fork is reported as newly idle, as they are different containers
+            system.track_changes()
+            system.new_completed_jobs.extend(self.new_completed_jobs)
+        for container in self.containers:
+            system.add_container(container.fork(clock=system.get_time, on_complete=system.complete_job))
+        return system
+
+    """
+    Returns a snapshot of the current state of the system, a snapshot is a fork that is kept unchanged so it can be
+    forked for each evaluation
+
+    Returns:
+        The snapshot
+    """
+    def snapshot(self)->'SimulatedSystem':
+        return self.fork()
+
+    """
+    Checks if the system is a fork, jobs completed in a fork are not marked complete
+
+    Returns:
+        True if the system is a fork, False otherwise
+    """
+    def is_fork(self)->bool:
+        return self.completion_times is not None
+
+    """
+    Records the completion of a job, the job is marked complete unless the system is a fork
+
+    Args:
+        job: the completed job
+        time: the completion time
+    """
+    def complete_job(self, job:Job, time:int):
+        if self.is_fork():
+            self.completion_times[job] = time
+        else:
+            job.complete(time)
+        self.results.add(job.get_id(), time, time - job.get_execution_time() - job.get_receival_time())
+        if self.new_completed_jobs is not None:
+            self.new_completed_jobs.append(job)
+
+    """
+    Starts tracking the jobs that complete and the containers that go idle, see take_changes
+    """
+    def track_changes(self):
+        self.new_completed_jobs = []
+        self.new_idle_containers = {}
+
+    """
+    Checks if the system tracks the jobs that complete and the containers that go idle
+
+    Returns:
+        True if changes are tracked, False otherwise
+    """
+    def is_tracking_changes(self)->bool:
+        return self.new_completed_jobs is not None
+
+    """
+    Returns the changes since the changes were last taken and clears them, changes must be tracked (see track_changes)
+
+    Returns:
+        The jobs that completed in order of completion, and the containers that went idle and still are
+    """
+    def take_changes(self)->typing.Tuple[list[Job], list[Container]]:
+        completed_jobs:list[Job] = self.new_completed_jobs
+        idle_containers:list[Container] = [container for container in self.new_idle_containers
+                                           if self.container_states.get(container) == Container.IDLE]
+        self.new_completed_jobs = []
+        self.new_idle_containers = {}
+        return completed_jobs, idle_containers
+
+    """
+    Returns the results of the jobs completed by the system, a fork only has the results of the jobs it completed
+
+    Returns:
+        The result store
+    """
+    def get_results(self)->ResultStore:
+        return self.results
+
+    """
+    Returns the completion time of a job, including jobs completed in a fork
+
+    Args:
+        job: the job
+
+    Returns:
+        The completion time, or -1 if the job is incomplete
+    """
+    def get_completion_time(self, job:Job)->int:
+        if self.is_fork() and job in self.completion_times:
+            return self.completion_times[job]
+        return job.completion_time
+
+    """
+    Returns the jobs that were taken off a container without completing and were not assigned again, such as the jobs
+    left in a container when it is terminated
+
+    Returns:
+        The incomplete jobs, in the order they were taken off their containers
+    """
+    def get_incomplete_jobs(self)->list[Job]:
+        return [job for job in self.stranded_jobs if self.get_completion_time(job) == -1]
 
     """
     Removes a container from the system
@@ -79,8 +377,30 @@ class SimulatedSystem:
         container: the container to remove
     """
     def terminate_container(self, container:Container):
-        self.accrued_cost += container.get_time_alive()
-        self.containers.remove(container)
+        self.terminate_containers((container,))
+
+    """
+    Removes containers from the system
+
+    Args:
+        containers: the containers to remove
+    """
+    def terminate_containers(self, containers:typing.Iterable[Container]):
+        for container in containers:
+            self.accrued_cost += container.get_time_alive()
+            for job in container.get_jobs():
+                self.stranded_jobs[job] = None
+            del self.containers[container]
+            self.alive_start_time_total -= container.get_start_time()
+            self.event_times.pop(container, None)
+            self.done_times.pop(container, None)
+            del self.containers_by_state[self.container_states.pop(container)][container]
+            epoch:typing.Optional[str] = container.get_other_information(Container.JOB_EPOCH)
+            if epoch is not None:
+                epoch_containers:typing.Dict[Container, None] = self.containers_by_epoch[int(epoch)]
+                del epoch_containers[container]
+                if len(epoch_containers) == 0:
+                    del self.containers_by_epoch[int(epoch)]
 
     """
     Assigns the given jobs to the given container
@@ -92,7 +412,30 @@ class SimulatedSystem:
     def assign_jobs(self, jobs:list[Job], container:Container):
         self.assigned_jobs.update(jobs)
         for job in jobs:
+            self.stranded_jobs.pop(job, None)
             container.add_job(job)
+        self.update_container(container)
+
+    """
+    Assigns ranges of jobs to containers, each container is updated once after all of its jobs are added
+
+    Args:
+        jobs: the jobs of all the containers, in order
+        job_offsets: the jobs added to container i are jobs[job_offsets[i]:job_offsets[i+1]]
+        containers: the containers being added to
+    """
+    def assign_job_ranges(self, jobs:typing.Sequence[Job], job_offsets:typing.Sequence[int],
+                          containers:typing.Sequence[Container]):
+        changed_containers:typing.Dict[Container, None] = {}
+        for container_num, container in enumerate(containers):
+            for job_num in range(job_offsets[container_num], job_offsets[container_num + 1]):
+                job:Job = jobs[job_num]
+                self.assigned_jobs.add(job)
+                self.stranded_jobs.pop(job, None)
+                container.add_job(job)
+            changed_containers[container] = None
+        for container in changed_containers:
+            self.update_container(container)
 
     """
     Removes jobs from a container
@@ -104,6 +447,9 @@ class SimulatedSystem:
     def remove_jobs(self, jobs:list[Job], container:Container):
         for job in jobs:
             container.remove_job(job)
+            self.stranded_jobs[job] = None
+        self.assigned_jobs.difference_update(jobs)
+        self.update_container(container)
 
     """
     Reorders the jobs to the new order on a container
@@ -114,9 +460,10 @@ class SimulatedSystem:
     """
     def reorder_jobs(self, new_job_order:list[Job], container:Container):
         container.new_job_order(new_job_order)
+        self.update_container(container)
 
     """
-    Returns the jobs that have been assigned to containers in the system
+    Returns the jobs that are assigned to containers in the system and have not completed
     """
     def get_assigned_jobs(self):
         return self.assigned_jobs
@@ -128,10 +475,104 @@ class SimulatedSystem:
         time: time to run until
     """
     def run(self, time:int):
-        for container in self.containers:
-            container.run(time)
+        while len(self.events) > 0 and self.events[0][0] <= time:
+            event_time, _, container = heapq.heappop(self.events)
+            if self.event_times.get(container) != event_time:
+                continue
+            del self.event_times[container]
+            self.assigned_jobs.difference_update(container.run(time))
+            self.schedule_event(container)
+            self.update_state(container)
         self.time = time
 
+    """
+    Updates the event heap and the finishing times after the queue of a container is changed
+
+    Args:
+        container: the container that was changed
+    """
+    def update_container(self, container:Container):
+        self.schedule_event(container)
+        self.update_state(container)
+        if self.container_states[container] == Container.IDLE:
+            return
+        done_time:int = self.time + container.time_until_done()
+        if self.done_times.get(container) != done_time:
+            self.done_times[container] = done_time
+            heapq.heappush(self.done_times_heap, (-done_time, self.event_count, container))
+            heapq.heappush(self.min_done_times_heap, (done_time, self.event_count, container))
+            self.event_count += 1
+            self.compact_done_times_if_sparse()
+
+    """
+    Rebuilds the finishing time heaps from the finishing times when their outdated entries outnumber the containers
+    with a finishing time, outdated entries are otherwise only removed once they reach the top of a heap, so without
+    this the heaps grow with the number of changes made to the queues
+    """
+    def compact_done_times_if_sparse(self):
+        num_entries:int = max(len(self.done_times_heap), len(self.min_done_times_heap))
+        if num_entries < SimulatedSystem.MIN_COMPACTION_SIZE or num_entries <= 2 * len(self.done_times):
+            return
+        self.done_times_heap = []
+        self.min_done_times_heap = []
+        for container, done_time in self.done_times.items():
+            self.done_times_heap.append((-done_time, self.event_count, container))
+            self.min_done_times_heap.append((done_time, self.event_count, container))
+            self.event_count += 1
+        heapq.heapify(self.done_times_heap)
+        heapq.heapify(self.min_done_times_heap)
+
+    """
+    Moves a container to the index of its current state, idle containers have no finishing time
+
+    Args:
+        container: the container
+    """
+    def update_state(self, container:Container):
+        state:int = container.get_state()
+        old_state:typing.Optional[int] = self.container_states.get(container)
+        if state == old_state:
+            return
+        if old_state is not None:
+            del self.containers_by_state[old_state][container]
+        self.containers_by_state[state][container] = None
+        self.container_states[container] = state
+        if state == Container.IDLE:
+            self.done_times.pop(container, None)
+            self.idle_count += 1
+            if self.new_idle_containers is not None:
+                self.new_idle_containers[container] = None
+
+    """
+    Records the next event of a container in the event heap, replacing its previous event
+
+    Args:
+        container: the container whose state changed
+    """
+    def schedule_event(self, container:Container):
+        event_time:int = container.get_next_event_time()
+        if self.event_times.get(container) == event_time:
+            return
+        if event_time == -1:
+            self.event_times.pop(container, None)
+            return
+        self.event_times[container] = event_time
+        heapq.heappush(self.events, (event_time, self.event_count, container))
+        self.event_count += 1
+
+    """
+    Returns the time of the next container event
+
+    Returns:
+        The time of the next event, or -1 if no container has a pending event
+    """
+    def get_next_event_time(self)->int:
+        while len(self.events) > 0 and self.event_times.get(self.events[0][2]) != self.events[0][0]:
+            heapq.heappop(self.events)
+        if len(self.events) == 0:
+            return -1
+        return self.events[0][0]
+
     """
     Returns the cost incurred by the system so far
     
@@ -139,10 +580,7 @@ class SimulatedSystem:
         The cost incurred by the system so far
     """
     def get_cost(self)->int:
-        cost = self.accrued_cost
-        for container in self.containers:
-            cost += container.get_time_alive()
-        return cost
+        return self.accrued_cost + len(self.containers) * self.time - self.alive_start_time_total
     
     """
     Sets the cost to 0
@@ -157,9 +595,26 @@ class SimulatedSystem:
         curr_time: the time the system is set to
     """
     def reset(self, curr_time=0):
-        self.containers = set()
+        self.containers = {}
         self.time = curr_time
         self.accrued_cost = 0
+        self.assigned_jobs = set()
+        self.stranded_jobs = {}
+        self.events = []
+        self.event_times = {}
+        if self.is_fork():
+            self.completion_times = {}
+        self.results = ResultStore()
+        self.alive_start_time_total = 0
+        self.done_times_heap = []
+        self.min_done_times_heap = []
+        self.done_times = {}
+        self.container_states = {}
+        self.containers_by_state = {Container.STARTING: {}, Container.BUSY: {}, Container.IDLE: {}}
+        self.containers_by_epoch = {}
+        self.idle_count = 0
+        if self.is_tracking_changes():
+            self.track_changes()
 
     """
     Gets the time until all containers are finished all work
@@ -168,10 +623,37 @@ class SimulatedSystem:
         The time until all container are done
     """
     def get_time_until_done(self)->int:
-        max_time:int = 0
-        for container in self.containers:
-            max_time = max(max_time, container.time_until_done())
-        return max_time
+        while (len(self.done_times_heap) > 0
+               and self.done_times.get(self.done_times_heap[0][2]) != -self.done_times_heap[0][0]):
+            heapq.heappop(self.done_times_heap)
+        if len(self.done_times_heap) == 0:
+            return 0
+        return max(0, -self.done_times_heap[0][0] - self.time)
+
+    """
+    Gets the smallest time until a container that is not idle finishes its work
+
+    Args:
+        excluded: containers that are not considered
+
+    Returns:
+        The smallest time until done, or -1 if every container that is not excluded is idle
+    """
+    def get_min_time_until_done(self, excluded:typing.Collection[Container]=())->int:
+        skipped:list[typing.Tuple[int, int, Container]] = []
+        min_time:int = -1
+        while len(self.min_done_times_heap) > 0:
+            done_time, _, container = self.min_done_times_heap[0]
+            if self.done_times.get(container) != done_time:
+                heapq.heappop(self.min_done_times_heap)
+            elif container in excluded:
+                skipped.append(heapq.heappop(self.min_done_times_heap))
+            else:
+                min_time = done_time - self.time
+                break
+        for entry in skipped:
+            heapq.heappush(self.min_done_times_heap, entry)
+        return min_time
 
     """
     Checks if all work is completed
@@ -180,10 +662,17 @@ class SimulatedSystem:
         True if all work completed, False otherwise
     """
     def is_done(self)->bool:
-        for container in self.containers:
-            if not container.is_done():
-                return False
-        return True
+        # Containers with work or startup remaining are exactly the ones with a pending event
+        return len(self.event_times) == 0
+
+    """
+    Returns the number of containers in the system
+
+    Returns:
+        The number of alive containers
+    """
+    def get_num_containers(self)->int:
+        return len(self.containers)
 
     """
     Returns the startup time of a container
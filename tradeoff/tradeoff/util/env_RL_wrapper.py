@@ -8,6 +8,7 @@ from tradeoff.system.simulated_system import SimulatedSystem
 from tradeoff.system.job import Job
 from tradeoff.system.container import Container
 from tradeoff.system.action import Action
+from tradeoff.system.action_batch import ActionBatch
 import heapq
 from tradeoff.jobs.continuous_job_generation import ContinuousJobGeneration
 
@@ -53,10 +54,10 @@ class SystemWrapper(Env):
     @staticmethod
     def generate_observation(jobs:list[Job], system:SimulatedSystem)->npt.NDArray[np.float32]:
         job_receival_time:list[int] = [job.get_receival_time() for job in jobs]
-        upper_job_execution_time:list[int] = [int(job.get_other_info(Job.EXECUTION_TIME_UPPER_BOUND)) for job in jobs]
-        lower_job_execution_time: list[int] = [int(job.get_other_info(Job.EXECUTION_TIME_LOWER_BOUND)) for job in jobs]
+        upper_job_execution_time:list[int] = [job.get_execution_time_upper_bound() for job in jobs]
+        lower_job_execution_time: list[int] = [job.get_execution_time_lower_bound() for job in jobs]
 
-        containers:set[Container] = system.get_containers()
+        containers:typing.KeysView[Container] = system.get_containers()
         upper_container_completion_times: list[int] = \
             [container.time_until_done_other(Job.EXECUTION_TIME_UPPER_BOUND)
              for container in containers]
@@ -88,8 +89,8 @@ class SystemWrapper(Env):
             obs[15] = min(lower_job_execution_time)  # L min queued job execution time
             obs[16] = max(lower_job_execution_time)  # L max queued job execution time
         if len(jobs) > 0:
-            obs[17] = jobs[0].get_other_info(Job.EXECUTION_TIME_UPPER_BOUND) # U earliest queued job execution time
-            obs[18] = jobs[0].get_other_info(Job.EXECUTION_TIME_LOWER_BOUND)  # L earliest queued job execution time
+            obs[17] = jobs[0].get_execution_time_upper_bound() # U earliest queued job execution time
+            obs[18] = jobs[0].get_execution_time_lower_bound()  # L earliest queued job execution time
         obs[19] = system.get_startup_time() # new container startup time
 
         return obs
@@ -109,7 +110,7 @@ class SystemWrapper(Env):
         str, typing.Any]]:
         super().reset(seed=seed)
         self.controller.reset()
-        obs = self.generate_observation(jobs=self.controller.get_queued_jobs(), system=self.controller.get_system())
+        obs = self.generate_observation(jobs=list(self.controller.get_queued_jobs()), system=self.controller.get_system())
         return obs, {}
 
     """
@@ -128,7 +129,7 @@ class SystemWrapper(Env):
             target_num_containers = 1
 
         system: SimulatedSystem = self.controller.get_system()
-        containers: set[Container] = system.get_containers()
+        containers: typing.KeysView[Container] = system.get_containers()
         job_queue_times: list[int] = []
         container_times: list[int] = []
         heapq.heapify(container_times)
@@ -193,13 +194,13 @@ class SystemWrapper(Env):
         target_num_containers: the target number of containers
         
     Returns:
-        The list of actions to perform on the system
+        The batch of actions to perform on the system
     """
     @staticmethod
-    def determine_actions(jobs:list[Job], system:SimulatedSystem, target_num_containers:int)->list[Action]:
-        actions:list[Action] = []
+    def determine_actions(jobs:list[Job], system:SimulatedSystem, target_num_containers:int)->ActionBatch:
+        actions:ActionBatch = ActionBatch()
         job_ind:int = 0
-        containers:set[Container] = system.get_containers()
+        containers:typing.KeysView[Container] = system.get_containers()
         removed_containers:set[Container] = set()
 
         wait_time:int = -1
@@ -211,14 +212,14 @@ class SystemWrapper(Env):
                     break
                 if container.is_done():
                     removed_containers.add(container)
-                    actions.append(Action(action_type=Action.TERMINATE_CONTAINER, container=container))
+                    actions.add(action_type=Action.TERMINATE_CONTAINER, container=container)
 
         #Add jobs to remaining open containers
         for container in containers:
             if job_ind >= len(jobs):
                 break
             if container.is_done() and container not in removed_containers:
-                actions.append(Action(action_type=Action.ADD_JOBS, container=container, jobs=[jobs[job_ind]]))
+                actions.add(action_type=Action.ADD_JOBS, container=container, jobs=(jobs[job_ind],))
                 if wait_time == -1 or wait_time < jobs[job_ind].get_execution_time():
                     wait_time = system.get_time() + jobs[job_ind].get_execution_time()
                 job_ind += 1
@@ -227,11 +228,10 @@ class SystemWrapper(Env):
         if len(containers) < target_num_containers:
             if wait_time == -1 or wait_time < system.get_time() + system.get_startup_time():
                 wait_time = system.get_time() + system.get_startup_time()
-            for new_container in range(target_num_containers - len(containers)):
-                actions.append(Action(action_type=Action.ACTIVATE_CONTAINER, jobs=[]))
+            actions.add_activations(target_num_containers - len(containers))
 
         if wait_time != -1:
-            actions.append(Action(action_type=Action.WAIT, time=wait_time))
+            actions.add(action_type=Action.WAIT, time=wait_time)
 
         return actions
 
@@ -262,12 +262,12 @@ class SystemWrapper(Env):
         Other information associated with the system
     """
     def step(self, action:int) -> typing.Tuple[np.ndarray, float, bool, bool, typing.Dict[str, typing.Any]]:
-        jobs:list[Job] = self.controller.get_queued_jobs()
+        jobs:list[Job] = list(self.controller.get_queued_jobs())
         system:SimulatedSystem = self.controller.get_system()
         target_num_containers:int = self.rescale_action(action, self.max_containers)
-        actions:list[Action] = self.determine_actions(jobs=jobs, system=system, target_num_containers=target_num_containers)
+        actions:ActionBatch = self.determine_actions(jobs=jobs, system=system, target_num_containers=target_num_containers)
         self.controller.next_step(actions=actions)
-        obs = self.generate_observation(jobs=jobs, system=system)
+        obs = self.generate_observation(jobs=list(self.controller.get_queued_jobs()), system=system)
         reward = self.get_reward(target_num_containers=target_num_containers)
         self.generate_jobs()
         done = self.controller.is_done()
@@ -1,7 +1,47 @@
+import bisect
+import heapq
+import math
 import typing
 from tradeoff.system.simulated_system import SimulatedSystem
 from tradeoff.system.action import Action
+from tradeoff.system.action_batch import ActionBatch
 from tradeoff.system.container import Container
+from tradeoff.system.job import Job
+
+"""
+Returns the type, container and total job execution time of each action
+
+Args:
+    actions: the actions, as action objects or a batch
+
+Returns:
+    Iterator of the type, container and total job execution time of each action
+"""
+def action_summaries(actions: typing.Union[list[Action], ActionBatch]
+                     ) -> typing.Iterator[typing.Tuple[int, Container, int]]:
+    if isinstance(actions, ActionBatch):
+        for action_num in range(len(actions)):
+            yield (actions.get_action_type(action_num), actions.get_container(action_num),
+                   actions.get_execution_time(action_num))
+    else:
+        for action in actions:
+            yield (action.get_action_type(), action.get_container(),
+                   sum([job.get_execution_time() for job in action.get_jobs()]))
+
+"""
+Returns the suffix sums of a sequence, so the sum of any remaining part of the sequence can be looked up in constant time
+
+Args:
+    values: the values
+
+Returns:
+    List where entry i is the sum of values[i:], with one more entry than values (the last entry is 0)
+"""
+def suffix_sums(values: typing.Sequence[int]) -> list[int]:
+    sums: list[int] = [0] * (len(values) + 1)
+    for value_num in range(len(values) - 1, -1, -1):
+        sums[value_num] = sums[value_num + 1] + values[value_num]
+    return sums
 
 """
 Terminates the containers that have no work left to do and returns the time of the next container shutdown if no 
@@ -9,39 +49,352 @@ further updates to the system
 
 Args:
     system: the system that runs the jobs
-    actions: the list of actions that are going to be performed on the system
+    actions: the actions that are going to be performed on the system, as action objects or a batch
 
 Returns:
     Time until the next container needs to be shutdown without further updates to the system
 """
 
 
-def terminate_stale_containers(system: SimulatedSystem, actions: list[Action]) -> int:
+def terminate_stale_containers(system: SimulatedSystem, actions: typing.Union[list[Action], ActionBatch]) -> int:
     next_time: int = -1
-    existing_container_time_to_complete: typing.Dict[Container, int] = {}
-    for container in system.get_containers():
-        existing_container_time_to_complete[container] = container.time_until_done()
-
-    for action in actions:
-        if action.get_action_type() == Action.ACTIVATE_CONTAINER:
-            new_time_to_complete = system.get_startup_time() + sum(
-                [job.get_execution_time() for job in action.get_jobs()])
+    added_time: typing.Dict[Container, int] = {}
+
+    for action_type, container, execution_time in action_summaries(actions):
+        if action_type == Action.ACTIVATE_CONTAINER:
+            new_time_to_complete = system.get_startup_time() + execution_time
             if new_time_to_complete < next_time or next_time == -1:
                 next_time = new_time_to_complete
 
-        if action.get_action_type() == Action.ADD_JOBS:
-            existing_container_time_to_complete[action.get_container()] += sum(
-                [job.get_execution_time() for job in action.get_jobs()])
+        if action_type == Action.ADD_JOBS:
+            added_time[container] = added_time.get(container, 0) + execution_time
 
-    existing_next_time: int = -1
-    for container in system.get_containers():
-        remaining_time: int = existing_container_time_to_complete.get(container)
+    #Idle containers that are not getting new jobs have no work left
+    stale_containers: list[Container] = [container for container in system.get_idle_containers()
+                                         if container not in added_time]
+
+    #Containers getting new jobs are the only ones whose remaining time changes
+    existing_next_time: int = system.get_min_time_until_done(excluded=added_time)
+    for container, time_added in added_time.items():
+        remaining_time: int = container.time_until_done() + time_added
         if remaining_time <= 0:
-            actions.append(Action(Action.TERMINATE_CONTAINER, container=container))
+            stale_containers.append(container)
         elif existing_next_time == -1 or remaining_time < existing_next_time:
             existing_next_time = remaining_time
 
     if existing_next_time != -1 and (existing_next_time < next_time or next_time == -1):
         next_time = existing_next_time
 
-    return next_time
\ No newline at end of file
+    if isinstance(actions, ActionBatch):
+        actions.add_terminations(stale_containers)
+    else:
+        actions.extend([Action(Action.TERMINATE_CONTAINER, container=container) for container in stale_containers])
+
+    return next_time
+
+"""
+Tree of the projected loads of an ordered list of containers, for schedulers that pick containers by load and by order
+
+The loads are the leaves of a binary tree stored in an array like a binary heap, each node holds the minimum load below
+it, so a load can be updated and the first container after a position with a load below a threshold can be found in
+O(log m) for m containers.
+"""
+class LoadTree:
+    """
+    Constructor
+
+    Args:
+        loads: the initial load of each container, in container order
+    """
+    def __init__(self, loads: list[int]):
+        self.size: int = 1
+        while self.size < len(loads):
+            self.size *= 2
+        self.tree: list[float] = [math.inf] * (2 * self.size)
+        self.tree[self.size:self.size + len(loads)] = loads
+        for node in range(self.size - 1, 0, -1):
+            self.tree[node] = min(self.tree[2 * node], self.tree[2 * node + 1])
+
+    """
+    Returns the load of a container
+
+    Args:
+        index: the position of the container
+
+    Returns:
+        The load
+    """
+    def get(self, index: int) -> int:
+        return self.tree[self.size + index]
+
+    """
+    Sets the load of a container
+
+    Args:
+        index: the position of the container
+        load: the new load
+    """
+    def update(self, index: int, load: int):
+        node: int = self.size + index
+        self.tree[node] = load
+        node //= 2
+        while node >= 1:
+            self.tree[node] = min(self.tree[2 * node], self.tree[2 * node + 1])
+            node //= 2
+
+    """
+    Finds the first container from a position with a load below a threshold
+
+    Args:
+        start: the position to search from
+        threshold: the threshold
+
+    Returns:
+        The position of the container, or -1 if no container from the position has a load below the threshold
+    """
+    def first_below(self, start: int, threshold: float) -> int:
+        return self.find_first_below(1, 0, self.size, start, threshold)
+
+    """
+    Finds the first container from a position with a load below a threshold within the range of a node
+
+    Args:
+        node: the node
+        node_start: the first position below the node
+        node_end: the position after the last position below the node
+        start: the position to search from
+        threshold: the threshold
+
+    Returns:
+        The position of the container, or -1 if there is none below the node
+    """
+    def find_first_below(self, node: int, node_start: int, node_end: int, start: int, threshold: float) -> int:
+        if node_end <= start or self.tree[node] >= threshold:
+            return -1
+        if node >= self.size:
+            return node_start
+        middle: int = (node_start + node_end) // 2
+        index: int = self.find_first_below(2 * node, node_start, middle, start, threshold)
+        if index == -1:
+            index = self.find_first_below(2 * node + 1, middle, node_end, start, threshold)
+        return index
+
+
+"""
+Unassigned jobs of an incremental scheduler, kept in order of receival time with jobs received at the same time in
+order of arrival, which is the order of sorting the controller's queued jobs by receival time
+
+Jobs usually arrive in order of receival time so adding a job is constant time, a job that arrives out of order is
+inserted in O(n). Removed jobs are only marked as removed, jobs removed from the head are dropped in constant time and
+the list is rebuilt without the other removed jobs once they outnumber the pending jobs, so removing k jobs is O(k)
+amortized.
+"""
+class PendingJobs:
+    #Smallest number of removed jobs that are dropped by rebuilding the list
+    MIN_COMPACTION_SIZE = 1024
+
+    """
+    Constructor, creates an empty set of pending jobs
+    """
+    def __init__(self):
+        self.jobs: list[Job] = []
+        self.receival_times: list[int] = []
+        #Position of the first job that is not removed, the jobs before it are removed
+        self.head: int = 0
+        #Jobs after the head that are removed
+        self.removed: set[Job] = set()
+
+    """
+    Adds jobs
+
+    Args:
+        jobs: the jobs, in order of arrival
+    """
+    def add(self, jobs: typing.Iterable[Job]):
+        for job in jobs:
+            receival_time: int = job.get_receival_time()
+            if len(self.receival_times) == self.head or receival_time >= self.receival_times[-1]:
+                self.jobs.append(job)
+                self.receival_times.append(receival_time)
+            else:
+                index: int = bisect.bisect_right(self.receival_times, receival_time, lo=self.head)
+                self.jobs.insert(index, job)
+                self.receival_times.insert(index, receival_time)
+
+    """
+    Removes jobs
+
+    Args:
+        jobs: the jobs to remove, they must be pending
+    """
+    def remove(self, jobs: typing.Collection[Job]):
+        self.removed.update(jobs)
+        while self.head < len(self.jobs) and self.jobs[self.head] in self.removed:
+            self.removed.discard(self.jobs[self.head])
+            self.head += 1
+        if self.head == len(self.jobs):
+            self.jobs = []
+            self.receival_times = []
+            self.head = 0
+            return
+        num_removed: int = self.head + len(self.removed)
+        if num_removed >= PendingJobs.MIN_COMPACTION_SIZE and num_removed > len(self):
+            kept_jobs: list[int] = [job_num for job_num in range(self.head, len(self.jobs))
+                                    if self.jobs[job_num] not in self.removed]
+            self.jobs = [self.jobs[job_num] for job_num in kept_jobs]
+            self.receival_times = [self.receival_times[job_num] for job_num in kept_jobs]
+            self.head = 0
+            self.removed = set()
+
+    """
+    Returns the jobs
+
+    Returns:
+        The jobs in order of receival time
+    """
+    def get_jobs(self) -> list[Job]:
+        return list(self)
+
+    """
+    Returns a copy of the pending jobs, the jobs themselves are not copied
+
+    Returns:
+        The copy
+    """
+    def copy(self) -> 'PendingJobs':
+        pending_jobs: PendingJobs = PendingJobs()
+        pending_jobs.jobs = self.jobs[self.head:]
+        pending_jobs.receival_times = self.receival_times[self.head:]
+        pending_jobs.removed = set(self.removed)
+        return pending_jobs
+
+    def __iter__(self) -> typing.Iterator[Job]:
+        for job_num in range(self.head, len(self.jobs)):
+            if self.jobs[job_num] not in self.removed:
+                yield self.jobs[job_num]
+
+    def __len__(self) -> int:
+        return len(self.jobs) - self.head - len(self.removed)
+
+
+"""
+Projected time until each container of a system is done, kept between the calls of an incremental scheduler that adds
+work to the container that will be done first
+
+The time a container will be done (the time of the system plus the time until the container is done, which includes
+the rest of its startup) does not change as the system runs, only when work is added to the container. So the containers
+are kept in a heap of the times they will be done, containers that are done are moved to a heap in container order and
+only containers that are new since the last call are looked up in the system. The work of the containers must only be
+changed through add_work, containers that were terminated are dropped when they reach the top of a heap.
+
+Containers are ordered by the time until they are done, ties go to the container that was added to the system first.
+"""
+class ContainerDoneTimes:
+    """
+    Constructor, creates an empty set of containers
+    """
+    def __init__(self):
+        self.time: int = 0
+        #Containers of the system at the last call, not pickled as sync sets them before they are used
+        self.containers: typing.Optional[typing.KeysView[Container]] = None
+        #Order of the containers in the system
+        self.container_nums: typing.Dict[Container, int] = {}
+        self.next_container_num: int = 0
+        #Min heap of the time each container that is not done will be done
+        self.busy_heap: list[typing.Tuple[int, int, Container]] = []
+        #Min heap of the containers that are done, in container order
+        self.done_heap: list[typing.Tuple[int, Container]] = []
+
+    """
+    Brings the containers up to date with a system, adding the containers that are new since the last call
+
+    Args:
+        system: the system
+    """
+    def sync(self, system: SimulatedSystem):
+        self.time = system.get_time()
+        self.containers = system.get_containers()
+        #New containers are added to the end of the system's containers
+        new_containers: list[Container] = []
+        for container in reversed(self.containers):
+            if container in self.container_nums:
+                break
+            new_containers.append(container)
+        for container in reversed(new_containers):
+            self.container_nums[container] = self.next_container_num
+            self.next_container_num += 1
+            self.push(container, self.time + container.time_until_done())
+        while len(self.busy_heap) > 0 and self.busy_heap[0][0] <= self.time:
+            done_time, container_num, container = heapq.heappop(self.busy_heap)
+            if container in self.containers:
+                heapq.heappush(self.done_heap, (container_num, container))
+
+    """
+    Adds a container to the heap of its done time
+
+    Args:
+        container: the container
+        done_time: the time the container will be done
+    """
+    def push(self, container: Container, done_time: int):
+        if done_time <= self.time:
+            heapq.heappush(self.done_heap, (self.container_nums[container], container))
+        else:
+            heapq.heappush(self.busy_heap, (done_time, self.container_nums[container], container))
+
+    """
+    Returns the order of a container, containers added to the system earlier come first
+
+    Args:
+        container: the container
+
+    Returns:
+        The position of the container in the order
+    """
+    def get_order(self, container: Container) -> int:
+        return self.container_nums[container]
+
+    """
+    Drops the containers at the top of the heaps that are no longer in the system
+    """
+    def drop_terminated(self):
+        for heap in (self.done_heap, self.busy_heap):
+            while len(heap) > 0 and heap[0][-1] not in self.containers:
+                del self.container_nums[heapq.heappop(heap)[-1]]
+
+    """
+    Returns the container that will be done first
+
+    Returns:
+        The time until the container is done, its order and the container, or None if there are no containers
+    """
+    def peek(self) -> typing.Optional[typing.Tuple[int, int, Container]]:
+        self.drop_terminated()
+        if len(self.done_heap) > 0:
+            return 0, self.done_heap[0][0], self.done_heap[0][1]
+        if len(self.busy_heap) > 0:
+            done_time, container_num, container = self.busy_heap[0]
+            return done_time - self.time, container_num, container
+        return None
+
+    """
+    Adds work to the container that will be done first (see peek)
+
+    Args:
+        execution_time: the time the work takes
+    """
+    def add_work(self, execution_time: int):
+        if execution_time == 0:
+            return
+        self.drop_terminated()
+        if len(self.done_heap) > 0:
+            container: Container = heapq.heappop(self.done_heap)[1]
+            self.push(container, self.time + execution_time)
+        else:
+            done_time, container_num, container = self.busy_heap[0]
+            heapq.heapreplace(self.busy_heap, (done_time + execution_time, container_num, container))
+
+    def __getstate__(self) -> typing.Dict[str, typing.Any]:
+        state: typing.Dict[str, typing.Any] = dict(self.__dict__)
+        state["containers"] = None
+        return state
\ No newline at end of file